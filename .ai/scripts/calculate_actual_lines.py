@@ -1,43 +1,69 @@
 #!/usr/bin/env python3
 """
 Calculate actual lines of code added for a completed step and update the breakdown JSON.
-Usage: python calculate_actual_lines.py <breakdown_file> <step_id>
+Usage: python calculate_actual_lines.py <breakdown_file> <step_id|--all> [--recompute]
+
+Line counts are code lines as classified by line_counter.py (comments and
+blank lines are left out), read through the cached LOC index (loc_index.py),
+so recomputing a step, or every step, only re-reads files that changed.
 """
 
-import json
 import sys
 import os
 from pathlib import Path
 
+from line_counter import count_file
+from loc_index import LocIndex
+from step_log import BreakdownError, append_event, append_events, load_materialized
+
 
 def count_lines_in_file(file_path):
     """Count non-empty, non-comment lines in a file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        # Count non-empty lines that aren't just comments or whitespace
-        actual_lines = 0
-        for line in lines:
-            stripped = line.strip()
-            if stripped and not stripped.startswith('//') and not stripped.startswith('/*') and stripped != '*/':
-                actual_lines += 1
-
-        return actual_lines
-    except (FileNotFoundError, UnicodeDecodeError):
-        return 0
-
+    return count_file(file_path).code
 
-def calculate_actual_lines(breakdown_file, step_id):
-    """Calculate actual lines added for a step based on its file_actions"""
 
-    # Load breakdown JSON
-    try:
-        with open(breakdown_file, 'r') as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error reading breakdown file: {e}")
-        return False
+def find_project_root(breakdown_file):
+    """Source tree a breakdown's file_actions are relative to"""
+    # The breakdown file is at .ai/tasks/Narrator-Console/roadmap/SETUP_breakdown.json
+    # The project root should be at the same level as .ai
+    breakdown_path = Path(breakdown_file)
+    if breakdown_path.is_absolute():
+        # Find the .ai directory and go up from there
+        ai_index = None
+        for i, part in enumerate(breakdown_path.parts):
+            if part == '.ai':
+                ai_index = i
+                break
+        if ai_index is not None:
+            base = Path(*breakdown_path.parts[:ai_index])
+        else:
+            base = Path.cwd()
+    else:
+        base = Path.cwd()
+
+    for name in ('narrator-console', 'Narrator-Console'):
+        if (base / name).is_dir():
+            return (base / name).resolve()
+    return (base / 'narrator-console').resolve()
+
+
+def calculate_actual_lines(breakdown_file, step_id, recompute=False, index=None, data=None, pending=None):
+    """
+    Calculate actual lines added for a step based on its file_actions.
+    With data (already loaded) and a pending list, the step is updated in
+    memory and its event is added to pending instead of being written.
+    """
+
+    # Load breakdown JSON with pending step events applied
+    if data is None:
+        if not os.path.exists(breakdown_file):
+            print(f"Error reading breakdown file: '{breakdown_file}' not found")
+            return False
+        try:
+            data = load_materialized(breakdown_file)
+        except BreakdownError as e:
+            print(f"Error reading breakdown file: {e}")
+            return False
 
     # Find the step
     step_found = False
@@ -60,7 +86,7 @@ def calculate_actual_lines(breakdown_file, step_id):
         return False
 
     # Check if actual_lines already exists
-    if 'actual_lines' in step:
+    if 'actual_lines' in step and not recompute:
         print(f"Step {step_id} already has actual_lines: {step['actual_lines']}")
         return True
 
@@ -68,64 +94,83 @@ def calculate_actual_lines(breakdown_file, step_id):
     total_lines = 0
     file_actions = step.get('file_actions', [])
 
-    # Get the project root (assume narrator-console directory)
-    # The breakdown file is at .ai/tasks/Narrator-Console/roadmap/SETUP_breakdown.json
-    # The project root should be at the same level as .ai
-    breakdown_path = Path(breakdown_file)
-    if breakdown_path.is_absolute():
-        # Find the .ai directory and go up from there
-        ai_index = None
-        for i, part in enumerate(breakdown_path.parts):
-            if part == '.ai':
-                ai_index = i
-                break
-        if ai_index is not None:
-            project_root = Path('/'.join(breakdown_path.parts[:ai_index])) / 'narrator-console'
-        else:
-            project_root = Path.cwd() / 'narrator-console'
-    else:
-        project_root = Path.cwd() / 'narrator-console'
-
-    project_root = project_root.resolve()
+    project_root = find_project_root(breakdown_file)
+    if index is None or index.root != str(project_root):
+        index = LocIndex(project_root)
 
     print(f"Looking for files in: {project_root}")
 
+    created = [action.split('create:', 1)[1].strip() for action in file_actions if action.startswith('create:')]
+    counts = index.count(created)
+
     for action in file_actions:
         if action.startswith('create:'):
             # Extract file path
             file_path = action.split('create:', 1)[1].strip()
-            full_path = project_root / file_path
 
-            lines = count_lines_in_file(full_path)
+            lines = counts[file_path]
             if lines > 0:
                 print(f"  {file_path}: {lines} lines")
                 total_lines += lines
         elif action.startswith('modify:'):
-            # For modifications, we'll estimate based on typical changes
-            # This is approximate since we don't track exact changes
             file_path = action.split('modify:', 1)[1].strip()
-            print(f"  {file_path}: ~5 lines (estimated for modification)")
-            total_lines += 5  # Rough estimate for modifications
-
-    # Update the step with actual_lines
-    data['expanded_sub_steps'][step_index]['actual_lines'] = total_lines
+            modified = step.get('modified_lines', {}).get(file_path)
+            if modified is not None:
+                # Measured at complete against the snapshot taken at start
+                print(f"  {file_path}: +{modified['added']} -{modified['removed']} lines (modified)")
+                total_lines += modified['added']
+            else:
+                # No snapshot for this step, so estimate based on typical changes
+                print(f"  {file_path}: ~5 lines (estimated for modification)")
+                total_lines += 5  # Rough estimate for modifications
+
+    if step.get('actual_lines') == total_lines:
+        print(f"Step {step_id} actual_lines unchanged: {total_lines}")
+        return True
 
-    # Save updated breakdown
-    with open(breakdown_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Record actual_lines in the step event log
+    fields = {'actual_lines': total_lines}
+    if pending is None:
+        append_event(breakdown_file, step_id, 'lines', fields)
+    else:
+        step.update(fields)
+        pending.append((step_id, 'lines', fields))
 
     print(f"✅ Updated {step_id} with actual_lines: {total_lines}")
     return True
 
 
+def calculate_all_steps(breakdown_file, recompute=False):
+    """Calculate actual lines for every completed step, sharing one load, LOC index and log write"""
+    if not os.path.exists(breakdown_file):
+        print(f"Error reading breakdown file: '{breakdown_file}' not found")
+        return False
+    try:
+        data = load_materialized(breakdown_file)
+    except BreakdownError as e:
+        print(f"Error reading breakdown file: {e}")
+        return False
+    index = LocIndex(find_project_root(breakdown_file))
+
+    success = True
+    pending = []
+    for step in data['expanded_sub_steps']:
+        if step.get('status') == 'completed':
+            success &= calculate_actual_lines(breakdown_file, step['id'], recompute, index, data, pending)
+    append_events(breakdown_file, pending)
+    return success
+
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python calculate_actual_lines.py <breakdown_file> <step_id>")
+    args = [arg for arg in sys.argv[1:] if arg != '--recompute']
+    recompute = len(args) != len(sys.argv) - 1
+    if len(args) != 2:
+        print("Usage: python calculate_actual_lines.py <breakdown_file> <step_id|--all> [--recompute]")
         print("Example: python calculate_actual_lines.py SETUP_breakdown.json SETUP_001")
         sys.exit(1)
 
-    breakdown_file = sys.argv[1]
-    step_id = sys.argv[2]
+    breakdown_file = args[0]
+    step_id = args[1]
 
     # Make breakdown_file path absolute if it's relative
     if not os.path.isabs(breakdown_file):
@@ -133,7 +178,10 @@ def main():
         if not breakdown_file.startswith('.ai/'):
             breakdown_file = f".ai/tasks/Narrator-Console/roadmap/{breakdown_file}"
 
-    success = calculate_actual_lines(breakdown_file, step_id)
+    if step_id == '--all':
+        success = calculate_all_steps(breakdown_file, recompute)
+    else:
+        success = calculate_actual_lines(breakdown_file, step_id, recompute)
     if not success:
         sys.exit(1)
 
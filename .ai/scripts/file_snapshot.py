@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Before/after snapshots of the files a step modifies
+Usage: python file_snapshot.py <breakdown_file> <step_id> [take|diff]
+
+At 'start' each "modify:" file is recorded as its size, mtime, content hash,
+line count and a compressed array of 31-bit line hashes (the top bit flags
+lines line_counter.py classifies as code). At 'complete' only files whose
+hash changed are re-read, and their line hashes are diffed against the
+snapshot to get real added/removed line counts. Only hashes are stored, so
+this needs neither the old file contents nor any version control.
+"""
+
+import base64
+import difflib
+import hashlib
+import json
+import os
+import sys
+import zlib
+from array import array
+
+from calculate_actual_lines import find_project_root
+from line_counter import CODE, classify_lines, language_for
+from step_log import atomic_write_json, breakdown_lock, snapshot_path
+
+CODE_FLAG = 0x80000000
+
+
+def modified_files(file_actions):
+    """Paths named by "modify:" file actions"""
+    return [action.split('modify:', 1)[1].strip() for action in file_actions if action.startswith('modify:')]
+
+
+def line_hashes(content, language):
+    """One uint32 per line: 31-bit crc of the line, top bit set for code lines"""
+    lines = content.split(b'\n')
+    if lines and lines[-1] == b'':
+        lines.pop()
+    kinds = classify_lines(content, language)
+    hashes = array('I', bytes(4 * len(lines)))
+    for i, line in enumerate(lines):
+        hashes[i] = (zlib.crc32(line) & 0x7FFFFFFF) | (CODE_FLAG if kinds[i] == CODE else 0)
+    return hashes
+
+
+def _pack(hashes):
+    return base64.b64encode(zlib.compress(hashes.tobytes(), 6)).decode('ascii')
+
+
+def _unpack(packed):
+    hashes = array('I')
+    hashes.frombytes(zlib.decompress(base64.b64decode(packed)))
+    return hashes
+
+
+def snapshot_file(full_path):
+    """Snapshot one file (None if it doesn't exist yet)"""
+    try:
+        with open(full_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            content = f.read()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+    hashes = line_hashes(content, language_for(str(full_path)))
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': hashlib.sha1(content).hexdigest(),
+        'lines': len(hashes),
+        'line_hashes': _pack(hashes),
+    }
+
+
+def diff_counts(old, new):
+    """(added_code_lines, removed_code_lines, added_lines, removed_lines) between two line-hash arrays"""
+    # Trim the common prefix and suffix so the matcher only sees the edited region
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    old_mid = old[start:len(old) - end]
+    new_mid = new[start:len(new) - end]
+
+    added = []
+    removed = []
+    matcher = difflib.SequenceMatcher(None, old_mid.tolist(), new_mid.tolist(), autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            removed.extend(old_mid[i1:i2])
+            added.extend(new_mid[j1:j2])
+    return (sum(1 for h in added if h & CODE_FLAG), sum(1 for h in removed if h & CODE_FLAG),
+            len(added), len(removed))
+
+
+def take_snapshot(breakdown_file, step_id, file_actions):
+    """Record the current state of a step's "modify:" files; returns how many were snapshotted"""
+    root = find_project_root(breakdown_file)
+    files = {rel: snapshot_file(root / rel) for rel in modified_files(file_actions)}
+    with breakdown_lock(breakdown_file, exclusive=True):
+        snapshots = load_snapshots(breakdown_file)
+        snapshots[step_id] = files
+        atomic_write_json(snapshot_path(breakdown_file), snapshots)
+    return sum(1 for snapshot in files.values() if snapshot is not None)
+
+
+def load_snapshots(breakdown_file):
+    try:
+        with open(snapshot_path(breakdown_file), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def diff_snapshot(breakdown_file, step_id):
+    """
+    Compare a step's "modify:" files against their start snapshot
+    Returns {path: [added_code_lines, removed_code_lines, added_lines, removed_lines]},
+    or None if the step has no snapshot
+    """
+    files = load_snapshots(breakdown_file).get(step_id)
+    if files is None:
+        return None
+
+    root = find_project_root(breakdown_file)
+    result = {}
+    for rel, before in files.items():
+        full_path = root / rel
+        try:
+            stat = os.stat(full_path)
+        except FileNotFoundError:
+            stat = None
+
+        if before is not None and stat is not None and (stat.st_size, stat.st_mtime_ns) == (before['size'], before['mtime_ns']):
+            result[rel] = [0, 0, 0, 0]
+            continue
+
+        after = snapshot_file(full_path) if stat is not None else None
+        if before is not None and after is not None and after['sha1'] == before['sha1']:
+            result[rel] = [0, 0, 0, 0]
+            continue
+
+        old = _unpack(before['line_hashes']) if before is not None else array('I')
+        new = _unpack(after['line_hashes']) if after is not None else array('I')
+        result[rel] = list(diff_counts(old, new))
+    return result
+
+
+def discard_snapshot(breakdown_file, step_id):
+    with breakdown_lock(breakdown_file, exclusive=True):
+        snapshots = load_snapshots(breakdown_file)
+        if snapshots.pop(step_id, None) is not None:
+            atomic_write_json(snapshot_path(breakdown_file), snapshots)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python file_snapshot.py <breakdown_file> <step_id> [take|diff]")
+        sys.exit(1)
+
+    breakdown_file, step_id = sys.argv[1], sys.argv[2]
+    action = sys.argv[3] if len(sys.argv) > 3 else 'diff'
+
+    if action == 'take':
+        with open(breakdown_file, 'r') as f:
+            steps = {step['id']: step for step in json.load(f)['expanded_sub_steps']}
+        if step_id not in steps:
+            print(f"Error: Step '{step_id}' not found in breakdown file")
+            sys.exit(1)
+        count = take_snapshot(breakdown_file, step_id, steps[step_id].get('file_actions', []))
+        print(f"📸 Snapshotted {count} file(s) for {step_id}")
+    elif action == 'diff':
+        result = diff_snapshot(breakdown_file, step_id)
+        if result is None:
+            print(f"No snapshot for {step_id}")
+            sys.exit(1)
+        for rel, (added, removed, added_all, removed_all) in result.items():
+            print(f"  {rel}: +{added} -{removed} code lines (+{added_all} -{removed_all} total)")
+    else:
+        print(f"Error: Invalid action '{action}'")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
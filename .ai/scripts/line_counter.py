@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Comment-aware line counter for the languages in the Narrator-Console tree
+Usage: python line_counter.py [path ...] [--by-language] [--json]
+       python line_counter.py [root] --benchmark [--repeat N]
+
+Each file is scanned once as raw bytes (memory-mapped when large) by a small
+state machine: code, line comment, block comment or string. Every line is
+classified as code (any code token), comment (only comment text) or blank.
+Languages are picked by extension or file name and new ones can be added
+with register_language().
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+# Files larger than this are memory-mapped instead of read
+MMAP_THRESHOLD = 1024 * 1024
+
+BLANK, COMMENT, CODE = 0, 1, 2
+
+LineCounts = namedtuple('LineCounts', ['code', 'comment', 'blank'])
+
+_NON_SPACE = re.compile(rb'\S')
+_CODE_LINE = re.compile(rb'^[ \t\r\f\v]*\S', re.MULTILINE)
+
+
+class Language:
+    """Comment and string syntax for one language"""
+
+    def __init__(self, name, line=(), block=(), strings=()):
+        self.name = name
+        self.line = frozenset(line)
+        self.block = dict(block)
+        self.strings = {}
+        for delim, multiline in strings:
+            self.strings[delim] = (_string_body(delim, multiline), multiline)
+
+        tokens = sorted(set(line) | set(self.block) | set(self.strings), key=len, reverse=True)
+        # A pattern that never matches when the language has no comments or strings
+        self.token_re = re.compile(b'|'.join(re.escape(token) for token in tokens) if tokens else b'(?!)')
+
+
+def _string_body(delim, multiline):
+    """Regex matching the rest of a string literal after its opening delimiter, through the close"""
+    first = re.escape(delim[:1])
+    newline = b'' if multiline else b'\\n'
+    plain = b'[^\\\\' + first + newline + b']*'
+    if len(delim) == 1:
+        return re.compile(plain + b'(?:\\\\.' + plain + b')*' + re.escape(delim), re.DOTALL)
+    # Multi-character delimiters (Python triple quotes): the first character may appear on its own
+    lone = first + b'(?!' + re.escape(delim[1:]) + b')'
+    return re.compile(plain + b'(?:(?:\\\\.|' + lone + b')' + plain + b')*' + re.escape(delim), re.DOTALL)
+
+
+LANGUAGES = {}
+EXTENSIONS = {}
+FILENAMES = {}
+
+
+def register_language(name, extensions=(), filenames=(), line=(), block=(), strings=()):
+    """Add (or replace) a language and map extensions such as '.ts' and exact file names to it"""
+    language = Language(name, line, block, strings)
+    LANGUAGES[name] = language
+    for extension in extensions:
+        EXTENSIONS[extension] = language
+    for filename in filenames:
+        FILENAMES[filename] = language
+    return language
+
+
+C_BLOCK = ((b'/*', b'*/'),)
+QUOTES = ((b'"', False), (b"'", False))
+
+register_language('javascript', ['.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.mts', '.cts'],
+                  line=[b'//'], block=C_BLOCK, strings=QUOTES + ((b'`', True),))
+register_language('css', ['.css'], block=C_BLOCK, strings=QUOTES)
+register_language('scss', ['.scss', '.less'], line=[b'//'], block=C_BLOCK, strings=QUOTES)
+register_language('html', ['.html', '.htm', '.xml', '.svg'], block=((b'<!--', b'-->'),))
+register_language('markdown', ['.md', '.markdown'], block=((b'<!--', b'-->'),))
+# tsconfig-style JSON allows comments
+register_language('json', ['.json', '.jsonc', '.json5'], line=[b'//'], block=C_BLOCK, strings=((b'"', False),))
+register_language('yaml', ['.yml', '.yaml'], line=[b'#'], strings=QUOTES)
+register_language('python', ['.py'], line=[b'#'],
+                  strings=((b'"""', True), (b"'''", True)) + QUOTES)
+register_language('shell', ['.sh', '.bash', '.zsh'],
+                  ['.gitignore', '.npmrc', '.nvmrc', '.env', '.editorconfig'], line=[b'#'], strings=QUOTES)
+register_language('text', ['.txt'])
+# Unknown files: the comment markers the original counter recognised
+DEFAULT_LANGUAGE = Language('default', line=[b'//'], block=C_BLOCK)
+
+
+def language_for(path):
+    """Language for a path by exact file name, then extension"""
+    name = os.path.basename(path)
+    language = FILENAMES.get(name)
+    if language is None:
+        language = EXTENSIONS.get(os.path.splitext(name)[1].lower(), DEFAULT_LANGUAGE)
+    return language
+
+
+def scan(buf, language, kinds=None):
+    """
+    Classify every line of a bytes-like buffer in one pass
+    Returns LineCounts; if kinds is a bytearray, each line's BLANK/COMMENT/CODE is appended to it
+    """
+    n = len(buf)
+    counts = [0, 0, 0]
+    token_search = language.token_re.search
+    non_space = _NON_SPACE.search
+    find = buf.find
+    rfind = buf.rfind
+    if isinstance(buf, bytes):
+        count_newlines = buf.count
+    else:
+        def count_newlines(sub, start, end):
+            return buf[start:end].count(sub)
+
+    line_code = line_comment = False
+    pos = 0
+
+    def end_line():
+        kind = CODE if line_code else COMMENT if line_comment else BLANK
+        counts[kind] += 1
+        if kinds is not None:
+            kinds.append(kind)
+
+    while pos < n:
+        match = token_search(buf, pos)
+        stop = match.start() if match else n
+
+        # Plain code between tokens: finish the current line, bulk-count whole lines, start the last one
+        newline = find(b'\n', pos, stop)
+        if newline == -1:
+            if not line_code and stop > pos and non_space(buf, pos, stop):
+                line_code = True
+        else:
+            if not line_code and non_space(buf, pos, newline):
+                line_code = True
+            end_line()
+            last = rfind(b'\n', newline, stop)
+            if last > newline:
+                if kinds is None:
+                    lines = count_newlines(b'\n', newline + 1, last + 1)
+                    code = sum(1 for _ in _CODE_LINE.finditer(buf, newline + 1, last))
+                    counts[CODE] += code
+                    counts[BLANK] += lines - code
+                else:
+                    start = newline + 1
+                    while start <= last:
+                        end = find(b'\n', start, last + 1)
+                        kinds.append(CODE if non_space(buf, start, end) else BLANK)
+                        counts[kinds[-1]] += 1
+                        start = end + 1
+            line_comment = False
+            line_code = non_space(buf, last + 1, stop) is not None
+
+        if match is None:
+            break
+        token = match.group()
+        pos = match.end()
+
+        if token in language.line:
+            line_comment = True
+            newline = find(b'\n', pos)
+            pos = n if newline == -1 else newline
+
+        elif token in language.block:
+            close = language.block[token]
+            line_comment = True
+            end = find(close, pos)
+            limit = n if end == -1 else end
+            newline = find(b'\n', pos, limit)
+            while newline != -1:
+                end_line()
+                line_code = False
+                pos = newline + 1
+                newline = find(b'\n', pos, limit)
+                line_comment = non_space(buf, pos, limit if newline == -1 else newline) is not None
+            if end == -1:
+                pos = n
+            else:
+                line_comment = True
+                pos = end + len(close)
+
+        else:
+            body, multiline = language.strings[token]
+            line_code = True
+            closed = body.match(buf, pos)
+            if closed:
+                end = closed.end()
+            elif multiline:
+                end = n
+            else:
+                newline = find(b'\n', pos)
+                end = n if newline == -1 else newline
+            # Every line a string spans (multi-line or backslash-continued) counts as code
+            newline = find(b'\n', pos, end)
+            while newline != -1:
+                end_line()
+                line_comment = False
+                newline = find(b'\n', newline + 1, end)
+            pos = end
+
+    if n and buf[n - 1] not in (b'\n', 10):
+        end_line()
+    return LineCounts(*reversed(counts))
+
+
+def classify_lines(buf, language):
+    """Per-line BLANK/COMMENT/CODE kinds of a buffer as a bytearray"""
+    kinds = bytearray()
+    scan(buf, language, kinds)
+    return kinds
+
+
+def count_file(file_path, language=None):
+    """Code, comment and blank lines in a file; binary or missing files count as zero"""
+    language = language or language_for(str(file_path))
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return LineCounts(0, 0, 0)
+            if size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    if buf.find(b'\0', 0, 8192) != -1:
+                        return LineCounts(0, 0, 0)
+                    return scan(buf, language)
+            buf = f.read()
+    except (FileNotFoundError, IsADirectoryError, PermissionError):
+        return LineCounts(0, 0, 0)
+    if b'\0' in buf[:8192]:
+        return LineCounts(0, 0, 0)
+    return scan(buf, language)
+
+
+def _legacy_count(file_path):
+    """The original readlines() counter from calculate_actual_lines.py, kept as a benchmark baseline"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        actual_lines = 0
+        for line in lines:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//') and not stripped.startswith('/*') and stripped != '*/':
+                actual_lines += 1
+        return actual_lines
+    except (FileNotFoundError, UnicodeDecodeError):
+        return 0
+
+
+def benchmark(paths, repeat=5):
+    """Time the legacy, byte-regex and comment-aware counters over the same files (best of `repeat`)"""
+    from loc_index import count_lines_bytes
+
+    counters = [
+        ('legacy readlines', _legacy_count),
+        ('byte regex', count_lines_bytes),
+        ('comment-aware', lambda path: count_file(path).code),
+    ]
+    results = []
+    for name, counter in counters:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            total = sum(counter(path) for path in paths)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({'counter': name, 'lines': total, 'seconds': best})
+    return results
+
+
+def main():
+    from loc_index import DEFAULT_IGNORE, DEFAULT_ROOT, walk_files
+
+    parser = argparse.ArgumentParser(description="Count code, comment and blank lines")
+    parser.add_argument('paths', nargs='*', default=[str(DEFAULT_ROOT)], help="Files or directories")
+    parser.add_argument('--by-language', action='store_true', help="Break totals down by language")
+    parser.add_argument('--json', action='store_true', help="Print per-file counts as JSON")
+    parser.add_argument('--benchmark', action='store_true', help="Compare against the previous counters")
+    parser.add_argument('--repeat', type=int, default=5, help="Benchmark repetitions")
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, rel) for rel, _, _ in walk_files(path, DEFAULT_IGNORE))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"Error: '{path}' not found")
+            sys.exit(1)
+
+    if args.benchmark:
+        size = sum(os.path.getsize(path) for path in files)
+        print(f"⏱️  {len(files)} files, {size / 1024:.0f} KB, best of {args.repeat}:")
+        for result in benchmark(files, args.repeat):
+            print(f"  {result['counter']:<18} {result['lines']:>8} lines {result['seconds'] * 1000:>9.2f} ms")
+        return
+
+    per_file = {path: count_file(path) for path in files}
+    if args.json:
+        print(json.dumps({path: counts._asdict() for path, counts in per_file.items()}, indent=2))
+        return
+
+    groups = {}
+    for path, counts in per_file.items():
+        key = language_for(path).name if args.by_language else 'total'
+        groups[key] = [a + b for a, b in zip(groups.get(key, [0, 0, 0]), counts)]
+    print(f"{'':<12} {'Code':>8} {'Comment':>8} {'Blank':>8}")
+    for key, (code, comment, blank) in sorted(groups.items()):
+        print(f"{key:<12} {code:>8} {comment:>8} {blank:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@
 
 # Calculate actual lines of code for a completed step
 # Usage: ./lines.sh SETUP_001
+#        ./lines.sh SETUP_001 --recompute
+#        ./lines.sh --all [--recompute]
+#
+# When tracker_daemon.py is serving, the request goes to it over its socket;
+# otherwise calculate_actual_lines.py is run directly.
 
 STEP_ID="$1"
 
@@ -18,9 +23,42 @@ fi
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 PYTHON_SCRIPT="$SCRIPT_DIR/calculate_actual_lines.py"
+SOCKET="${TRACKER_SOCKET:-$PROJECT_ROOT/.ai/.tracker.sock}"
+COMMANDS="use $BREAKDOWN_FILE; lines $STEP_ID"
+
+# Send the batch to the daemon; its reply ends in a '# ok' or '# failed' status line
+send_to_daemon() {
+    if command -v socat >/dev/null 2>&1; then
+        printf '%s\n' "$COMMANDS" | socat - "UNIX-CONNECT:$SOCKET" 2>/dev/null
+    elif nc -h 2>&1 | grep -q -- '-U'; then
+        printf '%s\n' "$COMMANDS" | nc -U "$SOCKET" 2>/dev/null
+    fi
+}
+
+# Fast path: hand the command to the running tracker daemon and exit with its status
+if [[ -S "$SOCKET" && $# -eq 1 && "$STEP_ID" != "--all" ]]; then
+    REPLY_TEXT="$(send_to_daemon)"
+    STATUS="${REPLY_TEXT##*$'\n'}"
+    if [[ "$STATUS" == "# ok" || "$STATUS" == "# failed" ]]; then
+        [[ "$REPLY_TEXT" != "$STATUS" ]] && printf '%s\n' "${REPLY_TEXT%$'\n'*}"
+        [[ "$STATUS" == "# ok" ]]
+        exit $?
+    fi
+fi
 
 # Activate virtual environment and run Python script
 cd "$PROJECT_ROOT"
 source .venv/bin/activate
 
-python "$PYTHON_SCRIPT" "$BREAKDOWN_FILE" "$STEP_ID"
\ No newline at end of file
+# Daemon is up but neither socat nor nc -U is available
+if [[ -S "$SOCKET" && $# -eq 1 && "$STEP_ID" != "--all" ]]; then
+    # Exit status 2 means no daemon answered, so fall through to a direct run
+    OUTPUT="$(python "$SCRIPT_DIR/tracker_daemon.py" send "$COMMANDS" --socket "$SOCKET")"
+    STATUS=$?
+    if [[ $STATUS -ne 2 ]]; then
+        [[ -n "$OUTPUT" ]] && printf '%s\n' "$OUTPUT"
+        exit $STATUS
+    fi
+fi
+
+python "$PYTHON_SCRIPT" "$BREAKDOWN_FILE" "$STEP_ID" "${@:2}"
\ No newline at end of file
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Incremental line-count index over a source tree
+Usage: python loc_index.py [root] [--ignore GLOB ...] [--workers N] [--top N] [--rebuild]
+
+Files are counted by line_counter.py's comment-aware byte scanner (no
+per-line str objects) and the code/comment/blank counts are cached by
+(size, mtime) in .ai/.loc_index.json, so a refresh only re-reads files that
+changed. Ignored directories (node_modules, build
+output, ...) are pruned during the walk, and changed files are counted in a
+process pool.
+"""
+
+import argparse
+import fnmatch
+import json
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from line_counter import count_file
+from step_log import atomic_write_json
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+DEFAULT_ROOT = PROJECT_ROOT / 'Narrator-Console'
+INDEX_FILE = PROJECT_ROOT / '.ai' / '.loc_index.json'
+
+# Bump when the counting rules change so cached counts are discarded
+COUNTER_VERSION = 2
+
+DEFAULT_IGNORE = [
+    'node_modules', '.git', '.vite', 'out', 'dist', 'dist-*', 'coverage',
+    '*.map', '*.lock', 'package-lock.json', '*.png', '*.jpg', '*.ico', '*.woff*',
+]
+
+# Files larger than this are memory-mapped instead of read
+MMAP_THRESHOLD = 1024 * 1024
+
+# Below this many changed files a pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+# The original rule: a non-blank line that doesn't start with // or /* and isn't a lone */
+_CODE_LINE = re.compile(rb'^[ \t\r\f\v]*(?!//|/\*|\*/[ \t\r\f\v]*$)\S', re.MULTILINE)
+
+
+def count_lines_bytes(file_path):
+    """Count lines by the original prefix rule, scanning raw bytes; binary or missing files count 0"""
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0
+            if size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    if buf.find(b'\0', 0, 8192) != -1:
+                        return 0
+                    return sum(1 for _ in _CODE_LINE.finditer(buf))
+            buf = f.read()
+    except (FileNotFoundError, IsADirectoryError, PermissionError):
+        return 0
+    if b'\0' in buf[:8192]:
+        return 0
+    return sum(1 for _ in _CODE_LINE.finditer(buf))
+
+
+def is_ignored(rel_path, name, ignore):
+    """True if a path's name or relative path matches any ignore glob"""
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, pattern) for pattern in ignore)
+
+
+def walk_files(root, ignore=DEFAULT_IGNORE):
+    """Yield (relative_path, size, mtime_ns) for every non-ignored file, pruning ignored directories"""
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, rel_dir))
+        except (FileNotFoundError, PermissionError):
+            continue
+        with entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if is_ignored(rel, entry.name, ignore):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(rel)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    yield rel, stat.st_size, stat.st_mtime_ns
+
+
+def _count_batch(paths):
+    return [tuple(count_file(path)) for path in paths]
+
+
+class LocIndex:
+    """Cached per-file line counts for one source tree"""
+
+    def __init__(self, root=DEFAULT_ROOT, ignore=None, index_file=INDEX_FILE, workers=None):
+        self.root = str(Path(root).resolve())
+        self.ignore = list(DEFAULT_IGNORE if ignore is None else ignore)
+        self.index_file = Path(index_file)
+        self.workers = workers
+        self.files = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load cached counts for this root (discarded if the counter or ignore list changed)"""
+        try:
+            with open(self.index_file, 'r') as f:
+                stored = json.load(f)
+            tree = stored['trees'][self.root]
+            if stored['counter'] == COUNTER_VERSION and tree['ignore'] == self.ignore:
+                self.files = tree['files']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+    def save(self):
+        """Write the index back if anything changed (other roots in the file are kept)"""
+        if not self.dirty:
+            return
+        try:
+            with open(self.index_file, 'r') as f:
+                stored = json.load(f)
+            if stored.get('counter') != COUNTER_VERSION:
+                raise KeyError('counter')
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            stored = {'counter': COUNTER_VERSION, 'trees': {}}
+        stored['trees'][self.root] = {'ignore': self.ignore, 'files': self.files}
+        try:
+            atomic_write_json(self.index_file, stored)
+        except OSError:
+            pass
+        self.dirty = False
+
+    def _recount(self, stale):
+        """Count (rel, size, mtime_ns) entries and store them; parallel when there are many"""
+        paths = [os.path.join(self.root, rel) for rel, _, _ in stale]
+        if len(paths) >= PARALLEL_THRESHOLD and self.workers != 1:
+            workers = self.workers or os.cpu_count() or 1
+            size = max(16, len(paths) // (workers * 4))
+            batches = [paths[i:i + size] for i in range(0, len(paths), size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                counts = [count for batch in pool.map(_count_batch, batches) for count in batch]
+        else:
+            counts = _count_batch(paths)
+        for (rel, size, mtime_ns), (code, comment, blank) in zip(stale, counts):
+            self.files[rel] = [size, mtime_ns, code, comment, blank]
+        if stale:
+            self.dirty = True
+
+    def refresh(self):
+        """Re-walk the tree, recount changed files and drop deleted ones; returns files recounted"""
+        seen = set()
+        stale = []
+        for rel, size, mtime_ns in walk_files(self.root, self.ignore):
+            seen.add(rel)
+            cached = self.files.get(rel)
+            if cached is None or cached[0] != size or cached[1] != mtime_ns:
+                stale.append((rel, size, mtime_ns))
+        self._recount(stale)
+        removed = [rel for rel in self.files if rel not in seen]
+        for rel in removed:
+            del self.files[rel]
+        if removed:
+            self.dirty = True
+        self.save()
+        return len(stale)
+
+    def count(self, rel_paths):
+        """Code line counts for specific files relative to the root, stat-checking only those files"""
+        stale = []
+        for rel in rel_paths:
+            try:
+                stat = os.stat(os.path.join(self.root, rel))
+            except (FileNotFoundError, NotADirectoryError):
+                self.dirty |= self.files.pop(rel, None) is not None
+                continue
+            cached = self.files.get(rel)
+            if cached is None or cached[0] != stat.st_size or cached[1] != stat.st_mtime_ns:
+                stale.append((rel, stat.st_size, stat.st_mtime_ns))
+        self._recount(stale)
+        self.save()
+        return {rel: self.files[rel][2] if rel in self.files else 0 for rel in rel_paths}
+
+    def total(self):
+        return sum(entry[2] for entry in self.files.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental line-count index over a source tree")
+    parser.add_argument('root', nargs='?', default=str(DEFAULT_ROOT), help="Tree to index")
+    parser.add_argument('--ignore', action='append', help="Extra ignore glob (repeatable)")
+    parser.add_argument('--no-default-ignore', action='store_true', help="Don't apply the built-in ignore list")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for changed files")
+    parser.add_argument('--top', type=int, default=10, help="Largest files to list")
+    parser.add_argument('--rebuild', action='store_true', help="Discard cached counts for this tree")
+    args = parser.parse_args()
+
+    if not Path(args.root).is_dir():
+        print(f"Error: Directory '{args.root}' not found")
+        sys.exit(1)
+
+    ignore = ([] if args.no_default_ignore else DEFAULT_IGNORE) + (args.ignore or [])
+    index = LocIndex(args.root, ignore, workers=args.workers)
+    if args.rebuild:
+        index.files = {}
+    recounted = index.refresh()
+
+    print(f"📏 {index.root}: {index.total()} lines in {len(index.files)} files ({recounted} recounted)")
+    largest = sorted(index.files.items(), key=lambda item: item[1][2], reverse=True)[:args.top]
+    for rel, (_, _, count, _, _) in largest:
+        print(f"  {rel}: {count} lines")
+
+
+if __name__ == "__main__":
+    main()
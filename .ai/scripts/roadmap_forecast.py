@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo completion forecast for a roadmap
+Usage: python roadmap_forecast.py [roadmap_file] [--simulations N] [--workers N] [--seed N] [--no-expand] [--json]
+
+Every completed step with a tracked actual gives one estimate-vs-actual ratio
+(actual minutes / estimated minutes). Each simulated run draws a ratio per
+remaining step from that empirical set and multiplies it into the step's
+estimate; completed steps keep their actual duration and in-progress steps
+never finish before the time already spent. Finish times are propagated over
+the same DAG as roadmap_graph.py, one NumPy column per simulated run, so a
+node costs a few vector operations no matter how many runs there are.
+
+Runs are split into fixed batches, each with its own seed, so results don't
+depend on how many worker processes share the batches. Needs numpy.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from roadmap_graph import DEFAULT_ROADMAP, load_roadmap
+
+DEFAULT_SIMULATIONS = 100_000
+
+# Runs simulated together, capped so the (nodes x runs) finish matrix stays near 32 MiB
+BATCH_SIZE = 20_000
+BATCH_CELLS = 4_000_000
+
+PERCENTILES = (50, 90)
+
+
+def empirical_ratios(graph):
+    """Actual / estimated minutes for every completed step with a tracked actual"""
+    ratios = []
+    for info in graph.info:
+        actual, estimate = info.get('actual_minutes'), info.get('estimated_minutes')
+        if actual is not None and estimate and estimate > 0:
+            ratios.append(actual / estimate)
+    return np.array(ratios, dtype=np.float64)
+
+
+def build_plan(graph):
+    """Plain arrays in topological order, small enough to ship to worker processes"""
+    position = {i: k for k, i in enumerate(graph.order)}
+    fixed, estimate, floor = [], [], []
+    for i in graph.order:
+        info = graph.info[i]
+        # NaN marks a duration that is sampled per run
+        fixed.append(info['actual_minutes'] if 'actual_minutes' in info else
+                     graph.duration[i] if info.get('status') == 'completed' else np.nan)
+        estimate.append(info.get('estimated_minutes', graph.duration[i]))
+        floor.append(info.get('elapsed_minutes', 0.0))
+
+    # Dependents of a roadmap step wait for its last node, which comes last in node order
+    exits = {}
+    for i, info in enumerate(graph.info):
+        exits[info.get('roadmap_step', graph.ids[i])] = position[i]
+
+    return {
+        'parents': [[position[p] for p in graph.parents[i]] for i in graph.order],
+        'fixed': np.array(fixed, dtype=np.float64),
+        'estimate': np.array(estimate, dtype=np.float64),
+        'floor': np.array(floor, dtype=np.float64),
+        'sinks': sorted(position[i] for i in graph.sinks),
+        'steps': list(exits),
+        'exits': list(exits.values()),
+    }
+
+
+def simulate_batch(plan, ratios, runs, seed):
+    """Finish times of every roadmap step (rows, in plan['steps'] order) plus the project (last row)"""
+    rng = np.random.default_rng(seed)
+    finish = np.empty((len(plan['parents']), runs), dtype=np.float64)
+    start = np.empty(runs, dtype=np.float64)
+    for k, parents in enumerate(plan['parents']):
+        if parents:
+            np.copyto(start, finish[parents[0]])
+            for p in parents[1:]:
+                np.maximum(start, finish[p], out=start)
+        else:
+            start.fill(0.0)
+
+        row = finish[k]
+        if np.isnan(plan['fixed'][k]):
+            np.multiply(ratios[rng.integers(0, len(ratios), runs)], plan['estimate'][k], out=row)
+            if plan['floor'][k] > 0:
+                np.maximum(row, plan['floor'][k], out=row)
+            row += start
+        else:
+            np.add(start, plan['fixed'][k], out=row)
+
+    project = finish[plan['sinks']].max(axis=0)
+    return np.vstack([finish[plan['exits']], project])
+
+
+def _simulate_job(job):
+    return simulate_batch(*job)
+
+
+def forecast(graph, simulations=DEFAULT_SIMULATIONS, workers=1, seed=0, ratios=None):
+    """P50/P90 finish (minutes from project start) per roadmap step and overall"""
+    if ratios is None:
+        ratios = empirical_ratios(graph)
+    if len(ratios) == 0:
+        # No history yet: every run reproduces the point estimate
+        ratios = np.ones(1)
+    plan = build_plan(graph)
+
+    batch = max(1, min(BATCH_SIZE, BATCH_CELLS // max(1, len(plan['parents']))))
+    sizes = [min(batch, simulations - done) for done in range(0, simulations, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(plan, ratios, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            batches = list(pool.map(_simulate_job, jobs))
+    else:
+        batches = [_simulate_job(job) for job in jobs]
+
+    finishes = np.hstack(batches)
+    quantiles = np.percentile(finishes, PERCENTILES, axis=1)
+    rows = [{'step': step, 'p50': quantiles[0][r], 'p90': quantiles[1][r], 'mean': finishes[r].mean()}
+            for r, step in enumerate(plan['steps'])]
+    return {
+        'simulations': simulations,
+        'ratios': len(ratios),
+        'steps': rows,
+        'project': {'p50': quantiles[0][-1], 'p90': quantiles[1][-1], 'mean': finishes[-1].mean()},
+    }
+
+
+def _hours(minutes):
+    return f"{minutes / 60:.1f}h"
+
+
+def print_forecast(graph, result, ratios, seconds):
+    planned = {}
+    for i in graph.order:
+        planned[graph.info[i].get('roadmap_step', graph.ids[i])] = graph.earliest[i] + graph.duration[i]
+
+    if len(ratios):
+        low, median, high = np.percentile(ratios, (10, 50, 90))
+        print(f"📊 {len(ratios)} completed step(s): actual/estimate ratio P10 {low:.2f}, P50 {median:.2f}, P90 {high:.2f}")
+    else:
+        print("⚠️  No completed steps with tracked durations yet; forecast equals the point estimate")
+
+    print(f"\n{'Roadmap step':<24} {'Plan':>8} {'P50':>8} {'P90':>8}")
+    for row in result['steps']:
+        print(f"{row['step']:<24} {_hours(planned[row['step']]):>8} {_hours(row['p50']):>8} {_hours(row['p90']):>8}")
+    project = result['project']
+    print(f"\n📅 Project: plan {_hours(graph.finish)}, P50 {_hours(project['p50'])}, P90 {_hours(project['p90'])}")
+    print(f"⏱️  {result['simulations']:,} simulations in {seconds:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo completion forecast for a roadmap")
+    parser.add_argument('roadmap_file', nargs='?', default=str(DEFAULT_ROADMAP), help="Roadmap JSON file")
+    parser.add_argument('--simulations', '-n', type=int, default=DEFAULT_SIMULATIONS, help="Simulated runs")
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help="Worker processes (0 = one per CPU)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--no-expand', action='store_true', help="Don't expand breakdowns into sub-steps")
+    parser.add_argument('--json', action='store_true', help="Print the forecast as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.roadmap_file):
+        print(f"Error: Roadmap file '{args.roadmap_file}' not found")
+        sys.exit(1)
+    if args.simulations < 1:
+        print("Error: --simulations must be at least 1")
+        sys.exit(1)
+    try:
+        graph = load_roadmap(args.roadmap_file, expand=not args.no_expand)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    ratios = empirical_ratios(graph)
+    started = time.perf_counter()
+    result = forecast(graph, args.simulations, args.workers or os.cpu_count(), args.seed, ratios)
+    seconds = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({**result, 'plan_minutes': graph.finish, 'seconds': seconds}, indent=2))
+    else:
+        print_forecast(graph, result, ratios, seconds)
+
+
+if __name__ == "__main__":
+    main()
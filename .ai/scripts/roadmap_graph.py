@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Dependency graph, schedule and critical path for a roadmap JSON
+Usage: python roadmap_graph.py [roadmap_file] [--no-expand] [--set STEP=MINUTES ...] [--json]
+       python roadmap_graph.py --benchmark N
+
+Roadmap steps are linked by their `dependencies`. A step with a breakdown
+({step_id}_breakdown.json next to the roadmap) is expanded into its sub-steps,
+run in order: the first sub-step takes the step's dependencies and dependents
+wait for the last one. Durations blend estimates with tracked actuals:
+completed steps use actual_duration_minutes, in-progress steps at least their
+elapsed time, and pending steps the calibrated estimate from step_analytics
+(or the roadmap estimate split by estimated_lines when there is no fit).
+
+The graph is checked for cycles and topologically sorted once. Earliest
+starts are propagated forward and each node's longest path to the end
+("tail") backward, so latest start = project finish - tail. Changing one
+duration only revisits the descendants (forward) and ancestors (backward)
+whose values actually move.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from step_analytics import Estimator
+from step_log import load_materialized
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+DEFAULT_ROADMAP = PROJECT_ROOT / '.ai' / 'tasks' / 'Narrator-Console' / 'roadmap' / 'Narrator-Console_roadmap.json'
+
+# Slack below this many minutes counts as zero (float noise)
+EPSILON = 1e-6
+
+
+class CycleError(ValueError):
+    """The dependency graph has a cycle; .cycle holds the step ids around it"""
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("Dependency cycle: " + " -> ".join(cycle))
+
+
+class RoadmapGraph:
+    """Step DAG with incrementally maintained earliest/latest start times"""
+
+    def __init__(self, nodes):
+        """nodes: iterable of (step_id, dependency_ids, minutes, info_dict)"""
+        nodes = list(nodes)
+        self.ids = [node[0] for node in nodes]
+        self.index = {step_id: i for i, step_id in enumerate(self.ids)}
+        if len(self.index) != len(self.ids):
+            seen = set()
+            duplicate = next(step_id for step_id in self.ids if step_id in seen or seen.add(step_id))
+            raise ValueError(f"Duplicate step id '{duplicate}'")
+        self.duration = [float(node[2]) for node in nodes]
+        self.info = [node[3] if len(node) > 3 else {} for node in nodes]
+
+        self.parents = [[] for _ in nodes]
+        self.children = [[] for _ in nodes]
+        for i, node in enumerate(nodes):
+            for dep in node[1]:
+                if dep not in self.index:
+                    raise ValueError(f"Step '{node[0]}' depends on unknown step '{dep}'")
+                j = self.index[dep]
+                self.parents[i].append(j)
+                self.children[j].append(i)
+
+        self.order = self._topological_order()
+        self.position = [0] * len(nodes)
+        for position, i in enumerate(self.order):
+            self.position[i] = position
+        self.sinks = [i for i in range(len(nodes)) if not self.children[i]]
+
+        self.earliest = [0.0] * len(nodes)
+        self.tail = [0.0] * len(nodes)
+        for i in self.order:
+            self.earliest[i] = max((self.earliest[p] + self.duration[p] for p in self.parents[i]), default=0.0)
+        for i in reversed(self.order):
+            self.tail[i] = self.duration[i] + max((self.tail[c] for c in self.children[i]), default=0.0)
+
+    def _topological_order(self):
+        """Kahn's algorithm; raises CycleError naming one cycle if the graph isn't a DAG"""
+        pending = [len(parents) for parents in self.parents]
+        ready = [i for i, count in enumerate(pending) if count == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for c in self.children[i]:
+                pending[c] -= 1
+                if pending[c] == 0:
+                    ready.append(c)
+        if len(order) < len(self.ids):
+            raise CycleError(self._find_cycle({i for i, count in enumerate(pending) if count > 0}))
+        return order
+
+    def _find_cycle(self, remaining):
+        """Walk parent links inside the unsorted nodes until one repeats"""
+        i = min(remaining)
+        seen = {}
+        path = []
+        while i not in seen:
+            seen[i] = len(path)
+            path.append(i)
+            i = next(p for p in self.parents[i] if p in remaining)
+        cycle = path[seen[i]:][::-1]
+        return [self.ids[j] for j in cycle + [cycle[0]]]
+
+    @property
+    def finish(self):
+        """Project length in minutes"""
+        return max((self.earliest[i] + self.duration[i] for i in self.sinks), default=0.0)
+
+    def earliest_start(self, step_id):
+        return self.earliest[self.index[step_id]]
+
+    def latest_start(self, step_id):
+        return self.finish - self.tail[self.index[step_id]]
+
+    def slack(self, step_id):
+        i = self.index[step_id]
+        return self.finish - self.tail[i] - self.earliest[i]
+
+    def update(self, step_id, minutes):
+        """Change one step's duration; returns how many nodes were recomputed"""
+        return self.update_many({step_id: minutes})
+
+    def update_many(self, durations):
+        """Change several durations at once; returns how many nodes were recomputed"""
+        changed = []
+        for step_id, minutes in durations.items():
+            if step_id not in self.index:
+                raise ValueError(f"Unknown step '{step_id}'")
+            i = self.index[step_id]
+            if self.duration[i] != float(minutes):
+                self.duration[i] = float(minutes)
+                changed.append(i)
+        if not changed:
+            return 0
+        return self._forward(changed) + self._backward(changed)
+
+    def _forward(self, changed):
+        """Re-propagate earliest starts below changed nodes, in topological order"""
+        position = self.position
+        heap = []
+        queued = set()
+        for i in changed:
+            for c in self.children[i]:
+                if c not in queued:
+                    queued.add(c)
+                    heapq.heappush(heap, (position[c], c))
+        visited = 0
+        while heap:
+            _, i = heapq.heappop(heap)
+            visited += 1
+            start = max((self.earliest[p] + self.duration[p] for p in self.parents[i]), default=0.0)
+            if start == self.earliest[i]:
+                continue
+            self.earliest[i] = start
+            for c in self.children[i]:
+                if c not in queued:
+                    queued.add(c)
+                    heapq.heappush(heap, (position[c], c))
+        return visited
+
+    def _backward(self, changed):
+        """Re-propagate tails above changed nodes, in reverse topological order"""
+        position = self.position
+        changed = set(changed)
+        heap = [(-position[i], i) for i in changed]
+        heapq.heapify(heap)
+        queued = set(changed)
+        visited = 0
+        while heap:
+            _, i = heapq.heappop(heap)
+            visited += 1
+            tail = self.duration[i] + max((self.tail[c] for c in self.children[i]), default=0.0)
+            if tail == self.tail[i] and i not in changed:
+                continue
+            self.tail[i] = tail
+            for p in self.parents[i]:
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-position[p], p))
+        return visited
+
+    def critical_path(self):
+        """Step ids on one longest path from a start step to the end"""
+        finish = self.finish
+        roots = [i for i in self.order if not self.parents[i]]
+        if not roots:
+            return []
+        i = max(roots, key=lambda r: self.tail[r])
+        if abs(self.tail[i] - finish) > EPSILON:
+            return []
+        path = [i]
+        while self.children[i]:
+            i = max(self.children[i], key=lambda c: self.tail[c])
+            path.append(i)
+        return [self.ids[j] for j in path]
+
+    def schedule(self):
+        """Per step in topological order: id, minutes, earliest/latest start and finish, slack, critical"""
+        finish = self.finish
+        rows = []
+        for i in self.order:
+            latest = finish - self.tail[i]
+            slack = latest - self.earliest[i]
+            if abs(slack) <= EPSILON:
+                slack = 0.0
+                latest = self.earliest[i]
+            rows.append({
+                'id': self.ids[i],
+                'minutes': self.duration[i],
+                'earliest_start': self.earliest[i],
+                'earliest_finish': self.earliest[i] + self.duration[i],
+                'latest_start': latest,
+                'latest_finish': latest + self.duration[i],
+                'slack': slack,
+                'critical': slack == 0.0,
+                **self.info[i],
+            })
+        return rows
+
+
+def _elapsed_minutes(step):
+    try:
+        started = datetime.strptime(step['start_time_iso'], "%Y-%m-%d %H:%M:%S")
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+    return max(0.0, (datetime.now() - started).total_seconds() / 60)
+
+
+def substep_estimate(step, fallback, estimator=None):
+    """Estimated duration of one breakdown sub-step, ignoring any tracked actuals"""
+    if estimator is not None and estimator.minute_scale > 0 and step.get('estimated_lines'):
+        return estimator.predict_minutes(step['estimated_lines'])
+    return fallback
+
+
+def substep_minutes(step, fallback, estimator=None):
+    """Blended duration of one breakdown sub-step"""
+    status = step.get('status', 'pending')
+    if status == 'completed' and step.get('actual_duration_minutes') is not None:
+        return float(step['actual_duration_minutes'])
+    estimate = substep_estimate(step, fallback, estimator)
+    if status == 'in_progress':
+        return max(estimate, _elapsed_minutes(step))
+    return estimate
+
+
+def _node_info(step, roadmap_step, estimate):
+    """Node info: owning roadmap step, status, the estimate and any tracked actual or elapsed time"""
+    status = step.get('status', 'pending')
+    info = {'roadmap_step': roadmap_step, 'status': status, 'estimated_minutes': estimate}
+    if status == 'completed' and step.get('actual_duration_minutes') is not None:
+        info['actual_minutes'] = float(step['actual_duration_minutes'])
+    elif status == 'in_progress':
+        info['elapsed_minutes'] = _elapsed_minutes(step)
+    return info
+
+
+def roadmap_nodes(roadmap_file, expand=True, estimator=None):
+    """(step_id, dependencies, minutes, info) nodes for a roadmap, expanding breakdowns into sub-steps"""
+    with open(roadmap_file, 'r') as f:
+        roadmap = json.load(f)
+    directory = Path(roadmap_file).parent
+
+    steps = roadmap.get('steps', [])
+    breakdowns = {}
+    if expand:
+        for step in steps:
+            path = directory / f"{step['step_id']}_breakdown.json"
+            if path.exists():
+                sub_steps = load_materialized(str(path)).get('expanded_sub_steps', [])
+                if sub_steps:
+                    breakdowns[step['step_id']] = sub_steps
+
+    # Dependents of an expanded step wait for its last sub-step
+    exit_id = {step_id: sub_steps[-1]['id'] for step_id, sub_steps in breakdowns.items()}
+
+    nodes = []
+    for step in steps:
+        step_id = step['step_id']
+        dependencies = [exit_id.get(dep, dep) for dep in step.get('dependencies', [])]
+        estimated = float(step.get('estimated_time_min') or 0)
+        sub_steps = breakdowns.get(step_id)
+        if not sub_steps:
+            minutes = estimated
+            if step.get('status') == 'completed' and step.get('actual_duration_minutes') is not None:
+                minutes = float(step['actual_duration_minutes'])
+            nodes.append((step_id, dependencies, minutes, _node_info(step, step_id, estimated)))
+            continue
+
+        # Without a duration fit, the roadmap estimate is split by estimated lines
+        total_lines = sum(sub.get('estimated_lines') or 0 for sub in sub_steps)
+        previous = None
+        for sub in sub_steps:
+            share = (sub.get('estimated_lines') or 0) / total_lines if total_lines else 1 / len(sub_steps)
+            minutes = substep_minutes(sub, estimated * share, estimator)
+            deps = dependencies if previous is None else [previous]
+            nodes.append((sub['id'], deps, minutes,
+                          _node_info(sub, step_id, substep_estimate(sub, estimated * share, estimator))))
+            previous = sub['id']
+    return nodes
+
+
+def load_roadmap(roadmap_file=DEFAULT_ROADMAP, expand=True, estimator=None):
+    return RoadmapGraph(roadmap_nodes(roadmap_file, expand, estimator or Estimator.load()))
+
+
+def random_dag(count, max_parents=3, seed=0):
+    """Synthetic layered DAG for benchmarking: each node depends on up to max_parents earlier nodes"""
+    rng = random.Random(seed)
+    nodes = []
+    for i in range(count):
+        window = range(max(0, i - 50), i)
+        parents = rng.sample(window, min(len(window), rng.randint(0, max_parents)))
+        nodes.append((f"S{i}", [f"S{p}" for p in parents], rng.uniform(5, 120)))
+    return nodes
+
+
+def benchmark(count, updates=1000):
+    nodes = random_dag(count)
+    started = time.perf_counter()
+    graph = RoadmapGraph(nodes)
+    build = time.perf_counter() - started
+
+    rng = random.Random(1)
+    visited = 0
+    started = time.perf_counter()
+    for _ in range(updates):
+        visited += graph.update(f"S{rng.randrange(count)}", rng.uniform(5, 120))
+    per_update = (time.perf_counter() - started) / updates
+
+    print(f"⏱️  {count} steps: build {build * 1000:.1f} ms, "
+          f"update {per_update * 1000:.3f} ms avg ({visited / updates:.0f} nodes revisited)")
+
+
+def _hours(minutes):
+    return f"{minutes / 60:.1f}h"
+
+
+def print_schedule(graph):
+    rows = graph.schedule()
+    print(f"{'Step':<20} {'Status':<12} {'Min':>7} {'ES':>8} {'LS':>8} {'Slack':>8}")
+    for row in rows:
+        marker = " ⚠️ critical" if row['critical'] else ""
+        print(f"{row['id']:<20} {row.get('status', ''):<12} {row['minutes']:>7.0f} {_hours(row['earliest_start']):>8} "
+              f"{_hours(row['latest_start']):>8} {_hours(row['slack']):>8}{marker}")
+    print(f"\n📅 Project length: {graph.finish:.0f} min ({_hours(graph.finish)}) over {len(rows)} steps")
+    print(f"🔗 Critical path: {' → '.join(graph.critical_path())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roadmap dependency graph, schedule and critical path")
+    parser.add_argument('roadmap_file', nargs='?', default=str(DEFAULT_ROADMAP), help="Roadmap JSON file")
+    parser.add_argument('--no-expand', action='store_true', help="Don't expand breakdowns into sub-steps")
+    parser.add_argument('--set', action='append', default=[], metavar='STEP=MINUTES',
+                        help="Override a step's duration (repeatable)")
+    parser.add_argument('--json', action='store_true', help="Print the schedule as JSON")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Time build and updates on a synthetic N-step DAG")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+
+    if not os.path.exists(args.roadmap_file):
+        print(f"Error: Roadmap file '{args.roadmap_file}' not found")
+        sys.exit(1)
+    try:
+        graph = load_roadmap(args.roadmap_file, expand=not args.no_expand)
+        overrides = {}
+        for item in args.set:
+            step_id, _, minutes = item.partition('=')
+            overrides[step_id] = float(minutes)
+        if overrides:
+            started = time.perf_counter()
+            visited = graph.update_many(overrides)
+            print(f"♻️  Applied {len(overrides)} override(s): {visited} nodes recomputed "
+                  f"in {(time.perf_counter() - started) * 1000:.3f} ms")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({'finish_minutes': graph.finish, 'critical_path': graph.critical_path(),
+                          'steps': graph.schedule()}, indent=2))
+    else:
+        print_schedule(graph)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,12 @@
 #   ./step.sh complete SETUP_001
 #   ./step.sh status SETUP_001
 #   ./step.sh summary
+#   ./step.sh compact
+#   ./step.sh tree          (summary of every breakdown under .ai/tasks)
+#   ./step.sh batch "complete SETUP_001; start SETUP_002"
+#
+# When tracker_daemon.py is serving, commands go to it over its socket;
+# otherwise track_step.py is run directly.
 
 STEP_ID="$1"
 ACTION="$2"
@@ -14,7 +20,7 @@ ACTION="$2"
 BREAKDOWN_FILE=".ai/tasks/Narrator-Console/roadmap/SETUP_breakdown.json"
 
 # If first arg is an action, shift parameters
-if [[ "$STEP_ID" =~ ^(start|complete|status|summary)$ ]]; then
+if [[ "$STEP_ID" =~ ^(start|complete|status|summary|compact|batch)$ ]]; then
     ACTION="$STEP_ID"
     STEP_ID="$2"
 fi
@@ -24,12 +30,69 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 PYTHON_SCRIPT="$SCRIPT_DIR/track_step.py"
 
+if [[ "$STEP_ID" == "tree" ]]; then
+    cd "$PROJECT_ROOT"
+    source .venv/bin/activate
+    shift
+    python "$SCRIPT_DIR/tree_summary.py" "$@"
+    exit $?
+fi
+SOCKET="${TRACKER_SOCKET:-$PROJECT_ROOT/.ai/.tracker.sock}"
+
+if [[ "$ACTION" == "batch" ]]; then
+    COMMANDS="use $BREAKDOWN_FILE; $STEP_ID"
+else
+    COMMANDS="use $BREAKDOWN_FILE; $ACTION $STEP_ID"
+fi
+
+# Send the batch to the daemon; its reply ends in a '# ok' or '# failed' status line
+send_to_daemon() {
+    if command -v socat >/dev/null 2>&1; then
+        printf '%s\n' "$COMMANDS" | socat - "UNIX-CONNECT:$SOCKET" 2>/dev/null
+    elif nc -h 2>&1 | grep -q -- '-U'; then
+        printf '%s\n' "$COMMANDS" | nc -U "$SOCKET" 2>/dev/null
+    fi
+}
+
+# Fast path: hand the command to the running tracker daemon and exit with its status
+if [[ -S "$SOCKET" ]]; then
+    REPLY_TEXT="$(send_to_daemon)"
+    STATUS="${REPLY_TEXT##*$'\n'}"
+    if [[ "$STATUS" == "# ok" || "$STATUS" == "# failed" ]]; then
+        [[ "$REPLY_TEXT" != "$STATUS" ]] && printf '%s\n' "${REPLY_TEXT%$'\n'*}"
+        [[ "$STATUS" == "# ok" ]]
+        exit $?
+    fi
+fi
+
 # Activate virtual environment and run Python script
 cd "$PROJECT_ROOT"
 source .venv/bin/activate
 
-if [[ "$ACTION" == "summary" ]]; then
-    python "$PYTHON_SCRIPT" "$BREAKDOWN_FILE" "" "summary"
+# Daemon is up but neither socat nor nc -U is available
+if [[ -S "$SOCKET" ]]; then
+    # Exit status 2 means no daemon answered, so fall through to a direct run
+    OUTPUT="$(python "$SCRIPT_DIR/tracker_daemon.py" send "$COMMANDS" --socket "$SOCKET")"
+    STATUS=$?
+    if [[ $STATUS -ne 2 ]]; then
+        [[ -n "$OUTPUT" ]] && printf '%s\n' "$OUTPUT"
+        exit $STATUS
+    fi
+fi
+
+if [[ "$ACTION" == "batch" ]]; then
+    # No daemon: run each command directly
+    IFS=';' read -ra PARTS <<< "$STEP_ID"
+    for PART in "${PARTS[@]}"; do
+        read -r PART_ACTION PART_ID <<< "$PART"
+        if [[ "$PART_ACTION" == "lines" ]]; then
+            python "$SCRIPT_DIR/calculate_actual_lines.py" "$BREAKDOWN_FILE" "$PART_ID"
+        elif [[ -n "$PART_ACTION" ]]; then
+            python "$PYTHON_SCRIPT" "$BREAKDOWN_FILE" "$PART_ID" "$PART_ACTION"
+        fi
+    done
+elif [[ "$ACTION" == "summary" || "$ACTION" == "compact" ]]; then
+    python "$PYTHON_SCRIPT" "$BREAKDOWN_FILE" "" "$ACTION"
 else
     python "$PYTHON_SCRIPT" "$BREAKDOWN_FILE" "$STEP_ID" "$ACTION"
 fi
\ No newline at end of file
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Estimate-accuracy analytics over step history
+Usage: python step_analytics.py [report|ingest|fit|predict <estimated_lines>] [--tasks-dir DIR] [--db PATH]
+
+Every breakdown under .ai/tasks (with pending event-log entries applied) is
+ingested into a SQLite store, one row per step. Files are re-ingested only
+when their mtime/size changes. Queries cover estimate error, lines per
+minute, the slowest steps and per-roadmap-step trends.
+
+'fit' regresses log(actual) on log(estimated) lines, and log(minutes) on
+log(actual lines). The coefficients are written to .ai/.estimator.json, so
+Estimator.predict_*() costs a couple of float operations.
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+from step_log import atomic_write_json, read_events, replay
+from tree_summary import DEFAULT_TASKS_DIR, discover_files, file_key
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_DB = SCRIPT_DIR.parent / '.step_analytics.db'
+ESTIMATOR_FILE = SCRIPT_DIR.parent / '.estimator.json'
+
+# With fewer samples than this the exponent is fixed at 1 and only the scale is fitted
+MIN_SLOPE_SAMPLES = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    file_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    path TEXT NOT NULL,
+    task TEXT NOT NULL,
+    roadmap_step TEXT,
+    step_id TEXT NOT NULL,
+    title TEXT,
+    status TEXT,
+    deprecated INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    estimated_lines INTEGER,
+    actual_lines INTEGER,
+    duration_seconds INTEGER,
+    end_time TEXT
+);
+CREATE INDEX IF NOT EXISTS steps_path ON steps (path);
+CREATE INDEX IF NOT EXISTS steps_roadmap ON steps (deprecated, roadmap_step, end_time);
+CREATE INDEX IF NOT EXISTS steps_status ON steps (deprecated, status);
+"""
+
+# Completed steps with both line counts, for accuracy queries and fitting
+MEASURED = """
+    deprecated = 0 AND status = 'completed'
+    AND estimated_lines > 0 AND actual_lines > 0
+"""
+
+
+def connect(db_path=DEFAULT_DB):
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _rows(rel, data):
+    parts = Path(rel).parts
+    task = parts[0] if len(parts) > 1 else ''
+    deprecated = int('deprecated' in parts[:-1])
+    for seq, step in enumerate(data['expanded_sub_steps']):
+        yield (
+            rel, task, data.get('step_id'), step['id'], step.get('title'), step.get('status', 'pending'),
+            deprecated, seq, step.get('estimated_lines'), step.get('actual_lines'),
+            step.get('actual_duration_seconds'), step.get('end_time_iso'),
+        )
+
+
+def ingest(conn, tasks_dir=DEFAULT_TASKS_DIR):
+    """Load new or changed breakdowns into the store and drop deleted ones; returns files ingested"""
+    tasks_dir = Path(tasks_dir)
+    known = dict(conn.execute("SELECT path, file_key FROM files"))
+    seen = set()
+    ingested = 0
+
+    with conn:
+        for path in discover_files(tasks_dir):
+            rel = os.path.relpath(path, tasks_dir)
+            seen.add(rel)
+            key = json.dumps(file_key(path))
+            if known.get(rel) == key:
+                continue
+
+            conn.execute("DELETE FROM steps WHERE path = ?", (rel,))
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                data = None
+            if isinstance(data, dict) and 'expanded_sub_steps' in data:
+                replay(data, read_events(path))
+                conn.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 _rows(rel, data))
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?)", (rel, key))
+            ingested += 1
+
+        for rel in set(known) - seen:
+            conn.execute("DELETE FROM steps WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+
+    return ingested
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * fraction
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def error_distribution(conn):
+    """Distribution of actual/estimated line ratios over measured steps"""
+    ratios = sorted(r for (r,) in conn.execute(
+        f"SELECT CAST(actual_lines AS REAL) / estimated_lines FROM steps WHERE {MEASURED}"))
+    if not ratios:
+        return {'steps': 0}
+    log_ratios = [math.log(r) for r in ratios]
+    return {
+        'steps': len(ratios),
+        'median_ratio': _percentile(ratios, 0.5),
+        'p10_ratio': _percentile(ratios, 0.1),
+        'p90_ratio': _percentile(ratios, 0.9),
+        'geometric_mean_ratio': math.exp(sum(log_ratios) / len(log_ratios)),
+        'mean_abs_pct_error': sum(abs(r - 1) for r in ratios) / len(ratios) * 100,
+        'underestimated': sum(1 for r in ratios if r > 1),
+    }
+
+
+def lines_per_minute(conn, by_roadmap_step=False):
+    """Actual lines per minute of tracked time, overall or per roadmap step"""
+    group = "roadmap_step" if by_roadmap_step else "'all'"
+    rows = conn.execute(f"""
+        SELECT {group}, SUM(actual_lines), SUM(duration_seconds) / 60.0, COUNT(*)
+        FROM steps
+        WHERE deprecated = 0 AND status = 'completed' AND actual_lines IS NOT NULL AND duration_seconds > 0
+        GROUP BY 1 ORDER BY 1
+    """)
+    return {key: {'lines': lines, 'minutes': round(minutes, 2), 'steps': count,
+                  'lines_per_minute': round(lines / minutes, 2) if minutes else None}
+            for key, lines, minutes, count in rows}
+
+
+def slowest_steps(conn, limit=10):
+    """Completed steps with the longest tracked duration"""
+    rows = conn.execute("""
+        SELECT task, step_id, title, duration_seconds, estimated_lines, actual_lines
+        FROM steps
+        WHERE deprecated = 0 AND status = 'completed' AND duration_seconds IS NOT NULL
+        ORDER BY duration_seconds DESC LIMIT ?
+    """, (limit,))
+    return [dict(zip(('task', 'step_id', 'title', 'duration_seconds', 'estimated_lines', 'actual_lines'), row))
+            for row in rows]
+
+
+def roadmap_trends(conn):
+    """Per roadmap step: completion progress and estimate ratio, in completion order"""
+    trends = {}
+    for roadmap_step, step_id, estimated, actual, seconds, end_time in conn.execute("""
+        SELECT roadmap_step, step_id, estimated_lines, actual_lines, duration_seconds, end_time
+        FROM steps
+        WHERE deprecated = 0 AND status = 'completed'
+        ORDER BY roadmap_step, end_time, seq
+    """):
+        ratio = actual / estimated if estimated and actual is not None else None
+        trends.setdefault(roadmap_step, []).append({
+            'step_id': step_id, 'end_time': end_time, 'ratio': ratio,
+            'minutes': round(seconds / 60, 2) if seconds else None,
+        })
+
+    totals = dict(conn.execute("""
+        SELECT roadmap_step, COUNT(*) FROM steps WHERE deprecated = 0 GROUP BY roadmap_step
+    """))
+    return {step: {'completed': len(points), 'total': totals.get(step, len(points)), 'points': points}
+            for step, points in trends.items()}
+
+
+def _fit_power(pairs):
+    """Least squares on log y = log a + b log x; returns (a, b, residual_std, n)"""
+    logs = [(math.log(x), math.log(y)) for x, y in pairs if x > 0 and y > 0]
+    n = len(logs)
+    if n == 0:
+        return 1.0, 1.0, None, 0
+    mean_x = sum(x for x, _ in logs) / n
+    mean_y = sum(y for _, y in logs) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in logs)
+    if n < MIN_SLOPE_SAMPLES or sxx == 0:
+        # Too little history for a stable slope: keep it proportional and fit the scale only
+        b = 1.0
+    else:
+        b = sum((x - mean_x) * (y - mean_y) for x, y in logs) / sxx
+    log_a = mean_y - b * mean_x
+    residuals = [y - (log_a + b * x) for x, y in logs]
+    std = math.sqrt(sum(r * r for r in residuals) / (n - 2)) if n > 2 else None
+    return math.exp(log_a), b, std, n
+
+
+def fit_estimator(conn, path=ESTIMATOR_FILE):
+    """Fit the line and duration models on measured steps and save their coefficients"""
+    lines = list(conn.execute(f"SELECT estimated_lines, actual_lines FROM steps WHERE {MEASURED}"))
+    minutes = list(conn.execute("""
+        SELECT actual_lines, duration_seconds / 60.0 FROM steps
+        WHERE deprecated = 0 AND status = 'completed' AND actual_lines > 0 AND duration_seconds > 0
+    """))
+    model = {}
+    for name, pairs in (('lines', lines), ('minutes', minutes)):
+        a, b, std, n = _fit_power(pairs)
+        model[name] = {'scale': a, 'exponent': b, 'log_residual_std': std, 'samples': n}
+    atomic_write_json(path, model)
+    return Estimator(model)
+
+
+class Estimator:
+    """Calibrated estimates from fitted power laws: actual = scale * estimated ** exponent"""
+
+    def __init__(self, model=None):
+        model = model or {}
+        lines = model.get('lines', {})
+        minutes = model.get('minutes', {})
+        self.line_scale = lines.get('scale', 1.0)
+        self.line_exponent = lines.get('exponent', 1.0)
+        self.minute_scale = minutes.get('scale', 0.0)
+        self.minute_exponent = minutes.get('exponent', 1.0)
+
+    @classmethod
+    def load(cls, path=ESTIMATOR_FILE):
+        """Load saved coefficients; without a fit, lines pass through unchanged"""
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls()
+
+    def predict_lines(self, estimated_lines):
+        """Calibrated line count for a raw estimate"""
+        if estimated_lines <= 0:
+            return 0.0
+        return self.line_scale * estimated_lines ** self.line_exponent
+
+    def predict_minutes(self, estimated_lines):
+        """Expected minutes for a step with this raw line estimate (0 if no duration model)"""
+        lines = self.predict_lines(estimated_lines)
+        return self.minute_scale * lines ** self.minute_exponent if lines > 0 else 0.0
+
+
+def print_report(conn):
+    errors = error_distribution(conn)
+    print("📈 Estimate Accuracy:")
+    if errors['steps'] == 0:
+        print("  No completed steps with both estimated and actual lines yet")
+    else:
+        print(f"  Measured Steps: {errors['steps']} ({errors['underestimated']} underestimated)")
+        print(f"  Actual / Estimated: median {errors['median_ratio']:.2f}x, "
+              f"p10 {errors['p10_ratio']:.2f}x, p90 {errors['p90_ratio']:.2f}x, "
+              f"geometric mean {errors['geometric_mean_ratio']:.2f}x")
+        print(f"  Mean Absolute Error: {errors['mean_abs_pct_error']:.0f}%")
+
+    print("\n⚡ Lines per Minute:")
+    for key, stats in lines_per_minute(conn, by_roadmap_step=True).items():
+        print(f"  {key}: {stats['lines_per_minute']} ({stats['lines']} lines / {stats['minutes']} min, "
+              f"{stats['steps']} steps)")
+
+    print("\n🐢 Slowest Steps:")
+    for step in slowest_steps(conn, 5):
+        print(f"  {step['step_id']}: {step['duration_seconds'] / 60:.1f} min - {step['title']}")
+
+    print("\n📅 Roadmap Step Trends:")
+    for roadmap_step, trend in roadmap_trends(conn).items():
+        ratios = [point['ratio'] for point in trend['points'] if point['ratio'] is not None]
+        series = ' '.join(f"{ratio:.2f}" for ratio in ratios) or 'N/A'
+        print(f"  {roadmap_step}: {trend['completed']}/{trend['total']} completed; ratio by completion: {series}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate-accuracy analytics over step history")
+    parser.add_argument('command', nargs='?', default='report', choices=['report', 'ingest', 'fit', 'predict'])
+    parser.add_argument('estimated_lines', nargs='?', type=float, help="Raw estimate for 'predict'")
+    parser.add_argument('--tasks-dir', default=str(DEFAULT_TASKS_DIR), help="Root directory to scan")
+    parser.add_argument('--db', default=str(DEFAULT_DB), help="SQLite store path")
+    args = parser.parse_args()
+
+    if args.command == 'predict':
+        if args.estimated_lines is None:
+            print("Error: 'predict' needs an estimated line count")
+            sys.exit(1)
+        estimator = Estimator.load()
+        print(f"📐 {args.estimated_lines:g} estimated -> ~{estimator.predict_lines(args.estimated_lines):.0f} lines, "
+              f"~{estimator.predict_minutes(args.estimated_lines):.1f} minutes")
+        return
+
+    if not Path(args.tasks_dir).is_dir():
+        print(f"Error: Tasks directory '{args.tasks_dir}' not found")
+        sys.exit(1)
+
+    conn = connect(args.db)
+    ingested = ingest(conn, args.tasks_dir)
+    if args.command == 'ingest':
+        print(f"✅ Ingested {ingested} changed file(s)")
+    elif args.command == 'fit':
+        estimator = fit_estimator(conn)
+        print(f"✅ Fitted: actual_lines = {estimator.line_scale:.3f} * estimated ^ {estimator.line_exponent:.3f}")
+        print(f"          minutes = {estimator.minute_scale:.3f} * lines ^ {estimator.minute_exponent:.3f}")
+    else:
+        print_report(conn)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
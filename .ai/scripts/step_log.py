@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Append-only event log for breakdown step tracking.
+
+Each start/complete/lines action appends one small fsync'd JSON record to
+<breakdown>.events.jsonl instead of rewriting the breakdown JSON. Readers see
+the breakdown with the log replayed on top; compaction folds the log back into
+the breakdown with an atomic temp-file + rename under an exclusive lock. It
+runs after every complete/lines append, so finished steps always reach the
+committed JSON, and whenever the log outgrows AUTO_COMPACT_BYTES.
+"""
+
+import fcntl
+import json
+import os
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Fold the log into the breakdown once it grows past this many bytes
+AUTO_COMPACT_BYTES = 64 * 1024
+
+# Actions whose results must reach the committed breakdown JSON, so they are folded in right away
+COMPACT_ACTIONS = ('complete', 'lines')
+
+# Bump when step_index() caches different fields
+INDEX_VERSION = 2
+
+
+class BreakdownError(ValueError):
+    """A breakdown file is missing or is not valid JSON"""
+
+
+def log_path(breakdown_file):
+    """Path of the event log that sits next to a breakdown file"""
+    path = Path(breakdown_file)
+    return path.with_name(f"{path.stem}.events.jsonl")
+
+
+def lock_path(breakdown_file):
+    path = Path(breakdown_file)
+    return path.with_name(f".{path.stem}.lock")
+
+
+def index_path(breakdown_file):
+    path = Path(breakdown_file)
+    return path.with_name(f".{path.stem}.index.json")
+
+
+def snapshot_path(breakdown_file):
+    path = Path(breakdown_file)
+    return path.with_name(f".{path.stem}.snapshots.json")
+
+
+@contextmanager
+def breakdown_lock(breakdown_file, exclusive=False):
+    """Hold the breakdown's lock: shared for appends, exclusive for compaction"""
+    with open(lock_path(breakdown_file), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def atomic_write_json(file_path, data):
+    """Write JSON to a temp file in the same directory, fsync it, then rename over the target"""
+    path = Path(file_path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        # mkstemp creates 0600; keep the target's mode so the rename doesn't change it
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def load_json(file_path):
+    """Load a JSON file, raising BreakdownError if it is missing or invalid"""
+    try:
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise BreakdownError(f"Breakdown file '{file_path}' not found") from None
+    except json.JSONDecodeError as e:
+        raise BreakdownError(f"Invalid JSON in '{file_path}': {e}") from None
+
+
+def append_event(breakdown_file, step_id, action, fields):
+    """Append one event and fsync it; compacts the log after complete/lines or once it has grown large"""
+    append_events(breakdown_file, [(step_id, action, fields)])
+
+
+def append_events(breakdown_file, entries):
+    """Append (step_id, action, fields) events with a single write and fsync"""
+    if not entries:
+        return
+    now = time.time()
+    records = ''.join(json.dumps({
+        'step_id': step_id,
+        'action': action,
+        'fields': fields,
+        'ts': now,
+    }, separators=(',', ':')) + '\n' for step_id, action, fields in entries)
+
+    path = log_path(breakdown_file)
+    with breakdown_lock(breakdown_file):
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            data = records.encode('utf-8')
+            # Terminate a torn line left by a crash so the new records start on a fresh line
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b'\n':
+                data = b'\n' + data
+            os.write(fd, data)
+            os.fsync(fd)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+    if size > AUTO_COMPACT_BYTES or any(action in COMPACT_ACTIONS for _, action, _ in entries):
+        compact(breakdown_file)
+
+
+def read_events(breakdown_file):
+    """Read all logged events in order (a torn final line from a crash is ignored)"""
+    return read_events_from(breakdown_file, 0)[0]
+
+
+def read_events_from(breakdown_file, offset):
+    """Read events appended after byte offset; returns (events, new_offset)"""
+    events = []
+    try:
+        with open(log_path(breakdown_file), 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return events, offset
+
+
+def replay(data, events):
+    """Apply logged events to breakdown data in place"""
+    steps = {step['id']: step for step in data.get('expanded_sub_steps', [])}
+    for event in events:
+        step = steps.get(event['step_id'])
+        if step is not None:
+            step.update(event['fields'])
+    return data
+
+
+def load_materialized(breakdown_file):
+    """Return the breakdown with any pending log events applied (nothing is written)"""
+    with breakdown_lock(breakdown_file):
+        data = load_json(breakdown_file)
+        events = read_events(breakdown_file)
+    return replay(data, events)
+
+
+def compact(breakdown_file):
+    """Fold the event log into the breakdown JSON atomically and remove the log"""
+    with breakdown_lock(breakdown_file, exclusive=True):
+        events = read_events(breakdown_file)
+        if events:
+            data = replay(load_json(breakdown_file), events)
+            atomic_write_json(breakdown_file, data)
+        # Nothing in the log is needed any more (at most a torn line from a crash)
+        log_path(breakdown_file).unlink(missing_ok=True)
+    return len(events)
+
+
+def step_index(breakdown_file):
+    """
+    Per-step fields needed by start/complete, cached in a sidecar keyed by the
+    breakdown's mtime and size so the full JSON is only re-read after it changes
+    """
+    stat = os.stat(breakdown_file)
+    sidecar = index_path(breakdown_file)
+    try:
+        with open(sidecar, 'r') as f:
+            cached = json.load(f)
+        if (cached.get('version') == INDEX_VERSION and cached['mtime_ns'] == stat.st_mtime_ns
+                and cached['size'] == stat.st_size):
+            return cached['steps']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+
+    data = load_json(breakdown_file)
+    steps = {
+        step['id']: {
+            'title': step.get('title'),
+            'estimated_lines': step.get('estimated_lines', 0),
+            'start_time_iso': step.get('start_time_iso'),
+            'file_actions': step.get('file_actions', []),
+        }
+        for step in data.get('expanded_sub_steps', [])
+    }
+    try:
+        atomic_write_json(sidecar, {'version': INDEX_VERSION, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'steps': steps})
+    except OSError:
+        pass
+    return steps
+
+
+def last_field(breakdown_file, step_id, field):
+    """Most recent value of a field for a step, from the log first and then the breakdown"""
+    for event in reversed(read_events(breakdown_file)):
+        if event['step_id'] == step_id and field in event['fields']:
+            return event['fields'][field]
+    step = step_index(breakdown_file).get(step_id)
+    return step.get(field) if step else None
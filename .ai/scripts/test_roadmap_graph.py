@@ -0,0 +1,66 @@
+"""
+Tests for roadmap_graph.py
+Usage: python -m pytest .ai/scripts/test_roadmap_graph.py
+"""
+
+import random
+
+import pytest
+
+from roadmap_graph import CycleError, RoadmapGraph, random_dag
+
+
+def rebuilt(graph):
+    """A fresh graph over the same steps with the current durations"""
+    nodes = [(graph.ids[i], [graph.ids[p] for p in graph.parents[i]], graph.duration[i])
+             for i in range(len(graph.ids))]
+    return RoadmapGraph(nodes)
+
+
+def assert_same_schedule(graph, fresh):
+    assert graph.earliest == pytest.approx(fresh.earliest)
+    assert graph.tail == pytest.approx(fresh.tail)
+    assert graph.finish == pytest.approx(fresh.finish)
+    assert graph.critical_path() == fresh.critical_path()
+
+
+def test_incremental_updates_match_full_recompute():
+    graph = RoadmapGraph(random_dag(300, seed=3))
+    rng = random.Random(7)
+    for _ in range(100):
+        graph.update(f"S{rng.randrange(300)}", rng.uniform(5, 120))
+        assert_same_schedule(graph, rebuilt(graph))
+
+
+def test_batched_updates_match_full_recompute():
+    graph = RoadmapGraph(random_dag(300, seed=4))
+    rng = random.Random(8)
+    for _ in range(30):
+        durations = {f"S{rng.randrange(300)}": rng.choice([0.0, rng.uniform(5, 600)]) for _ in range(10)}
+        graph.update_many(durations)
+        assert_same_schedule(graph, rebuilt(graph))
+
+
+def test_unchanged_duration_recomputes_nothing():
+    graph = RoadmapGraph(random_dag(50, seed=5))
+    assert graph.update('S10', graph.duration[graph.index['S10']]) == 0
+
+
+def test_critical_path_has_zero_slack():
+    graph = RoadmapGraph(random_dag(200, seed=6))
+    path = graph.critical_path()
+    assert path
+    assert sum(graph.duration[graph.index[step]] for step in path) == pytest.approx(graph.finish)
+    for step in path:
+        assert graph.slack(step) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_cycle_is_reported():
+    with pytest.raises(CycleError) as error:
+        RoadmapGraph([('A', ['C'], 1), ('B', ['A'], 1), ('C', ['B'], 1)])
+    assert set(error.value.cycle) == {'A', 'B', 'C'}
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        RoadmapGraph([('A', ['missing'], 1)])
@@ -2,33 +2,26 @@
 """
 Time tracking script for breakdown sub-steps
 Usage: python track_step.py <breakdown_file> <step_id> <action>
-Actions: start, complete, status, summary
+Actions: start, complete, status, summary, compact
+
+start/complete append to the breakdown's event log (see step_log.py);
+compact folds the log back into the breakdown JSON, which complete does
+automatically so finished steps reach the committed file. start also snapshots
+the step's "modify:" files so complete can record real added/removed lines
+(see file_snapshot.py).
 """
 
-import json
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
 
-
-def load_breakdown(file_path):
-    """Load breakdown JSON file"""
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Error: Breakdown file '{file_path}' not found")
-        sys.exit(1)
-    except json.JSONDecodeError:
-        print(f"Error: Invalid JSON in '{file_path}'")
-        sys.exit(1)
+from file_snapshot import diff_snapshot, discard_snapshot, modified_files, take_snapshot
+from step_log import BreakdownError, append_event, compact, last_field, load_materialized, step_index
 
 
-def save_breakdown(file_path, data):
-    """Save breakdown JSON file with proper formatting"""
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+def load_breakdown(file_path):
+    """Load breakdown JSON file with pending step events applied"""
+    return load_materialized(file_path)
 
 
 def find_step(data, step_id):
@@ -41,72 +34,114 @@ def find_step(data, step_id):
 
 def start_step(file_path, step_id):
     """Start timing a step"""
-    data = load_breakdown(file_path)
-    step_index, step = find_step(data, step_id)
-
+    step = step_index(file_path).get(step_id)
     if step is None:
         print(f"Error: Step '{step_id}' not found in breakdown file")
         sys.exit(1)
 
+    # Snapshot files the step will modify so complete can diff them
+    if modified_files(step['file_actions']):
+        take_snapshot(file_path, step_id, step['file_actions'])
+
     readable_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Update step with start time
-    data['expanded_sub_steps'][step_index].update({
+    # Record step start time
+    append_event(file_path, step_id, 'start', {
         'start_time_iso': readable_time,
         'status': 'in_progress'
     })
 
-    save_breakdown(file_path, data)
     print(f"✅ Timer started for {step_id} at {readable_time}")
 
 
 def complete_step(file_path, step_id):
     """Complete a step and calculate duration"""
-    data = load_breakdown(file_path)
-    step_index, step = find_step(data, step_id)
+    step = step_index(file_path).get(step_id)
 
     if step is None:
         print(f"Error: Step '{step_id}' not found in breakdown file")
         sys.exit(1)
 
-    if 'start_time_iso' not in step:
+    start_time_iso = last_field(file_path, step_id, 'start_time_iso')
+    if not start_time_iso:
         print(f"Warning: No start time found for {step_id}. Please run 'start' first.")
         sys.exit(1)
 
+    fields, duration = completion_fields(start_time_iso)
+    fields.update(modification_fields(file_path, step_id))
+
+    # Record completion data
+    append_event(file_path, step_id, 'complete', fields)
+    discard_snapshot(file_path, step_id)
+
+    print_completion(step_id, duration, step.get('estimated_lines'))
+    print_modifications(fields)
+
+
+def completion_fields(start_time_iso, end_time=None):
+    """Completion fields for a step started at start_time_iso, plus the duration in seconds"""
     # Calculate duration using stored start time
-    start_time = datetime.fromisoformat(step['start_time_iso'].replace(' ', 'T'))
-    end_time = datetime.now()
+    start_time = datetime.fromisoformat(start_time_iso.replace(' ', 'T'))
+    end_time = end_time or datetime.now()
     duration = (end_time - start_time).total_seconds()
     readable_end_time = end_time.strftime("%Y-%m-%d %H:%M:%S")
     duration_minutes = duration / 60
 
-    # Update step with completion data
-    data['expanded_sub_steps'][step_index].update({
+    return {
         'end_time_iso': readable_end_time,
         'actual_duration_seconds': int(duration),
         'actual_duration_minutes': round(duration_minutes, 2),
         'status': 'completed'
-    })
+    }, duration
+
+
+def modification_fields(file_path, step_id):
+    """Added/removed code lines per modified file since start, if a snapshot was taken"""
+    diff = diff_snapshot(file_path, step_id)
+    if diff is None:
+        return {}
+    return {'modified_lines': {
+        rel: {'added': counts[0], 'removed': counts[1]} for rel, counts in diff.items()
+    }}
+
 
-    save_breakdown(file_path, data)
+def print_modifications(fields):
+    """Print the modified-file line counts recorded at completion"""
+    for rel, counts in fields.get('modified_lines', {}).items():
+        print(f"📝 {rel}: +{counts['added']} -{counts['removed']} lines")
 
+
+def print_completion(step_id, duration, estimated):
+    """Print the completion message for a step"""
+    duration_minutes = duration / 60
     print(f"✅ Step {step_id} completed in {duration_minutes:.1f} minutes ({duration} seconds)")
 
     # Show comparison with estimate
-    estimated = step.get('estimated_lines', 0)
+    estimated = estimated or 0
     if estimated > 0:
         print(f"📊 Estimated: ~{estimated} lines of code")
 
 
+def compact_log(file_path):
+    """Fold pending step events into the breakdown JSON"""
+    count = compact(file_path)
+    print(f"✅ Folded {count} event(s) into {file_path}")
+
+
 def show_status(file_path, step_id):
     """Show status of a specific step"""
     data = load_breakdown(file_path)
-    step_index, step = find_step(data, step_id)
+    _, step = find_step(data, step_id)
 
     if step is None:
         print(f"❌ Step {step_id} not found in breakdown file")
         sys.exit(1)
 
+    print_status(step_id, step)
+
+
+def print_status(step_id, step):
+    """Print the tracked fields of one step"""
     print(f"📋 Step Status for {step_id}:")
     print(f"  Title: {step.get('title', 'N/A')}")
     print(f"  Status: {step.get('status', 'pending')}")
@@ -119,8 +154,11 @@ def show_status(file_path, step_id):
 def show_summary(file_path):
     """Show summary of all steps"""
     data = load_breakdown(file_path)
-    steps = data['expanded_sub_steps']
+    print_summary(data['expanded_sub_steps'])
+
 
+def print_summary(steps):
+    """Print status counts and time totals for a list of steps"""
     total_steps = len(steps)
     completed_steps = sum(1 for step in steps if step.get('status') == 'completed')
     in_progress_steps = sum(1 for step in steps if step.get('status') == 'in_progress')
@@ -146,7 +184,7 @@ def show_summary(file_path):
 def main():
     if len(sys.argv) < 3:
         print("Usage: python track_step.py <breakdown_file> <step_id> <action>")
-        print("Actions: start, complete, status, summary")
+        print("Actions: start, complete, status, summary, compact")
         print("Example: python track_step.py SETUP_breakdown.json SETUP_001 start")
         print("For summary: python track_step.py SETUP_breakdown.json \"\" summary")
         sys.exit(1)
@@ -163,26 +201,32 @@ def main():
         print(f"Error: Breakdown file '{breakdown_file}' not found")
         sys.exit(1)
 
-    if action == "start":
-        if not step_id:
-            print("Error: Step ID is required for 'start' action")
-            sys.exit(1)
-        start_step(breakdown_file, step_id)
-    elif action == "complete":
-        if not step_id:
-            print("Error: Step ID is required for 'complete' action")
-            sys.exit(1)
-        complete_step(breakdown_file, step_id)
-    elif action == "status":
-        if not step_id:
-            print("Error: Step ID is required for 'status' action")
+    try:
+        if action == "start":
+            if not step_id:
+                print("Error: Step ID is required for 'start' action")
+                sys.exit(1)
+            start_step(breakdown_file, step_id)
+        elif action == "complete":
+            if not step_id:
+                print("Error: Step ID is required for 'complete' action")
+                sys.exit(1)
+            complete_step(breakdown_file, step_id)
+        elif action == "status":
+            if not step_id:
+                print("Error: Step ID is required for 'status' action")
+                sys.exit(1)
+            show_status(breakdown_file, step_id)
+        elif action == "summary":
+            show_summary(breakdown_file)
+        elif action == "compact":
+            compact_log(breakdown_file)
+        else:
+            print(f"Error: Invalid action '{action}'")
+            print("Valid actions: start, complete, status, summary, compact")
             sys.exit(1)
-        show_status(breakdown_file, step_id)
-    elif action == "summary":
-        show_summary(breakdown_file)
-    else:
-        print(f"Error: Invalid action '{action}'")
-        print("Valid actions: start, complete, status, summary")
+    except BreakdownError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
 
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Long-lived step tracker reachable over a local Unix socket.
+Usage:
+  python tracker_daemon.py serve [--socket PATH] [--flush-interval SECONDS]
+  python tracker_daemon.py send "complete SETUP_004; start SETUP_005; lines SETUP_004"
+  python tracker_daemon.py stop
+
+Breakdowns stay in memory with an id -> step index. Every action is still
+appended to the breakdown's event log (step_log.py), so the daemon and the
+plain scripts can be mixed; the log is folded into the breakdown JSON on a
+schedule and on shutdown.
+
+Protocol: one request per connection, one line. A line starting with '{' is a
+JSON-RPC 2.0 request (methods: run, flush, ping, shutdown); anything else is a
+batch of commands answered with plain text ending in a '# ok' or '# failed'
+status line. Commands are separated by ';' or newlines:
+start|complete|status|lines <step_id>, summary, compact, flush,
+use <breakdown_file>.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import calculate_actual_lines
+from file_snapshot import discard_snapshot, modified_files, take_snapshot
+from step_log import BreakdownError, append_event, compact, load_json, log_path, read_events_from, replay
+from track_step import (
+    completion_fields, modification_fields, print_completion, print_modifications, print_status, print_summary,
+)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+DEFAULT_BREAKDOWN = ".ai/tasks/Narrator-Console/roadmap/SETUP_breakdown.json"
+DEFAULT_SOCKET = PROJECT_ROOT / ".ai" / ".tracker.sock"
+FLUSH_INTERVAL = 30.0
+
+# Last line of every plain-text reply
+STATUS_OK = "# ok"
+STATUS_FAILED = "# failed"
+
+
+class CommandError(Exception):
+    """A command failed; the message is reported to the client"""
+
+
+class ThreadStdout:
+    """sys.stdout stand-in that sends a thread's output to its own buffer while it runs a batch"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def target(self):
+        return getattr(self.local, 'buffer', None) or self.stream
+
+    def write(self, text):
+        return self.target().write(text)
+
+    def flush(self):
+        self.target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    @contextlib.contextmanager
+    def capture(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+
+
+class TrackedBreakdown:
+    """In-memory breakdown kept in sync with its JSON file and event log"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.reload()
+
+    def reload(self):
+        """Re-read the breakdown JSON and replay its whole event log"""
+        stat = os.stat(self.path)
+        self.stat_key = (stat.st_mtime_ns, stat.st_size)
+        self.data = load_json(self.path)
+        events, self.log_offset = read_events_from(self.path, 0)
+        replay(self.data, events)
+        self.steps = {step['id']: step for step in self.data.get('expanded_sub_steps', [])}
+
+    def refresh(self):
+        """Pick up changes made by other processes: new log events, or a rewritten breakdown"""
+        stat = os.stat(self.path)
+        try:
+            log_size = os.path.getsize(log_path(self.path))
+        except FileNotFoundError:
+            log_size = 0
+        if (stat.st_mtime_ns, stat.st_size) != self.stat_key or log_size < self.log_offset:
+            self.reload()
+            return
+        events, self.log_offset = read_events_from(self.path, self.log_offset)
+        for event in events:
+            step = self.steps.get(event['step_id'])
+            if step is not None:
+                step.update(event['fields'])
+
+    def step(self, step_id):
+        step = self.steps.get(step_id)
+        if step is None:
+            raise CommandError(f"Error: Step '{step_id}' not found in breakdown file")
+        return step
+
+    def record(self, step_id, action, fields):
+        append_event(self.path, step_id, action, fields)
+        self.refresh()
+
+    def flush(self):
+        """Fold pending events into the breakdown JSON"""
+        count = compact(self.path)
+        self.refresh()
+        return count
+
+
+class Tracker:
+    """Holds every breakdown the daemon has touched and runs command batches"""
+
+    def __init__(self):
+        self.breakdowns = {}
+        self.lock = threading.Lock()
+        # Commands print through the track_step helpers; only the running thread's prints are captured
+        if not isinstance(sys.stdout, ThreadStdout):
+            sys.stdout = ThreadStdout(sys.stdout)
+        self.stdout = sys.stdout
+
+    def breakdown(self, path):
+        path = str(Path(path) if os.path.isabs(path) else PROJECT_ROOT / path)
+        tracked = self.breakdowns.get(path)
+        if tracked is None:
+            if not os.path.exists(path):
+                raise CommandError(f"Error: Breakdown file '{path}' not found")
+            tracked = self.breakdowns[path] = TrackedBreakdown(path)
+        else:
+            tracked.refresh()
+        return tracked
+
+    def run(self, commands, breakdown_file=DEFAULT_BREAKDOWN):
+        """Run a ';'/newline separated batch; returns (ok, output)"""
+        ok = True
+        with self.lock, self.stdout.capture() as output:
+            for command in commands.replace('\n', ';').split(';'):
+                parts = command.split()
+                if not parts:
+                    continue
+                try:
+                    if parts[0] == 'use':
+                        breakdown_file = parts[1]
+                        self.breakdown(breakdown_file)
+                    else:
+                        self.execute(self.breakdown(breakdown_file), parts[0], parts[1:])
+                except CommandError as e:
+                    print(e)
+                    ok = False
+                except BreakdownError as e:
+                    print(f"Error: {e}")
+                    ok = False
+                except IndexError:
+                    print(f"Error: Invalid command '{command.strip()}'")
+                    ok = False
+                except SystemExit as e:
+                    # The script helper printed its own error before exiting
+                    print(f"Error: '{command.strip()}' failed (exit status {e.code})")
+                    ok = False
+        return ok, output.getvalue()
+
+    def execute(self, tracked, action, args):
+        if action == 'start':
+            step_id = args[0]
+            step = tracked.step(step_id)
+            if modified_files(step.get('file_actions', [])):
+                take_snapshot(tracked.path, step_id, step['file_actions'])
+            readable_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            tracked.record(step_id, 'start', {'start_time_iso': readable_time, 'status': 'in_progress'})
+            print(f"✅ Timer started for {step_id} at {readable_time}")
+        elif action == 'complete':
+            step_id = args[0]
+            step = tracked.step(step_id)
+            if not step.get('start_time_iso'):
+                raise CommandError(f"Warning: No start time found for {step_id}. Please run 'start' first.")
+            fields, duration = completion_fields(step['start_time_iso'])
+            fields.update(modification_fields(tracked.path, step_id))
+            tracked.record(step_id, 'complete', fields)
+            discard_snapshot(tracked.path, step_id)
+            print_completion(step_id, duration, step.get('estimated_lines'))
+            print_modifications(fields)
+        elif action == 'status':
+            print_status(args[0], tracked.step(args[0]))
+        elif action == 'summary':
+            print_summary(tracked.data['expanded_sub_steps'])
+        elif action == 'lines':
+            tracked.step(args[0])
+            if not calculate_actual_lines.calculate_actual_lines(tracked.path, args[0]):
+                raise CommandError(f"Error: Could not calculate lines for {args[0]}")
+            tracked.refresh()
+        elif action in ('compact', 'flush'):
+            print(f"✅ Folded {tracked.flush()} event(s) into {tracked.path}")
+        else:
+            raise CommandError(f"Error: Invalid action '{action}'")
+
+    def flush_all(self):
+        with self.lock:
+            for tracked in self.breakdowns.values():
+                tracked.flush()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline().decode('utf-8').strip()
+        tracker = self.server.tracker
+
+        if not line.startswith('{'):
+            ok, output = tracker.run(line)
+            if output and not output.endswith('\n'):
+                output += '\n'
+            self.wfile.write(f"{output}{STATUS_OK if ok else STATUS_FAILED}\n".encode('utf-8'))
+            return
+
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            self._reply(None, error={'code': -32700, 'message': 'Parse error'})
+            return
+        method = request.get('method')
+        params = request.get('params') or {}
+        if method == 'run':
+            ok, output = tracker.run(params.get('commands', ''), params.get('breakdown', DEFAULT_BREAKDOWN))
+            self._reply(request.get('id'), result={'ok': ok, 'output': output})
+        elif method == 'flush':
+            tracker.flush_all()
+            self._reply(request.get('id'), result={'ok': True})
+        elif method == 'ping':
+            self._reply(request.get('id'), result={'ok': True, 'breakdowns': sorted(tracker.breakdowns)})
+        elif method == 'shutdown':
+            self._reply(request.get('id'), result={'ok': True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self._reply(request.get('id'), error={'code': -32601, 'message': f"Unknown method '{method}'"})
+
+    def _reply(self, request_id, result=None, error=None):
+        response = {'jsonrpc': '2.0', 'id': request_id}
+        if error is not None:
+            response['error'] = error
+        else:
+            response['result'] = result
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+
+class TrackerServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, tracker):
+        self.tracker = tracker
+        super().__init__(str(socket_path), RequestHandler)
+
+
+def serve(socket_path, flush_interval):
+    """Run the daemon until a shutdown request or interrupt"""
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        if _connect(socket_path) is not None:
+            print(f"Tracker already running on {socket_path}")
+            sys.exit(1)
+        socket_path.unlink()
+
+    tracker = Tracker()
+    server = TrackerServer(socket_path, tracker)
+    stop = threading.Event()
+
+    def flush_loop():
+        while not stop.wait(flush_interval):
+            try:
+                tracker.flush_all()
+            except Exception as e:
+                # Keep flushing on the next tick; the events stay in the log until then
+                print(f"Error: Scheduled flush failed: {e}", file=sys.stderr)
+
+    threading.Thread(target=flush_loop, daemon=True).start()
+    print(f"Tracker listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        tracker.flush_all()
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+def _connect(socket_path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def send(socket_path, line):
+    """Send one request line and return the full response, or None if no daemon is running"""
+    client = _connect(socket_path)
+    if client is None:
+        return None
+    with client:
+        client.sendall(line.encode('utf-8') + b'\n')
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b''.join(chunks).decode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent step tracker daemon and client")
+    parser.add_argument('command', choices=['serve', 'send', 'stop'], help="Run the daemon, send a batch, or stop it")
+    parser.add_argument('batch', nargs='?', default='', help="Commands for 'send', e.g. \"complete SETUP_004; start SETUP_005\"")
+    parser.add_argument('--socket', default=str(DEFAULT_SOCKET), help="Unix socket path")
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL, help="Seconds between flushes to disk")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        os.chdir(PROJECT_ROOT)
+        serve(args.socket, args.flush_interval)
+        return
+
+    line = args.batch if args.command == 'send' else json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'shutdown'})
+    response = send(args.socket, line)
+    if response is None:
+        print(f"Error: No tracker running on {args.socket}")
+        sys.exit(2)
+    if args.command == 'send':
+        output, _, status = response.rstrip('\n').rpartition('\n')
+        if status not in (STATUS_OK, STATUS_FAILED):
+            output, status = response.rstrip('\n'), STATUS_FAILED
+        if output:
+            print(output)
+        if status != STATUS_OK:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Summarize every breakdown under .ai/tasks
+Usage: python tree_summary.py [--tasks-dir DIR] [--include-deprecated] [--workers N] [--json] [--no-cache]
+
+Breakdown and roadmap JSON files are found recursively and reduced to small
+per-file aggregates (step counts by status, minutes, estimated vs actual
+lines), with pending event-log entries applied. Aggregates are cached in
+<tasks-dir>/.summary_cache.json keyed by file mtime and size, so repeat runs
+only re-read files that changed. Changed files are loaded in a process pool.
+Results roll up per task and per roadmap step.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from step_log import atomic_write_json, log_path, read_events, replay
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_TASKS_DIR = SCRIPT_DIR.parent / 'tasks'
+CACHE_NAME = '.summary_cache.json'
+CACHE_VERSION = 1
+
+# Below this many changed files a pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+STATUSES = ('completed', 'in_progress', 'pending')
+
+
+def discover_files(tasks_dir):
+    """All JSON files under the tasks directory, excluding event logs and hidden sidecars"""
+    files = []
+    for root, dirs, names in os.walk(tasks_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in names:
+            if name.endswith('.json') and not name.startswith('.'):
+                files.append(os.path.join(root, name))
+    files.sort()
+    return files
+
+
+def file_key(path):
+    """Cache key for a file: its own mtime/size plus its event log's, if any"""
+    stat = os.stat(path)
+    try:
+        log_stat = os.stat(log_path(path))
+        log_key = [log_stat.st_mtime_ns, log_stat.st_size]
+    except FileNotFoundError:
+        log_key = None
+    return [stat.st_mtime_ns, stat.st_size, log_key]
+
+
+def aggregate_file(path):
+    """Reduce one breakdown or roadmap file to its aggregate (None for other JSON files)"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return {'kind': 'error', 'error': str(e)}
+
+    if not isinstance(data, dict):
+        return None
+
+    if 'expanded_sub_steps' in data:
+        replay(data, read_events(path))
+        steps = data['expanded_sub_steps']
+        counts = dict.fromkeys(STATUSES, 0)
+        for step in steps:
+            status = step.get('status', 'pending')
+            counts[status] = counts.get(status, 0) + 1
+        minutes = [step['actual_duration_minutes'] for step in steps if step.get('actual_duration_minutes')]
+        measured = [step for step in steps if 'actual_lines' in step]
+        return {
+            'kind': 'breakdown',
+            'step_id': data.get('step_id'),
+            'steps': len(steps),
+            'status': counts,
+            'total_minutes': round(sum(minutes), 2),
+            'timed_steps': len(minutes),
+            'estimated_lines': sum(step.get('estimated_lines', 0) for step in steps),
+            'measured_steps': len(measured),
+            'measured_estimated_lines': sum(step.get('estimated_lines', 0) for step in measured),
+            'actual_lines': sum(step['actual_lines'] for step in measured),
+        }
+
+    if 'steps' in data and 'task_id' in data:
+        return {
+            'kind': 'roadmap',
+            'task_id': data['task_id'],
+            'version': data.get('version'),
+            'estimated_minutes': {
+                step['step_id']: step.get('estimated_time_min', 0)
+                for step in data['steps'] if 'step_id' in step
+            },
+        }
+
+    return None
+
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION:
+            return cache['files']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+    return {}
+
+
+def collect_aggregates(tasks_dir=DEFAULT_TASKS_DIR, workers=None, use_cache=True):
+    """
+    Aggregate every JSON file under tasks_dir, reusing cached aggregates for unchanged files
+    Returns ({relative_path: aggregate}, number_of_files_reloaded)
+    """
+    tasks_dir = Path(tasks_dir)
+    cache_path = tasks_dir / CACHE_NAME
+    cached = load_cache(cache_path) if use_cache else {}
+
+    entries = {}
+    stale = []
+    for path in discover_files(tasks_dir):
+        rel = os.path.relpath(path, tasks_dir)
+        key = file_key(path)
+        hit = cached.get(rel)
+        if hit is not None and hit['key'] == key:
+            entries[rel] = hit
+        else:
+            stale.append((rel, path, key))
+
+    paths = [path for _, path, _ in stale]
+    if len(paths) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(aggregate_file, paths, chunksize=max(1, len(paths) // 32)))
+    else:
+        results = [aggregate_file(path) for path in paths]
+
+    for (rel, _, key), aggregate in zip(stale, results):
+        entries[rel] = {'key': key, 'aggregate': aggregate}
+
+    if use_cache and (stale or len(entries) != len(cached)):
+        try:
+            atomic_write_json(cache_path, {'version': CACHE_VERSION, 'files': entries})
+        except OSError:
+            pass
+
+    return {rel: entry['aggregate'] for rel, entry in entries.items()}, len(stale)
+
+
+def _empty_rollup():
+    return {
+        'breakdowns': 0,
+        'steps': 0,
+        'status': dict.fromkeys(STATUSES, 0),
+        'total_minutes': 0.0,
+        'timed_steps': 0,
+        'estimated_lines': 0,
+        'measured_steps': 0,
+        'measured_estimated_lines': 0,
+        'actual_lines': 0,
+    }
+
+
+def _add(rollup, aggregate):
+    rollup['breakdowns'] += 1
+    for field in ('steps', 'total_minutes', 'timed_steps', 'estimated_lines',
+                  'measured_steps', 'measured_estimated_lines', 'actual_lines'):
+        rollup[field] += aggregate[field]
+    for status, count in aggregate['status'].items():
+        rollup['status'][status] = rollup['status'].get(status, 0) + count
+
+
+def _finish(rollup):
+    rollup['total_minutes'] = round(rollup['total_minutes'], 2)
+    rollup['average_minutes'] = (
+        round(rollup['total_minutes'] / rollup['timed_steps'], 2) if rollup['timed_steps'] else None
+    )
+    rollup['line_accuracy'] = (
+        round(rollup['actual_lines'] / rollup['measured_estimated_lines'], 3)
+        if rollup['measured_estimated_lines'] else None
+    )
+    return rollup
+
+
+def roll_up(aggregates, include_deprecated=False):
+    """
+    Combine per-file aggregates per task (first path component) and per roadmap step
+    Returns {'total': ..., 'tasks': {task: ...}, 'steps': {task: {step_id: ...}}, 'errors': [...]}
+    """
+    total = _empty_rollup()
+    tasks = {}
+    steps = {}
+    roadmaps = {}
+    errors = []
+
+    for rel, aggregate in sorted(aggregates.items()):
+        if aggregate is None:
+            continue
+        parts = Path(rel).parts
+        if 'deprecated' in parts[:-1] and not include_deprecated:
+            continue
+        task = parts[0] if len(parts) > 1 else ''
+        if aggregate['kind'] == 'error':
+            errors.append((rel, aggregate['error']))
+        elif aggregate['kind'] == 'roadmap':
+            if 'deprecated' not in parts[:-1]:
+                roadmaps[task] = aggregate
+        else:
+            _add(total, aggregate)
+            _add(tasks.setdefault(task, _empty_rollup()), aggregate)
+            step_id = aggregate['step_id'] or Path(rel).stem
+            _add(steps.setdefault(task, {}).setdefault(step_id, _empty_rollup()), aggregate)
+
+    for task, task_steps in steps.items():
+        estimates = roadmaps.get(task, {}).get('estimated_minutes', {})
+        for step_id, rollup in task_steps.items():
+            rollup['roadmap_estimated_minutes'] = estimates.get(step_id)
+            _finish(rollup)
+    for rollup in tasks.values():
+        _finish(rollup)
+
+    return {'total': _finish(total), 'tasks': tasks, 'steps': steps, 'errors': errors}
+
+
+def tree_summary(tasks_dir=DEFAULT_TASKS_DIR, include_deprecated=False, workers=None, use_cache=True):
+    """Discover, aggregate (cached, in parallel) and roll up every breakdown under tasks_dir"""
+    aggregates, reloaded = collect_aggregates(tasks_dir, workers, use_cache)
+    summary = roll_up(aggregates, include_deprecated)
+    summary['files'] = len(aggregates)
+    summary['reloaded'] = reloaded
+    return summary
+
+
+def _line(label, rollup):
+    status = rollup['status']
+    average = f"{rollup['average_minutes']:.1f}" if rollup['average_minutes'] is not None else 'N/A'
+    lines = f"{rollup['actual_lines']}/{rollup['measured_estimated_lines']}" if rollup['measured_steps'] else 'N/A'
+    return (f"{label:<28} {rollup['steps']:>5} {status.get('completed', 0):>5} {status.get('in_progress', 0):>5} "
+            f"{status.get('pending', 0):>5} {rollup['total_minutes']:>8.1f} {average:>6} {lines:>11}")
+
+
+def print_tree_summary(summary):
+    """Print the per-task and per-step roll-up"""
+    print(f"📊 Tree Summary ({summary['files']} files, {summary['reloaded']} reloaded):")
+    print(f"  {'':<28} {'Steps':>5} {'Done':>5} {'Prog':>5} {'Pend':>5} {'Minutes':>8} {'Avg':>6} {'Act/Est LOC':>11}")
+    for task, rollup in sorted(summary['tasks'].items()):
+        print(f"  {_line(task or '(root)', rollup)}")
+        for step_id, step in sorted(summary['steps'][task].items()):
+            print(f"    {_line(step_id, step)}")
+            if step['roadmap_estimated_minutes'] is not None:
+                print(f"      Roadmap estimate: {step['roadmap_estimated_minutes']} minutes")
+    print(f"  {_line('TOTAL', summary['total'])}")
+    for rel, error in summary['errors']:
+        print(f"  ⚠️  {rel}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize all breakdowns under .ai/tasks")
+    parser.add_argument('--tasks-dir', default=str(DEFAULT_TASKS_DIR), help="Root directory to scan")
+    parser.add_argument('--include-deprecated', action='store_true', help="Count breakdowns under deprecated/")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for changed files")
+    parser.add_argument('--json', action='store_true', help="Print the roll-up as JSON")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore and don't update the aggregate cache")
+    args = parser.parse_args()
+
+    if not Path(args.tasks_dir).is_dir():
+        print(f"Error: Tasks directory '{args.tasks_dir}' not found")
+        sys.exit(1)
+
+    summary = tree_summary(args.tasks_dir, args.include_deprecated, args.workers, not args.no_cache)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_tree_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import heapq
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+APPORTION_METHODS = ('largest_remainder', 'dhondt')
+
+# Common slot counts: parts of the day split, 15-minute blocks per day and per week
+TWENTIETHS = 20
+QUARTER_HOURS_PER_DAY = 96
+QUARTER_HOURS_PER_WEEK = 672
+
+
+def _bounds(value: Optional[Union[int, Sequence[int]]], count: int, default: int) -> np.ndarray:
+    if value is None:
+        return np.full(count, default, dtype=np.int64)
+    return np.broadcast_to(np.asarray(value, dtype=np.int64), (count,)).copy()
+
+
+def _bounded_quotas(weights: np.ndarray, slots: int, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """
+    Proportional quotas summing to `slots`, with tasks pinned at their bounds.
+
+    Tasks whose quota falls outside [low, high] are fixed at the violated bound
+    and the remaining slots are re-shared among the others until none violate.
+    """
+    quotas = np.zeros(len(weights), dtype=np.float64)
+    free = np.ones(len(weights), dtype=bool)
+    while True:
+        remaining = slots - quotas[~free].sum()
+        free_total = weights[free].sum()
+        if free_total > 0:
+            quotas[free] = weights[free] * (remaining / free_total)
+        else:
+            quotas[free] = remaining / max(free.sum(), 1)
+
+        below = free & (quotas < low)
+        above = free & (quotas > high)
+        if not below.any() and not above.any():
+            return quotas
+        # Pin the side with the larger total violation first; pinning one side can
+        # only push the other side further from its bound
+        if (low[below] - quotas[below]).sum() >= (quotas[above] - high[above]).sum():
+            quotas[below] = low[below]
+            free &= ~below
+        else:
+            quotas[above] = high[above]
+            free &= ~above
+
+
+def apportion(scores: Sequence[float], slots: int, method: str = 'largest_remainder',
+              minimum: Optional[Union[int, Sequence[int]]] = None,
+              maximum: Optional[Union[int, Sequence[int]]] = None) -> np.ndarray:
+    """
+    Split `slots` whole units among tasks in proportion to their scores.
+
+    The allocation always sums exactly to `slots`. 'largest_remainder' (Hamilton)
+    floors each proportional quota and hands the leftover slots to the largest
+    fractional parts. 'dhondt' (highest averages) gives each next slot to the
+    task with the largest score / (allocated + 1). Ties go to the earlier task.
+    Both run in O(n log n).
+
+    Args:
+        scores (Sequence[float]): Task scores (negative scores count as 0)
+        slots (int): Number of slots to allocate (e.g. 20, 96 or 672)
+        method (str): 'largest_remainder' or 'dhondt'
+        minimum (Optional[Union[int, Sequence[int]]]): Minimum slots per task (scalar or per task)
+        maximum (Optional[Union[int, Sequence[int]]]): Maximum slots per task (scalar or per task)
+
+    Returns:
+        np.ndarray: int64 slot count per task, in input order
+
+    Raises:
+        ValueError: If the method is unknown or the bounds cannot be met
+    """
+    weights = np.clip(np.asarray(scores, dtype=np.float64), 0.0, None)
+    count = len(weights)
+    low = _bounds(minimum, count, 0)
+    high = _bounds(maximum, count, slots)
+
+    if method not in APPORTION_METHODS:
+        raise ValueError(f"Unknown apportionment method '{method}' (expected one of {APPORTION_METHODS})")
+    if count == 0:
+        if slots:
+            raise ValueError("Cannot apportion slots among zero tasks")
+        return np.zeros(0, dtype=np.int64)
+    if np.any(low > high) or low.sum() > slots or high.sum() < slots:
+        raise ValueError(f"Bounds cannot be met: minimum total {low.sum()}, maximum total {high.sum()}, slots {slots}")
+
+    if method == 'largest_remainder':
+        quotas = _bounded_quotas(weights, slots, low, high)
+        allocation = np.clip(np.floor(quotas).astype(np.int64), low, high)
+        leftover = slots - int(allocation.sum())
+        if leftover > 0:
+            remainders = np.where(allocation < high, quotas - allocation, -np.inf)
+            winners = np.argsort(-remainders, kind='stable')[:leftover]
+            allocation[winners] += 1
+        return allocation
+
+    # D'Hondt: divisor total/slots gives a feasible start that never overshoots,
+    # leaving fewer than `count` slots for the heap to hand out
+    total = weights.sum()
+    if total > 0:
+        allocation = np.floor(weights * (slots / total)).astype(np.int64)
+    else:
+        allocation = np.zeros(count, dtype=np.int64)
+    allocation = np.clip(allocation, low, high)
+    if allocation.sum() > slots:
+        allocation = low.copy()
+
+    heap = [(-weights[i] / (allocation[i] + 1), i) for i in np.flatnonzero(allocation < high).tolist()]
+    heapq.heapify(heap)
+    for _ in range(slots - int(allocation.sum())):
+        _, i = heapq.heappop(heap)
+        allocation[i] += 1
+        if allocation[i] < high[i]:
+            heapq.heappush(heap, (-weights[i] / (allocation[i] + 1), i))
+    return allocation
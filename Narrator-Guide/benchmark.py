@@ -0,0 +1,303 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from synth_data import ensure_dataset, parse_size
+from task_parser import (
+    EXAMPLE_WEIGHTS, YAML_LOADER, distribute_scores_to_20ths, load_task_table, parse_tasks_from_yaml,
+    print_20th_distribution, print_ranked_tasks, rank_tasks_by_score, score_tasks_batch,
+)
+
+# Bump when the result layout changes
+RESULTS_VERSION = 1
+
+# Stage order in reports and comparisons (parse_dict is only timed on small files)
+STAGES = ('parse', 'parse_dict', 'score', 'rank', 'distribute', 'render')
+
+# The legacy dict parser is only timed up to this many tasks (it is several times slower)
+LEGACY_PARSE_LIMIT = 100_000
+
+# A stage this much slower than the baseline is flagged by --compare
+REGRESSION_THRESHOLD = 0.10
+
+
+def _max_rss_bytes() -> int:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def _git_revision() -> Dict[str, Any]:
+    """Commit and dirty flag of the working tree, empty when git isn't available."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=here, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=here, capture_output=True,
+                                    text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    return {'commit': commit, 'dirty': dirty}
+
+
+def time_stage(func: Callable[[], Any], repeat: int = 3, memory: bool = True) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Time a stage (best of `repeat` runs), then measure its peak allocation in one traced run.
+
+    Tracing slows allocation-heavy code down a lot, so timed runs are never traced.
+
+    Args:
+        func (Callable[[], Any]): Stage to run
+        repeat (int): Timed runs
+        memory (bool): Also measure peak traced memory
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: The stage result, and seconds (best), mean_seconds,
+            runs and peak_bytes (None when memory is off)
+    """
+    runs = []
+    result = None
+    for _ in range(max(1, repeat)):
+        result = None
+        start = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        result = None
+        tracemalloc.start()
+        try:
+            result = func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return result, {
+        'seconds': min(runs),
+        'mean_seconds': sum(runs) / len(runs),
+        'runs': runs,
+        'peak_bytes': peak,
+    }
+
+
+def benchmark_file(yaml_file: str, weights: Dict[str, float], repeat: int = 3, memory: bool = True,
+                   legacy_parse: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Run every pipeline stage over one task file.
+
+    Stages: parse (YAML -> TaskTable), score (vectorized scores), rank (sorted
+    (name, score) list), distribute (20ths) and render (ranking and distribution
+    printouts, written to os.devnull). Each stage is fed the previous stage's result.
+
+    Args:
+        yaml_file (str): Task YAML file
+        weights (Dict[str, float]): Weights for each criterion
+        repeat (int): Timed runs per stage
+        memory (bool): Measure peak traced memory per stage
+        legacy_parse (Optional[bool]): Also time parse_tasks_from_yaml
+            (default: only up to LEGACY_PARSE_LIMIT tasks)
+
+    Returns:
+        Dict[str, Any]: file, bytes, tasks, stages {name: timing} and max_rss_bytes
+    """
+    stages = {}
+    tasks, stages['parse'] = time_stage(lambda: load_task_table(yaml_file), repeat, memory)
+    if legacy_parse is None:
+        legacy_parse = len(tasks) <= LEGACY_PARSE_LIMIT
+    if legacy_parse:
+        _, stages['parse_dict'] = time_stage(lambda: parse_tasks_from_yaml(yaml_file), repeat, memory)
+
+    _, stages['score'] = time_stage(lambda: score_tasks_batch(tasks, weights), repeat, memory)
+    ranked, stages['rank'] = time_stage(lambda: rank_tasks_by_score(tasks, weights), repeat, memory)
+    distribution, stages['distribute'] = time_stage(lambda: distribute_scores_to_20ths(ranked), repeat, memory)
+
+    def render() -> None:
+        with open(os.devnull, 'w', encoding='utf-8') as sink, contextlib.redirect_stdout(sink):
+            print_ranked_tasks(tasks, weights)
+            print_20th_distribution(distribution)
+
+    _, stages['render'] = time_stage(render, repeat, memory)
+
+    return {
+        'file': yaml_file,
+        'bytes': os.path.getsize(yaml_file),
+        'tasks': len(tasks),
+        'stages': stages,
+        'max_rss_bytes': _max_rss_bytes(),
+    }
+
+
+def run_benchmarks(sizes: List[int], data_dir: str = 'bench_data', seed: int = 0, repeat: int = 3,
+                   memory: bool = True, weights: Dict[str, float] = None) -> Dict[str, Any]:
+    """
+    Benchmark the pipeline at several synthetic dataset sizes.
+
+    Missing datasets are generated with synth_data first (not timed).
+
+    Args:
+        sizes (List[int]): Task counts
+        data_dir (str): Directory holding generated datasets
+        seed (int): Dataset seed
+        repeat (int): Timed runs per stage
+        memory (bool): Measure peak traced memory per stage
+        weights (Dict[str, float]): Weights for each criterion (EXAMPLE_WEIGHTS by default)
+
+    Returns:
+        Dict[str, Any]: Results document with environment details and one entry per size
+    """
+    weights = weights or EXAMPLE_WEIGHTS
+    results = []
+    for count in sizes:
+        path = ensure_dataset(data_dir, count, seed)
+        print(f"Benchmarking {count:,} tasks ({path})...")
+        results.append({'size': count, **benchmark_file(path, weights, repeat, memory)})
+        print_result(results[-1])
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git': _git_revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pyyaml': yaml.__version__,
+        'yaml_loader': YAML_LOADER.__name__,
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': repeat,
+        'weights': weights,
+        'results': results,
+    }
+
+
+def _ordered_stages(stages: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """Stage timings in STAGES order, then any stages from other versions in their stored order."""
+    known = [(stage, stages[stage]) for stage in STAGES if stage in stages]
+    return known + [(stage, timing) for stage, timing in stages.items() if stage not in STAGES]
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """
+    Print the per-stage table for one dataset size.
+
+    Args:
+        result (Dict[str, Any]): One entry of the results document
+    """
+    print(f"\n{'Stage':<12} {'Best (ms)':>12} {'Mean (ms)':>12} {'Peak MiB':>10} {'µs/task':>10}")
+    print("-" * 60)
+    for stage, timing in _ordered_stages(result['stages']):
+        peak = f"{timing['peak_bytes'] / 1024 / 1024:.1f}" if timing['peak_bytes'] is not None else '-'
+        per_task = timing['seconds'] / max(1, result['tasks']) * 1e6
+        print(f"{stage:<12} {timing['seconds'] * 1000:>12.2f} {timing['mean_seconds'] * 1000:>12.2f} "
+              f"{peak:>10} {per_task:>10.2f}")
+    print("-" * 60)
+    print(f"{result['tasks']:,} tasks, {result['bytes'] / 1024 / 1024:.1f} MiB YAML, "
+          f"max RSS {result['max_rss_bytes'] / 1024 / 1024:.0f} MiB\n")
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare best stage times against a baseline results document.
+
+    Args:
+        current (Dict[str, Any]): New results document
+        baseline (Dict[str, Any]): Earlier results document
+        threshold (float): Relative slowdown reported as a regression
+
+    Returns:
+        List[Dict[str, Any]]: size, stage, baseline/current seconds, ratio and regression flag
+            for every (size, stage) present in both documents
+    """
+    baseline_by_size = {result['size']: result for result in baseline.get('results', [])}
+    rows = []
+    for result in current['results']:
+        before = baseline_by_size.get(result['size'])
+        if before is None:
+            continue
+        for stage, timing in _ordered_stages(result['stages']):
+            if stage not in before['stages']:
+                continue
+            old = before['stages'][stage]['seconds']
+            ratio = timing['seconds'] / old if old else float('inf')
+            rows.append({
+                'size': result['size'],
+                'stage': stage,
+                'baseline_seconds': old,
+                'seconds': timing['seconds'],
+                'ratio': ratio,
+                'regression': ratio > 1 + threshold,
+            })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], baseline_label: str) -> None:
+    """
+    Print a comparison table from compare_results.
+
+    Args:
+        rows (List[Dict[str, Any]]): Comparison rows
+        baseline_label (str): How to name the baseline in the header
+    """
+    print(f"\n{'='*80}")
+    print(f"{f'COMPARISON WITH {baseline_label}':^80}")
+    print(f"{'='*80}")
+    if not rows:
+        print("No matching sizes in the baseline")
+        return
+    print(f"\n{'Size':>10} {'Stage':<12} {'Baseline (ms)':>14} {'Now (ms)':>12} {'Change':>9}")
+    print("-" * 80)
+    for row in rows:
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['size']:>10,} {row['stage']:<12} {row['baseline_seconds'] * 1000:>14.2f} "
+              f"{row['seconds'] * 1000:>12.2f} {(row['ratio'] - 1) * 100:>+8.1f}%{flag}")
+    print("-" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parse/score/rank/distribute/render pipeline")
+    parser.add_argument('sizes', nargs='*', default=['1k', '100k'], help="Dataset sizes, e.g. 1k 100k 1m")
+    parser.add_argument('--data-dir', default='bench_data', help="Directory for generated datasets")
+    parser.add_argument('--seed', type=int, default=0, help="Dataset seed")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage (best is reported)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the traced peak-memory run")
+    parser.add_argument('--output', default=None, help="Results file (default bench_results/<time>_<commit>.json)")
+    parser.add_argument('--compare', default=None, help="Baseline results file to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help="Slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes]
+    document = run_benchmarks(sizes, args.data_dir, args.seed, args.repeat, not args.no_memory)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join('bench_results', f"{stamp}_{document['git'].get('commit', 'nogit')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        rows = compare_results(document, baseline, args.threshold)
+        print_comparison(rows, args.compare)
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from parse_cache import ParseCache, load_task_table_cached
+from task_parser import EXAMPLE_WEIGHTS, score_tasks_batch
+from task_table import DISTRIBUTION_KEYS, TaskTable, unique_keys
+
+AFFINITY_METHODS = ('cosine', 'weighted')
+
+
+def load_goal_table(yaml_file_path: str, use_cache: bool = True) -> TaskTable:
+    """
+    Load endGoals from a Goal_Nodes-style YAML file into a TaskTable.
+
+    Args:
+        yaml_file_path (str): Path to the goal YAML file
+        use_cache (bool): Load through the parse cache
+
+    Returns:
+        TaskTable: One row per end goal
+    """
+    return ParseCache(enabled=None if use_cache else False).load(yaml_file_path, 'endGoals')
+
+
+def affinity_matrix(task_distribution: np.ndarray, goal_distribution: np.ndarray,
+                    method: str = 'cosine', dimension_weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Relate tasks to goals through their distribution vectors.
+
+    'cosine' gives the cosine similarity of the two vectors (0-1 for the
+    non-negative distributions used here). 'weighted' takes a dot product with
+    per-dimension weights and normalizes each task's row to sum to 1, splitting
+    the task across the goals it serves.
+
+    Args:
+        task_distribution (np.ndarray): (n_tasks, 6) distribution matrix
+        goal_distribution (np.ndarray): (n_goals, 6) distribution matrix
+        method (str): 'cosine' or 'weighted'
+        dimension_weights (Optional[Dict[str, float]]): Per-dimension weights for 'weighted'
+
+    Returns:
+        np.ndarray: (n_tasks, n_goals) affinity matrix
+    """
+    tasks = np.asarray(task_distribution, dtype=np.float64)
+    goals = np.asarray(goal_distribution, dtype=np.float64)
+
+    if method == 'cosine':
+        task_norms = np.linalg.norm(tasks, axis=1, keepdims=True)
+        goal_norms = np.linalg.norm(goals, axis=1, keepdims=True)
+        tasks = np.divide(tasks, task_norms, out=np.zeros_like(tasks), where=task_norms > 0)
+        goals = np.divide(goals, goal_norms, out=np.zeros_like(goals), where=goal_norms > 0)
+        return tasks @ goals.T
+
+    if method == 'weighted':
+        dims = np.array([(dimension_weights or {}).get(key, 1.0) for key in DISTRIBUTION_KEYS], dtype=np.float64)
+        raw = (tasks * dims) @ goals.T
+        totals = raw.sum(axis=1, keepdims=True)
+        return np.divide(raw, totals, out=np.zeros_like(raw), where=totals > 0)
+
+    raise ValueError(f"Unknown affinity method '{method}' (expected one of {AFFINITY_METHODS})")
+
+
+class GoalGraph:
+    """
+    Precomputed linkage between tasks and end goals.
+
+    Holds the tasks x goals affinity matrix, task scores, per-goal progress and
+    pressure, and a per-goal ordering of tasks by how much they serve that goal
+    (affinity x score). Reweighting only rescores and re-sorts; the affinity
+    matrix is rebuilt only when tasks or goals change.
+    """
+
+    def __init__(self, tasks: TaskTable, goals: TaskTable, weights: Dict[str, float],
+                 method: str = 'cosine', dimension_weights: Optional[Dict[str, float]] = None):
+        self.method = method
+        self.dimension_weights = dimension_weights
+        self.weights = dict(weights)
+        self.set_tasks(tasks, goals)
+
+    def set_tasks(self, tasks: TaskTable, goals: Optional[TaskTable] = None) -> None:
+        """
+        Replace the tasks (and optionally goals) and rebuild everything.
+
+        Args:
+            tasks (TaskTable): Tasks to link
+            goals (Optional[TaskTable]): New goals, or None to keep the current ones
+        """
+        self.tasks = tasks
+        if goals is not None:
+            self.goals = goals
+            # Goals are addressed by title, with ' [n]' on repeated titles so none is shadowed
+            self.goal_keys = unique_keys(goals.titles)
+            self.goal_index = {key: j for j, key in enumerate(self.goal_keys)}
+
+        self.affinity = affinity_matrix(tasks.distribution, self.goals.distribution,
+                                        self.method, self.dimension_weights)
+
+        # Tasks that do not state a goalImpact (NaN) count with impact 1; an explicit 0 stays 0
+        impact = tasks.numeric['goal_impact'].astype(np.float64)
+        self.goal_impact = np.where(np.isnan(impact), 1.0, impact)
+        self.progress = self.affinity.T @ self.goal_impact
+        self.set_weights(self.weights)
+
+    def set_weights(self, weights: Dict[str, float]) -> None:
+        """
+        Rescore tasks under new weights and refresh pressure and per-goal orderings.
+
+        Args:
+            weights (Dict[str, float]): Weights for each criterion
+        """
+        self.weights = dict(weights)
+        _, self.scores = score_tasks_batch(self.tasks, self.weights)
+        self.contribution = self.affinity * self.scores[:, None]
+        self.pressure = self.contribution.sum(axis=0)
+        total = self.pressure.sum()
+        self.pressure_share = self.pressure / total if total > 0 else np.zeros_like(self.pressure)
+        self.goal_order = np.argsort(-self.contribution, axis=0, kind='stable').astype(np.int32)
+
+    def top_tasks(self, goal: str, k: int = 10) -> List[tuple]:
+        """
+        Return the tasks that most serve a goal.
+
+        Args:
+            goal (str): Goal key (its title, or 'title [n]' for the n-th goal with that title)
+            k (int): Number of tasks to return
+
+        Returns:
+            List[tuple]: List of (task_name, contribution, affinity, score) tuples,
+                highest contribution first; tasks with no affinity are left out
+        """
+        j = self.goal_index[goal]
+        result = []
+        for i in self.goal_order[:k, j].tolist():
+            if self.affinity[i, j] <= 0:
+                break
+            result.append((self.tasks.titles[i], float(self.contribution[i, j]),
+                           float(self.affinity[i, j]), float(self.scores[i])))
+        return result
+
+    def goal_summary(self) -> List[Dict[str, Any]]:
+        """
+        Summarize every goal.
+
+        Returns:
+            List[Dict[str, Any]]: Per goal: key (see top_tasks), progress (impact-weighted affinity
+                of all tasks), pressure (score-weighted affinity) and pressure_share,
+                sorted by pressure (highest first)
+        """
+        summary = [
+            {
+                'goal': key,
+                'progress': float(self.progress[j]),
+                'pressure': float(self.pressure[j]),
+                'pressure_share': float(self.pressure_share[j]),
+            }
+            for j, key in enumerate(self.goal_keys)
+        ]
+        summary.sort(key=lambda goal: goal['pressure'], reverse=True)
+        return summary
+
+
+def print_goal_report(graph: GoalGraph, k: int = 3) -> None:
+    """
+    Print per-goal progress and pressure with the top tasks serving each goal.
+
+    Args:
+        graph (GoalGraph): Linked tasks and goals
+        k (int): Tasks to list per goal
+    """
+    summary = graph.goal_summary()
+    if not summary:
+        print("No goals to display")
+        return
+
+    print(f"\n{'='*80}")
+    print(f"{'GOAL LINKAGE':^80}")
+    print(f"{'='*80}")
+
+    for goal in summary:
+        print(f"\nGoal: {goal['goal']}")
+        print(f"  Progress: {goal['progress']:.2f} | Pressure: {goal['pressure']:.2f} "
+              f"({goal['pressure_share'] * 100:.1f}% of total)")
+        for task_name, contribution, affinity, score in graph.top_tasks(goal['goal'], k):
+            print(f"    {task_name[:50]:<50} {contribution:>7.3f} (affinity {affinity:.2f} x score {score:.2f})")
+        print("-" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link tasks to end goals and report per-goal pressure")
+    parser.add_argument('tasks_file', nargs='?', default='example_task.yaml', help="Task YAML file")
+    parser.add_argument('goals_file', nargs='?', default='Goal_Nodes.yaml', help="Goal YAML file")
+    parser.add_argument('--method', choices=AFFINITY_METHODS, default='cosine', help="Affinity measure")
+    parser.add_argument('--top', type=int, default=3, help="Tasks to list per goal")
+    args = parser.parse_args()
+
+    tasks = load_task_table_cached(args.tasks_file)
+    goals = load_goal_table(args.goals_file)
+    print_goal_report(GoalGraph(tasks, goals, EXAMPLE_WEIGHTS, args.method), args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from parse_cache import load_task_table_cached
+from task_parser import (
+    CRITERIA, EXAMPLE_WEIGHTS, URGENCY_ALPHA, URGENCY_BASE, URGENCY_SCALE,
+    Tasks, criteria_matrix, score_components,
+)
+
+# Widest dueInDays range tabulated with math.exp; wider ranges use np.exp
+URGENCY_TABLE_MAX_DAYS = 100_000
+
+
+def urgency_lookup(min_days: int, max_days: int) -> np.ndarray:
+    """
+    Tabulate exp(-alpha * d) for d = min_days..max_days.
+
+    Entries come from math.exp so lookups match calculate_task_score exactly.
+
+    Args:
+        min_days (int): Smallest dueInDays value to cover (negative when overdue)
+        max_days (int): Largest dueInDays value to cover
+
+    Returns:
+        np.ndarray: (max_days - min_days + 1,) lookup table
+    """
+    return np.array([math.exp(-URGENCY_ALPHA * day) for day in range(min_days, max_days + 1)], dtype=np.float64)
+
+
+def horizon_scores(tasks_dict: Tasks, weights: Dict[str, float], days: int) -> Tuple[List[str], np.ndarray]:
+    """
+    Score every task for each of the next `days` days.
+
+    On day d a task's dueInDays is reduced by d. Tasks with a due date are
+    active while days remain (dueInDays - d > 0) and drop out afterwards; tasks
+    without one (dueInDays == 0) stay active with zero urgency. Tasks already
+    overdue (dueInDays < 0) stay active with their urgency growing as in
+    calculate_task_score, so day 0 matches rank_tasks_by_score.
+
+    Args:
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
+        weights (Dict[str, float]): Weights for each criterion
+        days (int): Number of days to project, starting with today (day 0)
+
+    Returns:
+        Tuple[List[str], np.ndarray]: Task names and an (n_tasks, days) score
+            matrix, NaN where a task is no longer active
+    """
+    names, matrix = criteria_matrix(tasks_dict)
+    components = score_components(matrix)
+
+    # Criteria that do not move with time, summed in calculate_task_score's order
+    static = np.zeros(len(names), dtype=np.float64)
+    for column, key in enumerate(CRITERIA[:3]):
+        static += components[:, column] * weights.get(key, 1.0)
+    due_weight = weights.get('dueInDays', 1.0)
+
+    due = matrix[:, 3]
+    remaining = due[:, None] - np.arange(days, dtype=np.float64)[None, :]
+    no_due_date = due == 0
+    active = no_due_date[:, None] | (due < 0)[:, None] | (remaining > 0)
+    # Inactive cells are masked below; zero keeps them out of the table range
+    exponent = np.where(active & ~no_due_date[:, None], remaining, 0.0)
+
+    low, high = (int(exponent.min()), int(exponent.max())) if exponent.size else (0, 0)
+    if np.array_equal(due, np.trunc(due)) and high - low <= URGENCY_TABLE_MAX_DAYS:
+        exp_values = urgency_lookup(low, high)[exponent.astype(np.int64) - low]
+    else:
+        exp_values = np.exp(-URGENCY_ALPHA * exponent)
+
+    urgency = URGENCY_BASE + URGENCY_SCALE * exp_values
+    urgency[no_due_date] = 0.0
+
+    scores = static[:, None] + urgency * due_weight
+    scores[~active] = np.nan
+    return names, scores
+
+
+def horizon_ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    Rank tasks within each day (ties keep task order).
+
+    Args:
+        scores (np.ndarray): (n_tasks, days) matrix from horizon_scores
+
+    Returns:
+        np.ndarray: (n_tasks, days) int32 matrix of 1-based ranks, 0 where inactive
+    """
+    n_tasks, days = scores.shape
+    keys = np.where(np.isnan(scores), np.inf, -scores)
+    order = np.argsort(keys, axis=0, kind='stable')
+    ranks = np.empty((n_tasks, days), dtype=np.int32)
+    ranks[order, np.arange(days)] = np.arange(1, n_tasks + 1, dtype=np.int32)[:, None]
+    ranks[np.isnan(scores)] = 0
+    return ranks
+
+
+def top_k_entry_day(ranks: np.ndarray, k: int) -> np.ndarray:
+    """
+    Find the first day each task is ranked within the top `k`.
+
+    Args:
+        ranks (np.ndarray): (n_tasks, days) matrix from horizon_ranks
+        k (int): Size of the top set
+
+    Returns:
+        np.ndarray: (n_tasks,) day index, -1 for tasks that never enter the top k
+    """
+    in_top = (ranks > 0) & (ranks <= k)
+    return np.where(in_top.any(axis=1), in_top.argmax(axis=1), -1)
+
+
+def print_horizon(names: List[str], scores: np.ndarray, ranks: np.ndarray, k: int = 5,
+                  step: int = 7) -> None:
+    """
+    Print each task's projected rank every `step` days and when it enters the top `k`.
+
+    Args:
+        names (List[str]): Task names from horizon_scores
+        scores (np.ndarray): (n_tasks, days) score matrix
+        ranks (np.ndarray): (n_tasks, days) rank matrix
+        k (int): Size of the top set
+        step (int): Days between printed columns
+    """
+    if not names:
+        print("No tasks to display")
+        return
+
+    days = scores.shape[1]
+    columns = list(range(0, days, step))
+    entry = top_k_entry_day(ranks, k)
+
+    print(f"\n{'='*80}")
+    print(f"{f'RANK HORIZON ({days} DAYS)':^80}")
+    print(f"{'='*80}")
+
+    header = ''.join(f"{'d' + str(day):>5}" for day in columns[:8])
+    print(f"\n{'Task':<40}{header} {'Top-' + str(k):>7}")
+    print("-" * 80)
+    today = np.where(ranks[:, 0] > 0, ranks[:, 0], len(names) + 1)
+    for i in np.argsort(today, kind='stable')[:50].tolist():
+        cells = ''.join(f"{ranks[i, day] if ranks[i, day] else '-':>5}" for day in columns[:8])
+        first = f"d{entry[i]}" if entry[i] >= 0 else 'never'
+        print(f"{names[i][:39]:<40}{cells} {first:>7}")
+    print("-" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project task scores and ranks over the coming days")
+    parser.add_argument('yaml_file', nargs='?', default='example_task.yaml', help="Task YAML file")
+    parser.add_argument('--days', type=int, default=30, help="Number of days to project")
+    parser.add_argument('--top-k', type=int, default=3, help="Top set size for the entry day")
+    parser.add_argument('--step', type=int, default=7, help="Days between printed columns")
+    args = parser.parse_args()
+
+    tasks = load_task_table_cached(args.yaml_file)
+    names, scores = horizon_scores(tasks, EXAMPLE_WEIGHTS, args.days)
+    print_horizon(names, scores, horizon_ranks(scores), args.top_k, args.step)
+
+
+if __name__ == "__main__":
+    main()
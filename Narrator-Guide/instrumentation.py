@@ -0,0 +1,143 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Any, Iterator, Optional
+
+# Pipeline stages reported by task_parser, in pipeline order
+STAGES = ('parse', 'normalize', 'score', 'sort', 'apportion', 'render')
+
+# Called as hook(stage, seconds) each time a stage finishes
+StageHook = Callable[[str, float], None]
+
+
+class StageProfile:
+    """
+    Accumulated wall-clock time, call counts and counters per pipeline stage.
+
+    Nested stages are timed independently, so a stage's time includes any
+    stage it calls into.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.hooks: List[StageHook] = []
+
+    def add_hook(self, hook: StageHook) -> None:
+        """
+        Register a callback run after every stage.
+
+        Args:
+            hook (StageHook): Called with the stage name and its elapsed seconds
+        """
+        self.hooks.append(hook)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+        for hook in self.hooks:
+            hook(name, seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Export the profile as plain data.
+
+        Returns:
+            Dict[str, Any]: stages {name: {seconds, calls}} and counters
+        """
+        return {
+            'stages': {name: {'seconds': self.seconds[name], 'calls': self.calls[name]}
+                       for name in _ordered(self.seconds)},
+            'counters': dict(self.counters),
+        }
+
+    def report(self) -> str:
+        """
+        Format the per-stage breakdown as a table.
+
+        Returns:
+            str: Report text
+        """
+        total = sum(self.seconds.get(name, 0.0) for name in STAGES)
+        lines = [f"\n{'='*80}", f"{'STAGE PROFILE':^80}", f"{'='*80}",
+                 f"\n{'Stage':<14} {'Calls':>8} {'Time (ms)':>12} {'% of Total':>12}", "-" * 80]
+        for name in _ordered(self.seconds):
+            seconds = self.seconds[name]
+            share = f"{seconds / total * 100:.1f}%" if total and name in STAGES else ''
+            lines.append(f"{name:<14} {self.calls[name]:>8} {seconds * 1000:>12.2f} {share:>12}")
+        lines.append("-" * 80)
+        lines.append(f"{'TOTAL':<14} {'':>8} {total * 1000:>12.2f}")
+        if self.counters:
+            lines.append("\nCounters:")
+            lines.extend(f"  {name}: {value:,}" for name, value in sorted(self.counters.items()))
+        return '\n'.join(lines)
+
+
+def _ordered(names: Iterator[str]) -> List[str]:
+    """Known stages in pipeline order, then any others by name."""
+    names = list(names)
+    return [name for name in STAGES if name in names] + sorted(name for name in names if name not in STAGES)
+
+
+# Profile that stage() and count() report to; None keeps them free
+_active: Optional[StageProfile] = None
+
+
+@contextmanager
+def profiling(profile: Optional[StageProfile] = None) -> Iterator[StageProfile]:
+    """
+    Collect stage timings and counters for everything run inside the block.
+
+    Args:
+        profile (Optional[StageProfile]): Profile to add to (a new one when omitted)
+
+    Yields:
+        StageProfile: The active profile
+    """
+    global _active
+    previous = _active
+    _active = profile or StageProfile()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a block as one run of a pipeline stage.
+
+    Outside a profiling() block this only costs the context manager itself.
+
+    Args:
+        name (str): Stage name, normally one of STAGES
+    """
+    profile = _active
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(name, time.perf_counter() - start)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add to a named counter of the active profile (no-op when not profiling).
+
+    Args:
+        name (str): Counter name, e.g. 'tasks_scored'
+        amount (int): Amount to add
+    """
+    if _active is not None:
+        _active.count(name, amount)
+
+
+def active_profile() -> Optional[StageProfile]:
+    return _active
@@ -0,0 +1,284 @@
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import time
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterator, Optional
+
+import numpy as np
+
+from task_parser import load_task_table
+from task_table import TaskTable
+
+# Bump when the TaskTable layout changes so old blobs are never read back
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'life-os' / 'parse'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+INDEX_FILE = 'index.json'
+LOCK_FILE = 'index.lock'
+
+# What np.load / TaskTable.from_arrays raise on a truncated or corrupt blob
+CORRUPT_BLOB_ERRORS = (zipfile.BadZipFile, EOFError, OSError, ValueError, KeyError)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed task/goal tables.
+
+    Entries are keyed by (absolute path, YAML section). A matching mtime and size
+    is trusted as a hit; otherwise the file's SHA-256 is compared before the
+    entry is considered stale. Tables are stored as uncompressed .npz blobs named
+    by content hash, so they load without any YAML parsing. The least recently
+    used blobs are evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 enabled: Optional[bool] = None):
+        self.cache_dir = Path(cache_dir or os.environ.get('LIFE_OS_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.environ.get('LIFE_OS_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        if enabled is None:
+            enabled = os.environ.get('LIFE_OS_NO_CACHE', '') in ('', '0')
+        self.enabled = enabled
+        self.last_status = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / INDEX_FILE
+
+    @contextmanager
+    def _index_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the index so concurrent processes don't lose each other's updates."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / LOCK_FILE, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return index if index.get('version') == CACHE_VERSION else {}
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        index['version'] = CACHE_VERSION
+        tmp_path = self.index_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _blob_path(self, digest: str, section: str) -> Path:
+        return self.cache_dir / f'{digest}-{section}.npz'
+
+    def load(self, yaml_file_path: str, section: str = 'tasks',
+             loader: Callable[[str, str], TaskTable] = load_task_table) -> TaskTable:
+        """
+        Return the parsed table for a YAML file, from the cache when it is current.
+
+        Args:
+            yaml_file_path (str): Path to the YAML file
+            section (str): Top-level key holding the task list
+            loader (Callable[[str, str], TaskTable]): Parser used on a cache miss
+
+        Returns:
+            TaskTable: Parsed table
+        """
+        if not self.enabled:
+            self.last_status = 'bypass'
+            return loader(yaml_file_path, section)
+
+        path = Path(yaml_file_path).resolve()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.last_status = 'miss'
+            return loader(yaml_file_path, section)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key = f'{path}|{section}'
+        entry = self._read_index().get('entries', {}).get(key)
+
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            digest = entry['sha256']
+            self.last_status = 'hit'
+        else:
+            digest = _file_digest(path)
+            self.last_status = 'revalidated' if entry and entry['sha256'] == digest else 'miss'
+
+        blob_path = self._blob_path(digest, section)
+        table = None
+        if self.last_status != 'miss' or blob_path.exists():
+            try:
+                with np.load(blob_path, allow_pickle=False) as arrays:
+                    table = TaskTable.from_arrays(dict(arrays))
+                if self.last_status == 'miss':
+                    self.last_status = 'shared'
+            except FileNotFoundError:
+                table = None
+            except CORRUPT_BLOB_ERRORS:
+                # Truncated or corrupt blob (e.g. a full disk); drop it and parse again
+                blob_path.unlink(missing_ok=True)
+                table = None
+
+        if table is None:
+            self.last_status = 'miss'
+            table = loader(yaml_file_path, section)
+            if not len(table):
+                # Parse errors also yield an empty table; never cache those
+                return table
+            tmp_path = blob_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **table.to_arrays())
+            os.replace(tmp_path, blob_path)
+
+        # Re-read under the lock: other processes may have updated the index since the lookup
+        with self._index_lock():
+            index = self._read_index()
+            entries = index.setdefault('entries', {})
+            entries[key] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': digest,
+                'blob': blob_path.name,
+                'bytes': blob_path.stat().st_size,
+                'last_used': time.time(),
+            }
+            self._evict(entries, keep=blob_path.name)
+            self._write_index(index)
+        return table
+
+    def _evict(self, entries: Dict[str, Dict[str, Any]], keep: str) -> None:
+        """Drop least recently used blobs until the cache fits in max_bytes."""
+        blobs: Dict[str, Dict[str, Any]] = {}
+        for entry in entries.values():
+            blob = blobs.setdefault(entry['blob'], {'bytes': entry['bytes'], 'last_used': 0.0})
+            blob['last_used'] = max(blob['last_used'], entry['last_used'])
+
+        total = sum(blob['bytes'] for blob in blobs.values())
+        for name, blob in sorted(blobs.items(), key=lambda item: item[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            (self.cache_dir / name).unlink(missing_ok=True)
+            total -= blob['bytes']
+            for key in [key for key, entry in entries.items() if entry['blob'] == name]:
+                del entries[key]
+
+    def invalidate(self, yaml_file_path: str, section: str = 'tasks') -> None:
+        """Forget the cache entry for one file (its blob is kept if other paths share it)."""
+        with self._index_lock():
+            index = self._read_index()
+            entries = index.get('entries', {})
+            entry = entries.pop(f'{Path(yaml_file_path).resolve()}|{section}', None)
+            if entry is None:
+                return
+            if not any(other['blob'] == entry['blob'] for other in entries.values()):
+                (self.cache_dir / entry['blob']).unlink(missing_ok=True)
+            self._write_index(index)
+
+    def clear(self) -> None:
+        """Remove every cached blob and the index."""
+        if not self.cache_dir.exists():
+            return
+        with self._index_lock():
+            for path in self.cache_dir.glob('*.npz'):
+                path.unlink(missing_ok=True)
+            self.index_path.unlink(missing_ok=True)
+
+
+def load_task_table_cached(yaml_file_path: str, section: str = 'tasks',
+                           cache: Optional[ParseCache] = None) -> TaskTable:
+    """
+    Load a TaskTable through the parse cache.
+
+    Args:
+        yaml_file_path (str): Path to the YAML file
+        section (str): Top-level key holding the task list ('endGoals' for goal files)
+        cache (Optional[ParseCache]): Cache to use (a default one when omitted)
+
+    Returns:
+        TaskTable: Parsed table
+    """
+    return (cache or ParseCache()).load(yaml_file_path, section)
+
+
+def measure_cache_gain(yaml_file_path: str, section: str = 'tasks',
+                       cache: Optional[ParseCache] = None, repeats: int = 5) -> Dict[str, float]:
+    """
+    Time a cold parse (YAML -> table -> cache) against warm loads from the cache.
+
+    Args:
+        yaml_file_path (str): Path to the YAML file
+        section (str): Top-level key holding the task list
+        cache (Optional[ParseCache]): Cache to measure (a default one when omitted)
+        repeats (int): Warm loads to average
+
+    Returns:
+        Dict[str, float]: cold_seconds, warm_seconds (mean) and speedup
+    """
+    cache = cache or ParseCache(enabled=True)
+    cache.invalidate(yaml_file_path, section)
+
+    start = time.perf_counter()
+    cache.load(yaml_file_path, section)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        cache.load(yaml_file_path, section)
+    warm = (time.perf_counter() - start) / repeats
+
+    return {
+        'cold_seconds': cold,
+        'warm_seconds': warm,
+        'speedup': cold / warm if warm else float('inf'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and benchmark the task/goal parse cache")
+    parser.add_argument('yaml_file', nargs='?', default='example_task.yaml', help="Task or goal YAML file")
+    parser.add_argument('--section', default='tasks', help="Top-level key holding the task list")
+    parser.add_argument('--cache-dir', default=None, help="Cache directory")
+    parser.add_argument('--max-mb', type=float, default=None, help="Cache size bound in MiB")
+    parser.add_argument('--repeats', type=int, default=5, help="Warm loads to average")
+    parser.add_argument('--clear', action='store_true', help="Empty the cache and exit")
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None
+    cache = ParseCache(args.cache_dir, max_bytes, enabled=True)
+
+    if args.clear:
+        cache.clear()
+        print(f"Cleared parse cache at {cache.cache_dir}")
+        return
+
+    timings = measure_cache_gain(args.yaml_file, args.section, cache, args.repeats)
+    print(f"Parse cache: {cache.cache_dir}")
+    print(f"  Cold parse: {timings['cold_seconds'] * 1000:.2f} ms")
+    print(f"  Warm load:  {timings['warm_seconds'] * 1000:.2f} ms")
+    print(f"  Speedup:    {timings['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
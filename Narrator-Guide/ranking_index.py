@@ -0,0 +1,150 @@
+from itertools import count, islice
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from sortedcontainers import SortedList
+
+from task_parser import CRITERIA, Tasks, calculate_task_score, extract_criteria, score_tasks_batch
+from task_table import TaskRow
+
+
+class RankingIndex:
+    """
+    Incrementally maintained task ranking.
+
+    Tasks are kept in a sorted list keyed by (-score, insertion sequence), so
+    upsert/remove touch one entry in O(log n) and only rescore the changed task.
+    Ties are ordered by first insertion, exactly like rank_tasks_by_score on a
+    dict that received the same edits. Changing the weights rescores every task
+    in one batch pass.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = dict(weights)
+        self._criteria: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, Tuple[float, int]] = {}
+        self._ranked = SortedList()
+        self._sequence = count()
+
+    @classmethod
+    def from_tasks(cls, tasks_dict: Tasks, weights: Dict[str, float]) -> 'RankingIndex':
+        """
+        Build an index from a task dict or TaskTable in one batch pass.
+
+        Tasks are keyed by title; as with parse_tasks_from_yaml, a later task with
+        the same title replaces the earlier one.
+
+        Args:
+            tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
+            weights (Dict[str, float]): Weights for each criterion
+
+        Returns:
+            RankingIndex: Index holding every task
+        """
+        index = cls(weights)
+        for task_name, criteria in tasks_dict.items():
+            if task_name not in index._criteria:
+                index._keys[task_name] = (0.0, next(index._sequence))
+            index._criteria[task_name] = {key: criteria[key] for key in CRITERIA}
+        index._rebuild()
+        return index
+
+    def _rebuild(self) -> None:
+        names, scores = score_tasks_batch(self._criteria, self.weights)
+        for task_name, score in zip(names, scores.tolist()):
+            self._keys[task_name] = (-score, self._keys[task_name][1])
+        self._ranked = SortedList(key + (task_name,) for task_name, key in self._keys.items())
+
+    def __len__(self) -> int:
+        return len(self._criteria)
+
+    def __contains__(self, task_name: str) -> bool:
+        return task_name in self._criteria
+
+    def set_weights(self, weights: Dict[str, float]) -> None:
+        """
+        Replace the weights and rescore every task in one batch rebuild.
+
+        Args:
+            weights (Dict[str, float]): Weights for each criterion
+        """
+        self.weights = dict(weights)
+        self._rebuild()
+
+    def upsert(self, task: Union[Dict[str, Any], TaskRow], criteria: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Insert or update one task and rescore only that task.
+
+        Args:
+            task (Union[Dict[str, Any], TaskRow]): A YAML task mapping, a TaskRow, or
+                a task title when `criteria` is given
+            criteria (Optional[Dict[str, Any]]): Criteria dictionary for a title
+
+        Returns:
+            float: The task's new score
+        """
+        if criteria is not None:
+            task_name = task
+        elif isinstance(task, TaskRow):
+            task_name = task.title
+            criteria = {key: task[key] for key in CRITERIA}
+        else:
+            task_name, criteria = extract_criteria(task)
+
+        score = calculate_task_score(criteria, self.weights)
+        old_key = self._keys.get(task_name)
+        if old_key is not None:
+            self._ranked.remove(old_key + (task_name,))
+            sequence = old_key[1]
+        else:
+            sequence = next(self._sequence)
+
+        key = (-score, sequence)
+        self._criteria[task_name] = {key_name: criteria[key_name] for key_name in CRITERIA}
+        self._keys[task_name] = key
+        self._ranked.add(key + (task_name,))
+        return score
+
+    def remove(self, task_name: str) -> None:
+        """
+        Remove a task by title.
+
+        Args:
+            task_name (str): Title of the task to remove
+
+        Raises:
+            KeyError: If the task is not in the index
+        """
+        key = self._keys.pop(task_name)
+        del self._criteria[task_name]
+        self._ranked.remove(key + (task_name,))
+
+    def top(self, k: int) -> List[tuple]:
+        """
+        Return the `k` best tasks.
+
+        Args:
+            k (int): Number of tasks to return
+
+        Returns:
+            List[tuple]: List of (task_name, score) tuples sorted by score (highest first)
+        """
+        return [(task_name, -neg_score) for neg_score, _, task_name in islice(self._ranked, k)]
+
+    def rank_of(self, task_name: str) -> int:
+        """
+        Return a task's 1-based position in the ranking.
+
+        Args:
+            task_name (str): Title of the task
+
+        Raises:
+            KeyError: If the task is not in the index
+        """
+        return self._ranked.index(self._keys[task_name] + (task_name,)) + 1
+
+    def score_of(self, task_name: str) -> float:
+        return -self._keys[task_name][0]
+
+    def ranked(self) -> List[tuple]:
+        """Return the full ranking, identical to rank_tasks_by_score on the same tasks."""
+        return self.top(len(self._ranked))
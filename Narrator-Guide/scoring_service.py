@@ -0,0 +1,625 @@
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import math
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from apportion import APPORTION_METHODS, TWENTIETHS
+from goal_graph import GoalGraph, load_goal_table
+from parse_cache import ParseCache
+from task_export import COMPONENT_COLUMNS
+from task_parser import CRITERIA, EXAMPLE_WEIGHTS, criteria_matrix, distribute_scores, score_components
+from task_table import TaskTable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = Path(os.environ.get('LIFE_OS_SCORING_SOCKET') or Path.home() / '.cache' / 'life-os' / 'scoring.sock')
+
+# Source files are stat()ed at most this often; a change triggers a background reload
+RELOAD_CHECK_SECONDS = 1.0
+
+# Latencies kept per method for the percentile stats
+LATENCY_WINDOW = 10_000
+
+# Rows returned by 'rank' when no limit is given
+DEFAULT_RANK_LIMIT = 50
+
+# Longest request line accepted from a client
+MAX_LINE_BYTES = 1 << 20
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RpcError(Exception):
+    """A request failed; code and message are returned to the client as a JSON-RPC error"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class ScoreSnapshot:
+    """
+    Immutable scored view of one task file (and optionally its goals) under one set of weights.
+
+    Everything a read request needs is computed up front: weighted components,
+    scores, the rank order, title and rank lookups. Distributions are computed
+    on first request per (parts, method) and memoized. Reloads and reweights
+    build a new snapshot and swap it in, so readers never see a half-built one.
+    """
+
+    def __init__(self, tasks: TaskTable, weights: Dict[str, float], goals: Optional[TaskTable] = None):
+        started = time.perf_counter()
+        self.tasks = tasks
+        self.weights = dict(weights)
+
+        names, matrix = criteria_matrix(tasks)
+        self.matrix = matrix
+        self.weighted = score_components(matrix)
+        # Summed in CRITERIA order, exactly like score_tasks_batch
+        self.scores = np.zeros(len(names), dtype=np.float64)
+        for column, key in enumerate(CRITERIA):
+            self.weighted[:, column] *= self.weights.get(key, 1.0)
+            self.scores += self.weighted[:, column]
+
+        self.order = np.argsort(-self.scores, kind='stable')
+        self.ranks = np.empty(len(names), dtype=np.int64)
+        self.ranks[self.order] = np.arange(1, len(names) + 1)
+        ordered_scores = self.scores[self.order].tolist()
+        self.ranking = [(names[i], score) for i, score in zip(self.order.tolist(), ordered_scores)]
+        self.rows = [{'rank': rank, 'title': title, 'score': score}
+                     for rank, (title, score) in enumerate(self.ranking, 1)]
+        # A later task with the same title wins, as in parse_tasks_from_yaml
+        self.index = {title: i for i, title in enumerate(names)}
+
+        self.goal_graph = GoalGraph(tasks, goals, self.weights) if goals is not None and len(goals) else None
+        self._distributions: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        self._goal_summary: Optional[List[Dict[str, Any]]] = None
+        self.build_seconds = time.perf_counter() - started
+
+    def rank(self, limit: int = DEFAULT_RANK_LIMIT, offset: int = 0) -> Dict[str, Any]:
+        return {'total': len(self.rows), 'offset': offset, 'tasks': self.rows[offset:offset + limit]}
+
+    def distribution(self, parts: int = TWENTIETHS, method: str = 'largest_remainder',
+                     limit: int = DEFAULT_RANK_LIMIT, offset: int = 0) -> Dict[str, Any]:
+        key = (parts, method)
+        if key not in self._distributions:
+            self._distributions[key] = [
+                {'title': title, 'score': score, 'parts': share, 'percentage': percentage}
+                for title, score, share, percentage in distribute_scores(self.ranking, parts, method=method)
+            ]
+        rows = self._distributions[key]
+        return {'total': len(rows), 'offset': offset, 'parts': parts, 'tasks': rows[offset:offset + limit]}
+
+    def goal_summary(self) -> List[Dict[str, Any]]:
+        if self._goal_summary is None:
+            self._goal_summary = self.goal_graph.goal_summary() if self.goal_graph is not None else []
+        return self._goal_summary
+
+    def breakdown(self, title: str) -> Dict[str, Any]:
+        i = self.index[title]
+        row = self.tasks.row(i)
+        return {
+            'title': title,
+            'id': int(self.tasks.ids[i]),
+            'rank': int(self.ranks[i]),
+            'score': float(self.scores[i]),
+            'criteria': {key: row[key] for key in CRITERIA},
+            'components': dict(zip(COMPONENT_COLUMNS, self.weighted[i].tolist())),
+            'weights': {key: self.weights.get(key, 1.0) for key in CRITERIA},
+        }
+
+
+class LatencyStats:
+    """Per-method request counts and a rolling window of handling times"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, method: str, nanoseconds: int, failed: bool = False) -> None:
+        if method not in self.samples:
+            self.samples[method] = deque(maxlen=self.window)
+        self.samples[method].append(nanoseconds)
+        self.counts[method] = self.counts.get(method, 0) + 1
+        if failed:
+            self.errors[method] = self.errors.get(method, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize latencies per method.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per method: count, errors and mean/p50/p90/p99/max
+                handling time in microseconds over the rolling window
+        """
+        summary = {}
+        for method, samples in sorted(self.samples.items()):
+            micros = np.array(samples, dtype=np.float64) / 1000.0
+            p50, p90, p99 = np.percentile(micros, (50, 90, 99)).tolist()
+            summary[method] = {
+                'count': self.counts[method],
+                'errors': self.errors.get(method, 0),
+                'mean_us': float(micros.mean()),
+                'p50_us': p50,
+                'p90_us': p90,
+                'p99_us': p99,
+                'max_us': float(micros.max()),
+            }
+        return summary
+
+
+class ScoringService:
+    """
+    Warm scoring state plus the JSON-RPC method table.
+
+    Read methods (rank, distribution, breakdown, goals, goal) answer from the
+    current ScoreSnapshot on the event loop. Reloads and reweights build the next
+    snapshot in a worker thread, one at a time, while reads keep being served
+    from the previous one.
+    """
+
+    def __init__(self, tasks_file: str, goals_file: Optional[str] = None,
+                 weights: Optional[Dict[str, float]] = None, cache: Optional[ParseCache] = None):
+        self.tasks_file = tasks_file
+        self.goals_file = goals_file
+        self.cache = cache or ParseCache()
+        self.stats = LatencyStats()
+        self.started = time.time()
+        self.connections = 0
+        self.reloads = 0
+        self.snapshot: Optional[ScoreSnapshot] = None
+        self._weights = dict(weights or EXAMPLE_WEIGHTS)
+        self._file_keys: Dict[str, Tuple[int, int]] = {}
+        self._last_check = 0.0
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self.methods = {
+            'rank': self.rank,
+            'distribution': self.distribution,
+            'breakdown': self.breakdown,
+            'goals': self.goals,
+            'goal': self.goal,
+            'set_weights': self.set_weights,
+            'reload': self.reload,
+            'stats': self.get_stats,
+            'ping': self.ping,
+        }
+        self.signatures = {name: inspect.signature(handler) for name, handler in self.methods.items()}
+
+    def _sources(self) -> List[str]:
+        return [path for path in (self.tasks_file, self.goals_file) if path]
+
+    def _stat_keys(self) -> Dict[str, Tuple[int, int]]:
+        keys = {}
+        for path in self._sources():
+            try:
+                stat = os.stat(path)
+                keys[path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                keys[path] = (0, 0)
+        return keys
+
+    def build(self, weights: Optional[Dict[str, float]] = None) -> ScoreSnapshot:
+        """
+        Parse (through the parse cache) and score the source files.
+
+        Args:
+            weights (Optional[Dict[str, float]]): Weights for the new snapshot (current ones when omitted)
+
+        Returns:
+            ScoreSnapshot: Snapshot ready to be swapped in
+        """
+        file_keys = self._stat_keys()
+        tasks = self.cache.load(self.tasks_file)
+        if not len(tasks) and self.snapshot is not None:
+            # A file caught mid-save parses as empty; keep serving the last good snapshot
+            raise ValueError(f"No tasks parsed from {self.tasks_file}; keeping the previous snapshot")
+        goals = load_goal_table(self.goals_file, self.cache.enabled) if self.goals_file else None
+        snapshot = ScoreSnapshot(tasks, weights or self._weights, goals)
+        self._file_keys = file_keys
+        return snapshot
+
+    async def _swap(self, weights: Optional[Dict[str, float]] = None) -> ScoreSnapshot:
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            self.snapshot = await asyncio.to_thread(self.build, weights)
+            self._weights = self.snapshot.weights
+            self.reloads += 1
+        return self.snapshot
+
+    def _check_sources(self) -> None:
+        """Start a background reload when a source file changed since the last build."""
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_SECONDS:
+            return
+        self._last_check = now
+        if self._reload_task is None or self._reload_task.done():
+            if self._stat_keys() != self._file_keys:
+                self._reload_task = asyncio.ensure_future(self._swap())
+                self._reload_task.add_done_callback(_log_reload_failure)
+
+    # Read methods
+
+    def rank(self, limit: int = DEFAULT_RANK_LIMIT, offset: int = 0) -> Dict[str, Any]:
+        if limit < 0 or offset < 0:
+            raise RpcError(INVALID_PARAMS, "limit and offset must be non-negative")
+        return self.snapshot.rank(limit, offset)
+
+    def distribution(self, parts: int = TWENTIETHS, method: str = 'largest_remainder',
+                     limit: int = DEFAULT_RANK_LIMIT, offset: int = 0) -> Dict[str, Any]:
+        if method not in APPORTION_METHODS:
+            raise RpcError(INVALID_PARAMS, f"Unknown apportionment method '{method}'")
+        if parts < 1 or limit < 0 or offset < 0:
+            raise RpcError(INVALID_PARAMS, "parts must be positive, limit and offset non-negative")
+        return self.snapshot.distribution(parts, method, limit, offset)
+
+    def breakdown(self, title: str) -> Dict[str, Any]:
+        if title not in self.snapshot.index:
+            raise RpcError(INVALID_PARAMS, f"Unknown task '{title}'")
+        return self.snapshot.breakdown(title)
+
+    def goals(self) -> List[Dict[str, Any]]:
+        return self.snapshot.goal_summary()
+
+    def goal(self, goal: str, k: int = 10) -> List[Dict[str, Any]]:
+        # goal is a key as listed by 'goals': the title, or 'title [n]' for a repeated title
+        graph = self.snapshot.goal_graph
+        if graph is None or goal not in graph.goal_index:
+            raise RpcError(INVALID_PARAMS, f"Unknown goal '{goal}' (use a key listed by 'goals')")
+        return [{'title': title, 'contribution': contribution, 'affinity': affinity, 'score': score}
+                for title, contribution, affinity, score in graph.top_tasks(goal, k)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'connections': self.connections,
+            'reloads': self.reloads,
+            'tasks': len(snapshot.rows),
+            'build_ms': snapshot.build_seconds * 1000,
+            'methods': self.stats.summary(),
+        }
+
+    def ping(self) -> Dict[str, Any]:
+        return {'ok': True}
+
+    # Write methods
+
+    async def set_weights(self, weights: Dict[str, float]) -> Dict[str, Any]:
+        if not isinstance(weights, dict):
+            raise RpcError(INVALID_PARAMS, "weights must be an object of criterion -> number")
+        unknown = set(weights) - set(CRITERIA)
+        if unknown:
+            raise RpcError(INVALID_PARAMS, f"Unknown criteria: {', '.join(sorted(unknown))}")
+        for key, value in weights.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise RpcError(INVALID_PARAMS, f"Weight for '{key}' must be a finite number, got {value!r}")
+        snapshot = await self._swap({**self._weights, **weights})
+        return {'weights': snapshot.weights, 'build_ms': snapshot.build_seconds * 1000}
+
+    async def reload(self) -> Dict[str, Any]:
+        try:
+            snapshot = await self._swap()
+        except ValueError as e:
+            raise RpcError(INTERNAL_ERROR, str(e)) from e
+        return {'tasks': len(snapshot.rows), 'build_ms': snapshot.build_seconds * 1000}
+
+    # Dispatch
+
+    async def handle(self, request: Any) -> Optional[bytes]:
+        """
+        Run one JSON-RPC request object and time it, response encoding included.
+
+        Args:
+            request (Any): Decoded request
+
+        Returns:
+            Optional[bytes]: Encoded response object, or None for a notification (no id)
+        """
+        started = time.perf_counter_ns()
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _encode(_error(None, INVALID_REQUEST, "Invalid request"))
+        method = request['method']
+        request_id = request.get('id')
+        params = request.get('params') or {}
+        handler = self.methods.get(method)
+        failed = False
+        encoded = None
+        try:
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Unknown method '{method}'")
+            # Only a mismatch between params and the method signature is INVALID_PARAMS;
+            # a TypeError raised inside the handler is an internal error
+            try:
+                if isinstance(params, list):
+                    bound = self.signatures[method].bind(*params)
+                elif isinstance(params, dict):
+                    bound = self.signatures[method].bind(**params)
+                else:
+                    raise TypeError("params must be an array or an object")
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e)) from e
+            _check_param_types(self.signatures[method], bound.arguments)
+            self._check_sources()
+            result = handler(*bound.args, **bound.kwargs)
+            if asyncio.iscoroutine(result):
+                result = await result
+            if 'id' in request:
+                encoded = _encode({'jsonrpc': '2.0', 'id': request_id, 'result': result})
+        except RpcError as e:
+            failed = True
+            encoded = _encode(_error(request_id, e.code, str(e)))
+        except Exception as e:
+            logger.exception("Request %s failed", method)
+            failed = True
+            encoded = _encode(_error(request_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}"))
+        finally:
+            self.stats.record(method if handler is not None else '<unknown>',
+                              time.perf_counter_ns() - started, failed)
+        return encoded if 'id' in request else None
+
+    async def handle_line(self, line: bytes) -> Optional[bytes]:
+        """
+        Answer one request line (a request object or a batch array).
+
+        Args:
+            line (bytes): Raw JSON line
+
+        Returns:
+            Optional[bytes]: Newline-terminated response, or None when nothing needs an answer
+        """
+        try:
+            request = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return _encode(_error(None, PARSE_ERROR, "Parse error")) + b'\n'
+        if isinstance(request, list):
+            if not request:
+                return _encode(_error(None, INVALID_REQUEST, "Empty batch")) + b'\n'
+            responses = [response for response in [await self.handle(item) for item in request] if response]
+            return b'[' + b','.join(responses) + b']\n' if responses else None
+        response = await self.handle(request)
+        return response + b'\n' if response is not None else None
+
+
+def _log_reload_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background reload failed: %s", task.exception())
+
+
+def _check_param_types(signature: inspect.Signature, arguments: Dict[str, Any]) -> None:
+    """Reject int/str params of the wrong JSON type before the handler compares or looks them up."""
+    for name, value in arguments.items():
+        annotation = signature.parameters[name].annotation
+        if annotation is int and (isinstance(value, bool) or not isinstance(value, int)):
+            raise RpcError(INVALID_PARAMS, f"'{name}' must be an integer, got {value!r}")
+        if annotation is str and not isinstance(value, str):
+            raise RpcError(INVALID_PARAMS, f"'{name}' must be a string, got {value!r}")
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def _encode(response: Any) -> bytes:
+    return json.dumps(response, separators=(',', ':')).encode('utf-8')
+
+
+async def _serve_stream(service: ScoringService, reader: asyncio.StreamReader, write, drain) -> None:
+    """Answer newline-delimited requests from one stream until it closes."""
+    service.connections += 1
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Line longer than MAX_LINE_BYTES; the stream can't be resynchronized
+                write(_encode(_error(None, PARSE_ERROR, "Request too long")) + b'\n')
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+            response = await service.handle_line(line)
+            if response is not None:
+                write(response)
+                await drain()
+    finally:
+        service.connections -= 1
+
+
+async def serve_socket(service: ScoringService, socket_path: Path) -> None:
+    """
+    Serve JSON-RPC over a Unix socket; every connection may send any number of request lines.
+
+    Args:
+        service (ScoringService): Service to expose
+        socket_path (Path): Socket file (replaced if stale)
+    """
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        try:
+            _, writer = await asyncio.open_unix_connection(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+        else:
+            writer.close()
+            raise RuntimeError(f"Scoring service already running on {socket_path}")
+
+    async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await _serve_stream(service, reader, writer.write, writer.drain)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(connection, str(socket_path), limit=MAX_LINE_BYTES)
+    print(f"Scoring service listening on {socket_path} ({len(service.snapshot.rows)} tasks, "
+          f"built in {service.snapshot.build_seconds * 1000:.1f} ms)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        socket_path.unlink(missing_ok=True)
+
+
+async def serve_stdio(service: ScoringService) -> None:
+    """
+    Serve JSON-RPC over stdin/stdout, one request per line, until stdin closes.
+
+    Args:
+        service (ScoringService): Service to expose
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    out = sys.stdout.buffer
+
+    def write(data: bytes) -> None:
+        out.write(data)
+        out.flush()
+
+    async def drain() -> None:
+        pass
+
+    await _serve_stream(service, reader, write, drain)
+
+
+async def call(socket_path: Path, method: str, params: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Send one request to a running service and return the response object.
+
+    Args:
+        socket_path (Path): Service socket
+        method (str): Method name
+        params (Optional[Any]): Params object or list
+
+    Returns:
+        Dict[str, Any]: JSON-RPC response
+    """
+    reader, writer = await asyncio.open_unix_connection(str(socket_path), limit=1 << 26)
+    try:
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': method}
+        if params is not None:
+            request['params'] = params
+        writer.write(_encode(request) + b'\n')
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def bench(socket_path: Path, requests: int = 10_000, concurrency: int = 8,
+                method: str = 'rank', params: Optional[Any] = None) -> Dict[str, float]:
+    """
+    Measure client-side round trips against a running service.
+
+    Args:
+        socket_path (Path): Service socket
+        requests (int): Total requests
+        concurrency (int): Connections sending at the same time
+        method (str): Method to call
+        params (Optional[Any]): Its params
+
+    Returns:
+        Dict[str, float]: requests, seconds, requests_per_second and p50/p99 round trip in microseconds
+    """
+    payload = {'jsonrpc': '2.0', 'id': 1, 'method': method}
+    if params is not None:
+        payload['params'] = params
+    line = _encode(payload) + b'\n'
+    latencies: List[int] = []
+
+    async def client(count: int) -> None:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path), limit=1 << 26)
+        try:
+            for _ in range(count):
+                started = time.perf_counter_ns()
+                writer.write(line)
+                await writer.drain()
+                await reader.readline()
+                latencies.append(time.perf_counter_ns() - started)
+        finally:
+            writer.close()
+
+    shares = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client(share) for share in shares if share))
+    seconds = time.perf_counter() - started
+    p50, p99 = np.percentile(np.array(latencies, dtype=np.float64) / 1000.0, (50, 99)).tolist()
+    return {'requests': len(latencies), 'seconds': seconds, 'requests_per_second': len(latencies) / seconds,
+            'p50_us': p50, 'p99_us': p99}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running JSON-RPC task scoring service (stdio or Unix socket)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="Load, score and serve tasks")
+    serve_parser.add_argument('tasks_file', nargs='?', default='example_task.yaml', help="Task YAML file")
+    serve_parser.add_argument('--goals', default='Goal_Nodes.yaml', help="Goal YAML file ('' to skip goals)")
+    serve_parser.add_argument('--stdio', action='store_true', help="Serve on stdin/stdout instead of a socket")
+
+    call_parser = subparsers.add_parser('call', help="Send one request to a running service")
+    call_parser.add_argument('method', help="Method, e.g. rank, distribution, breakdown, stats")
+    call_parser.add_argument('params', nargs='?', default=None, help="Params as JSON, e.g. '{\"limit\": 5}'")
+
+    bench_parser = subparsers.add_parser('bench', help="Measure round-trip latency against a running service")
+    bench_parser.add_argument('--requests', type=int, default=10_000, help="Total requests")
+    bench_parser.add_argument('--concurrency', type=int, default=8, help="Concurrent connections")
+    bench_parser.add_argument('--method', default='rank', help="Method to call")
+    bench_parser.add_argument('--params', default=None, help="Params as JSON")
+
+    for sub in (serve_parser, call_parser, bench_parser):
+        sub.add_argument('--socket', default=str(DEFAULT_SOCKET), help="Unix socket path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    try:
+        if args.command == 'serve':
+            if not os.path.exists(args.tasks_file):
+                print(f"Error: Task file '{args.tasks_file}' not found", file=sys.stderr)
+                sys.exit(1)
+            if args.goals and not os.path.exists(args.goals):
+                print(f"Goal file {args.goals} not found; serving without goals", file=sys.stderr)
+                args.goals = None
+            service = ScoringService(args.tasks_file, args.goals or None)
+            service.snapshot = service.build()
+            asyncio.run(serve_stdio(service) if args.stdio else serve_socket(service, Path(args.socket)))
+        elif args.command == 'call':
+            params = json.loads(args.params) if args.params else None
+            print(json.dumps(asyncio.run(call(Path(args.socket), args.method, params)), indent=2))
+        else:
+            params = json.loads(args.params) if args.params else None
+            result = asyncio.run(bench(Path(args.socket), args.requests, args.concurrency, args.method, params))
+            print(f"{result['requests']:,} requests in {result['seconds']:.2f}s "
+                  f"({result['requests_per_second']:,.0f}/s), round trip p50 {result['p50_us']:.0f} µs, "
+                  f"p99 {result['p99_us']:.0f} µs")
+    except KeyboardInterrupt:
+        pass
+    except (OSError, RuntimeError, json.JSONDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import os
+import re
+from typing import Dict, List, Iterator
+
+import numpy as np
+
+from task_table import DISTRIBUTION_KEYS
+
+# Named sizes accepted wherever a task count is expected
+SIZE_PRESETS = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Tasks generated (and formatted) per vectorized batch
+CHUNK_SIZE = 10_000
+
+VERBS = ('Build', 'Draft', 'Review', 'Refactor', 'Plan', 'Research', 'Finish', 'Organize',
+         'Practice', 'Publish', 'Prepare', 'Outline', 'Record', 'Design', 'Study', 'Clean Up')
+SUBJECTS = ('Class Project', 'Portfolio Site', 'Budget', 'Research Notes', 'Workout Plan',
+            'Reading List', 'Video Script', 'Garden Beds', 'Paper Draft', 'Tax Documents',
+            'Language Lessons', 'Side Project', 'Travel Itinerary', 'Meal Plan', 'Job Application',
+            'Photo Archive', 'Investment Review', 'Meditation Routine', 'Home Network', 'Newsletter')
+CRITERIA_TEXT = ('Submitted and graded.', 'Reviewed and signed off.', 'Published publicly.',
+                 'Checklist fully completed.', 'Results written up and shared.', 'Running without issues for a week.')
+CONFIDENCE = ('High', 'Medium', 'Low')
+
+TASK_TEMPLATE = '''  - title: "{title}"
+    description: "{verb} the {subject_lower} (synthetic task {number})."
+
+    coreAlignment:
+      percentage: {percentage}
+      type: "{core_type}"
+
+    magnitude:
+      effortComplexity: {effort}
+      goalImpact: {impact}
+
+    distribution:
+{distribution}
+    organization:
+      value: {organization}
+
+    timeframe:
+      dueInDays: {due}
+      confidence: "{confidence}"
+
+    criteria:
+      completionCriteria: "{criteria}"
+
+'''
+
+GOAL_TEMPLATE = '''  - title: "{title}"
+    description: "{verb} the {subject_lower} at scale (synthetic goal {number})."
+
+    coreAlignment:
+      percentage: {percentage}
+      type: "{core_type}"
+
+    magnitude:
+      effortComplexity: {effort}
+      personalImpact: {impact}
+      externalImpact: {external}
+
+    distribution:
+{distribution}
+    timeframe:
+      expected: "{low} — {high} Years"
+      confidence: "{confidence}"
+
+    criteria:
+      completionCriteria: "{criteria}"
+
+'''
+
+
+def parse_size(text: str) -> int:
+    """
+    Turn a size such as '1k', '100k', '1m' or '2500' into a task count.
+
+    Args:
+        text (str): Preset name or plain/suffixed number
+
+    Returns:
+        int: Number of tasks
+    """
+    text = text.strip().lower().replace('_', '')
+    if text in SIZE_PRESETS:
+        return SIZE_PRESETS[text]
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([km]?)', text)
+    if not match:
+        raise ValueError(f"Invalid size '{text}'")
+    return int(float(match.group(1)) * {'': 1, 'k': 1_000, 'm': 1_000_000}[match.group(2)])
+
+
+def _integers(rng: np.random.Generator, mean: float, spread: float, low: int, high: int, count: int) -> np.ndarray:
+    """Rounded normal samples clipped to [low, high]."""
+    return np.clip(np.rint(rng.normal(mean, spread, count)), low, high).astype(np.int64)
+
+
+def _core_alignment(rng: np.random.Generator, count: int) -> Dict[str, np.ndarray]:
+    """Core tasks sit at 90-100%, auxiliary ones spread over 30-90% in steps of 5."""
+    core = rng.random(count) < 0.35
+    auxiliary = np.clip(np.rint(rng.normal(75, 12, count) / 5) * 5, 30, 90)
+    percentage = np.where(core, rng.choice([90, 95, 100], count, p=[0.3, 0.3, 0.4]), auxiliary)
+    return {'percentage': percentage.astype(np.int64), 'core': core}
+
+
+def _distribution(rng: np.random.Generator, count: int) -> np.ndarray:
+    """
+    Life-area weights: one to three primary areas at 3-5, the odd secondary area at 1-2.
+
+    Returns:
+        np.ndarray: (count, 6) matrix in DISTRIBUTION_KEYS order
+    """
+    areas = len(DISTRIBUTION_KEYS)
+    values = np.where(rng.random((count, areas)) < 0.15, rng.integers(1, 3, (count, areas)), 0)
+    primaries = rng.choice([1, 2, 3], count, p=[0.55, 0.3, 0.15])
+    # Rank random keys per row; the lowest `primaries` ranks become primary areas
+    ranks = np.argsort(np.argsort(rng.random((count, areas)), axis=1), axis=1)
+    primary = ranks < primaries[:, None]
+    return np.where(primary, rng.integers(3, 6, (count, areas)), values)
+
+
+def _format_distribution(row: List[int]) -> str:
+    return ''.join(f"      {key}: {value}\n" for key, value in zip(DISTRIBUTION_KEYS, row))
+
+
+def _due_in_days(rng: np.random.Generator, count: int) -> np.ndarray:
+    """A quarter of tasks have no deadline (0); the rest are log-normal around two weeks."""
+    due = np.clip(np.rint(rng.lognormal(np.log(14), 1.0, count)), 1, 365).astype(np.int64)
+    due[rng.random(count) < 0.25] = 0
+    return due
+
+
+def iter_task_yaml(count: int, seed: int = 0, goals: bool = False,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield a synthetic task (or endGoals) YAML document in text chunks.
+
+    Values are drawn in vectorized batches so the output never has to be held
+    in memory; the same seed always produces the same file.
+
+    Args:
+        count (int): Number of tasks or goals
+        seed (int): Random seed
+        goals (bool): Write Goal_Nodes-style endGoals instead of tasks
+        chunk_size (int): Entries generated per batch
+
+    Yields:
+        str: Consecutive pieces of the YAML document
+    """
+    rng = np.random.default_rng(seed)
+    template = GOAL_TEMPLATE if goals else TASK_TEMPLATE
+    yield "endGoals:\n" if goals else "tasks:\n"
+
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        verbs = rng.integers(0, len(VERBS), size).tolist()
+        subjects = rng.integers(0, len(SUBJECTS), size).tolist()
+        alignment = _core_alignment(rng, size)
+        percentage = alignment['percentage'].tolist()
+        core = alignment['core'].tolist()
+        effort = _integers(rng, 6, 2, 1, 10, size).tolist()
+        impact = _integers(rng, 4, 2, 1, 10, size).tolist()
+        distribution = _distribution(rng, size).tolist()
+        confidence = rng.choice(len(CONFIDENCE), size, p=[0.5, 0.35, 0.15]).tolist()
+        criteria = rng.integers(0, len(CRITERIA_TEXT), size).tolist()
+        if goals:
+            external = _integers(rng, 4, 2, 0, 10, size).tolist()
+            low = rng.integers(1, 11, size).tolist()
+            span = rng.integers(1, 6, size).tolist()
+        else:
+            organization = np.where(rng.random(size) < 0.6, 0, rng.integers(1, 6, size)).tolist()
+            due = _due_in_days(rng, size).tolist()
+
+        parts = []
+        for i in range(size):
+            verb = VERBS[verbs[i]]
+            subject = SUBJECTS[subjects[i]]
+            fields = {
+                'title': f"{verb} {subject} #{start + i + 1}",
+                'verb': verb,
+                'subject_lower': subject.lower(),
+                'number': start + i + 1,
+                'percentage': percentage[i],
+                'core_type': 'Core' if core[i] else 'Auxillary',
+                'effort': effort[i],
+                'impact': impact[i],
+                'distribution': _format_distribution(distribution[i]),
+                'confidence': CONFIDENCE[confidence[i]],
+                'criteria': CRITERIA_TEXT[criteria[i]],
+            }
+            if goals:
+                fields.update(external=external[i], low=low[i], high=low[i] + span[i])
+            else:
+                fields.update(organization=organization[i], due=due[i])
+            parts.append(template.format(**fields))
+        yield ''.join(parts)
+
+
+def write_task_yaml(path: str, count: int, seed: int = 0, goals: bool = False) -> int:
+    """
+    Write a synthetic task or goal YAML file.
+
+    Args:
+        path (str): Output file
+        count (int): Number of tasks or goals
+        seed (int): Random seed
+        goals (bool): Write endGoals instead of tasks
+
+    Returns:
+        int: Bytes written
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        for chunk in iter_task_yaml(count, seed, goals):
+            file.write(chunk)
+    return os.path.getsize(path)
+
+
+def dataset_path(out_dir: str, count: int, seed: int = 0, goals: bool = False) -> str:
+    """
+    Conventional file name for a generated dataset, e.g. bench_data/tasks_100000_s0.yaml.
+
+    Args:
+        out_dir (str): Directory holding generated files
+        count (int): Number of tasks or goals
+        seed (int): Random seed
+        goals (bool): Goal file rather than task file
+
+    Returns:
+        str: Path of the dataset
+    """
+    return os.path.join(out_dir, f"{'goals' if goals else 'tasks'}_{count}_s{seed}.yaml")
+
+
+def ensure_dataset(out_dir: str, count: int, seed: int = 0, goals: bool = False) -> str:
+    """
+    Return the path of a generated dataset, writing it first if it doesn't exist.
+
+    Args:
+        out_dir (str): Directory holding generated files
+        count (int): Number of tasks or goals
+        seed (int): Random seed
+        goals (bool): Goal file rather than task file
+
+    Returns:
+        str: Path of the dataset
+    """
+    path = dataset_path(out_dir, count, seed, goals)
+    if not os.path.exists(path):
+        write_task_yaml(path, count, seed, goals)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic task and goal YAML files")
+    parser.add_argument('sizes', nargs='*', default=['1k', '100k'], help="Task counts, e.g. 1k 100k 1m")
+    parser.add_argument('--goals', type=str, default=None, help="Also write an endGoals file of this size")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--out-dir', default='bench_data', help="Output directory")
+    parser.add_argument('--output', default=None, help="Exact output file (single size only)")
+    args = parser.parse_args()
+
+    jobs = [(parse_size(size), False) for size in args.sizes]
+    if args.goals:
+        jobs.append((parse_size(args.goals), True))
+    if args.output and len(jobs) != 1:
+        parser.error("--output needs exactly one size")
+
+    for count, goals in jobs:
+        path = args.output or dataset_path(args.out_dir, count, args.seed, goals)
+        written = write_task_yaml(path, count, args.seed, goals)
+        print(f"Wrote {count:,} {'goals' if goals else 'tasks'} to {path} ({written / 1024 / 1024:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import argparse
+import csv
+import io
+import json
+import sys
+from typing import Dict, List, Any, Iterator, Optional, TextIO
+
+import numpy as np
+
+from apportion import TWENTIETHS
+from instrumentation import count, stage
+from task_parser import (
+    CRITERIA, EXAMPLE_WEIGHTS, Tasks, criteria_matrix, distribute_scores, load_task_table, score_components,
+)
+from task_stream import iter_task_tables
+from task_table import TaskTable
+
+TEXT_FORMATS = ('jsonl', 'csv')
+COLUMNAR_FORMATS = ('npz', 'parquet')
+FORMATS = TEXT_FORMATS + COLUMNAR_FORMATS
+
+# Weighted per-criterion contributions, in CRITERIA order
+COMPONENT_COLUMNS = ('core_component', 'effort_component', 'organization_component', 'urgency_component')
+
+# Rows formatted per write for the text formats; bounds memory on large exports
+CHUNK_ROWS = 50_000
+
+Columns = Dict[str, Any]
+
+
+def _weighted_components(tasks: Tasks, weights: Dict[str, float]) -> tuple:
+    """Task names, criteria matrix, weighted components and scores (summed like score_tasks_batch)."""
+    names, matrix = criteria_matrix(tasks)
+    components = score_components(matrix)
+    scores = np.zeros(len(names), dtype=np.float64)
+    for column, key in enumerate(CRITERIA):
+        components[:, column] *= weights.get(key, 1.0)
+        scores += components[:, column]
+    return names, matrix, components, scores
+
+
+def score_columns(tasks: Tasks, weights: Dict[str, float], ranked: bool = True) -> Columns:
+    """
+    Build export columns for every task: criteria, weighted components and score.
+
+    Args:
+        tasks (Tasks): Dictionary of tasks and criteria, or a TaskTable
+        weights (Dict[str, float]): Weights for each criterion
+        ranked (bool): Sort by score (highest first, ties in input order) and add a rank column;
+            otherwise keep input order
+
+    Returns:
+        Columns: Column name -> list or array, all of the same length
+    """
+    names, matrix, components, scores = _weighted_components(tasks, weights)
+    ids = tasks.ids if isinstance(tasks, TaskTable) else np.arange(len(names), dtype=np.int64)
+
+    columns: Columns = {}
+    if ranked:
+        with stage('sort'):
+            order = np.argsort(-scores, kind='stable')
+        columns['rank'] = np.arange(1, len(names) + 1, dtype=np.int64)
+        names = [names[i] for i in order.tolist()]
+        ids, matrix, components, scores = ids[order], matrix[order], components[order], scores[order]
+
+    columns['id'] = ids
+    columns['title'] = names
+    columns['score'] = scores
+    for column, key in enumerate(CRITERIA):
+        values = matrix[:, column]
+        # Criteria are whole numbers in practice; keep them integral in the output when they are
+        columns[key] = values.astype(np.int64) if np.array_equal(values, np.floor(values)) else values
+    for column, name in enumerate(COMPONENT_COLUMNS):
+        columns[name] = components[:, column]
+    return columns
+
+
+def distribution_columns(distribution: List[tuple]) -> Columns:
+    """
+    Build export columns from distribute_scores output.
+
+    Args:
+        distribution (List[tuple]): List of (task_name, score, parts, percentage) tuples
+
+    Returns:
+        Columns: title, score, parts and percentage columns
+    """
+    titles, scores, parts, percentages = zip(*distribution) if distribution else ((), (), (), ())
+    return {
+        'title': list(titles),
+        'score': np.array(scores, dtype=np.float64),
+        'parts': np.array(parts, dtype=np.int64),
+        'percentage': np.array(percentages, dtype=np.float64),
+    }
+
+
+def _plain_columns(columns: Columns, start: int, stop: int) -> List[list]:
+    """Slice every column to plain Python lists."""
+    return [values[start:stop].tolist() if isinstance(values, np.ndarray) else values[start:stop]
+            for values in columns.values()]
+
+
+def _length(columns: Columns) -> int:
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+def iter_jsonl(columns: Columns, chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """
+    Format columns as JSON Lines, one text block per chunk of rows.
+
+    Args:
+        columns (Columns): Export columns
+        chunk_rows (int): Rows per block
+
+    Yields:
+        str: Newline-terminated JSON objects
+    """
+    names = list(columns)
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    for start in range(0, _length(columns), chunk_rows):
+        rows = zip(*_plain_columns(columns, start, start + chunk_rows))
+        yield ''.join(dumps(dict(zip(names, row))) + '\n' for row in rows)
+
+
+def iter_csv(columns: Columns, chunk_rows: int = CHUNK_ROWS, header: bool = True) -> Iterator[str]:
+    """
+    Format columns as CSV, one text block per chunk of rows.
+
+    Args:
+        columns (Columns): Export columns
+        chunk_rows (int): Rows per block
+        header (bool): Start with a header row
+
+    Yields:
+        str: CSV text
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if header:
+        writer.writerow(columns)
+    length = _length(columns)
+    for start in range(0, length, chunk_rows):
+        writer.writerows(zip(*_plain_columns(columns, start, start + chunk_rows)))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if not length and header:
+        yield buffer.getvalue()
+
+
+def write_text(columns: Columns, file: TextIO, fmt: str = 'jsonl', chunk_rows: int = CHUNK_ROWS,
+               header: bool = True) -> int:
+    """
+    Write columns to a text stream as JSON Lines or CSV, one write per chunk.
+
+    Args:
+        columns (Columns): Export columns
+        file (TextIO): Destination stream
+        fmt (str): 'jsonl' or 'csv'
+        chunk_rows (int): Rows per write
+        header (bool): Write the CSV header row
+
+    Returns:
+        int: Rows written
+    """
+    if fmt not in TEXT_FORMATS:
+        raise ValueError(f"Unknown text format '{fmt}' (expected one of {', '.join(TEXT_FORMATS)})")
+    with stage('render'):
+        blocks = iter_jsonl(columns, chunk_rows) if fmt == 'jsonl' else iter_csv(columns, chunk_rows, header)
+        for block in blocks:
+            file.write(block)
+    rows = _length(columns)
+    count('rows_exported', rows)
+    return rows
+
+
+def write_columnar(columns: Columns, path: str, fmt: str = 'npz') -> int:
+    """
+    Write columns to a columnar file: NumPy .npz, or Parquet when pyarrow is installed.
+
+    Args:
+        columns (Columns): Export columns
+        path (str): Output file
+        fmt (str): 'npz' or 'parquet'
+
+    Returns:
+        int: Rows written
+    """
+    with stage('render'):
+        if fmt == 'npz':
+            arrays = {name: np.asarray(values, dtype=str if name == 'title' else None)
+                      for name, values in columns.items()}
+            np.savez(path, **arrays)
+        elif fmt == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError as e:
+                raise ImportError("Parquet export needs pyarrow (pip install pyarrow); use --format npz instead") from e
+            pyarrow.parquet.write_table(pyarrow.table(dict(columns)), path)
+        else:
+            raise ValueError(f"Unknown columnar format '{fmt}' (expected one of {', '.join(COLUMNAR_FORMATS)})")
+    rows = _length(columns)
+    count('rows_exported', rows)
+    return rows
+
+
+def export_columns(columns: Columns, output: Optional[str], fmt: str = 'jsonl') -> int:
+    """
+    Write columns in any supported format to a file, or to stdout for text formats.
+
+    Args:
+        columns (Columns): Export columns
+        output (Optional[str]): Output path; None or '-' for stdout
+        fmt (str): One of FORMATS
+
+    Returns:
+        int: Rows written
+    """
+    if fmt in COLUMNAR_FORMATS:
+        if output in (None, '-'):
+            raise ValueError(f"'{fmt}' output needs a file path")
+        return write_columnar(columns, output, fmt)
+    if output in (None, '-'):
+        return write_text(columns, sys.stdout, fmt)
+    with open(output, 'w', encoding='utf-8', newline='') as file:
+        return write_text(columns, file, fmt)
+
+
+def stream_scores(yaml_file_path: str, weights: Dict[str, float], file: TextIO, fmt: str = 'jsonl',
+                  chunk_size: int = 10000, section: str = 'tasks') -> int:
+    """
+    Score a task file chunk by chunk and write each chunk as soon as it is scored.
+
+    Rows stay in file order (no rank column), so memory is bounded by one chunk.
+
+    Args:
+        yaml_file_path (str): Path to the YAML file containing tasks
+        weights (Dict[str, float]): Weights for each criterion
+        file (TextIO): Destination stream
+        fmt (str): 'jsonl' or 'csv'
+        chunk_size (int): Tasks parsed, scored and written per chunk
+        section (str): Top-level key holding the task list
+
+    Returns:
+        int: Rows written
+    """
+    rows = 0
+    for table in iter_task_tables(yaml_file_path, chunk_size, section):
+        rows += write_text(score_columns(table, weights, ranked=False), file, fmt, chunk_size, header=rows == 0)
+        file.flush()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export task rankings, scores and distributions")
+    parser.add_argument('yaml_file', nargs='?', default='example_task.yaml', help="Task YAML file")
+    parser.add_argument('--what', choices=['ranking', 'scores', 'distribution'], default='ranking',
+                        help="Ranked scores, scores in file order, or the parts distribution")
+    parser.add_argument('--format', choices=FORMATS, default='jsonl', help="Output format")
+    parser.add_argument('--output', '-o', default='-', help="Output file ('-' for stdout)")
+    parser.add_argument('--parts', type=int, default=TWENTIETHS, help="Parts to distribute")
+    parser.add_argument('--stream', action='store_true', help="Parse and write chunk by chunk (scores only)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Tasks per streamed chunk")
+    args = parser.parse_args()
+
+    weights = EXAMPLE_WEIGHTS
+    try:
+        if args.stream:
+            if args.what != 'scores' or args.format not in TEXT_FORMATS:
+                parser.error("--stream supports --what scores with jsonl or csv output")
+            if args.output == '-':
+                rows = stream_scores(args.yaml_file, weights, sys.stdout, args.format, args.chunk_size)
+            else:
+                with open(args.output, 'w', encoding='utf-8', newline='') as file:
+                    rows = stream_scores(args.yaml_file, weights, file, args.format, args.chunk_size)
+        else:
+            tasks = load_task_table(args.yaml_file)
+            if args.what == 'distribution':
+                columns = distribution_columns(distribute_scores(tasks, args.parts, weights))
+            else:
+                columns = score_columns(tasks, weights, ranked=args.what == 'ranking')
+            rows = export_columns(columns, args.output, args.format)
+    except (ImportError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output != '-':
+        print(f"Exported {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,69 @@
 import yaml
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
+import logging
 import math
+import numpy as np
+from apportion import TWENTIETHS, apportion
+from instrumentation import count, stage
+from task_table import TaskTable, dict_nbytes
+
+logger = logging.getLogger(__name__)
+
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Tasks as either the legacy {title: criteria} dict or a columnar TaskTable
+Tasks = Union[Dict[str, Dict[str, Any]], TaskTable]
+
+# Criteria read from each task, in the column order used by the batch scorer
+CRITERIA = ('corePercentage', 'effortComplexity', 'organizationValue', 'dueInDays')
+
+# Hand-tuned weights used by the example run and as the default baseline elsewhere
+EXAMPLE_WEIGHTS = {
+    'corePercentage': 1.2,      # Prioritize core alignment
+    'effortComplexity': 2.5,    # Strongly prefer easier tasks
+    'organizationValue': 1.1,   # Less emphasis on organization
+    'dueInDays': 3.5            # Moderate urgency consideration
+}
+
+# Urgency curve: base + scale * exp(-alpha * dueInDays), 0 when there is no due date
+URGENCY_BASE = 1
+URGENCY_SCALE = 6.0
+URGENCY_ALPHA = 0.1
+
+# Largest dominance grid (distinct values of the three most varied criteria, multiplied) skyline_layers builds
+SKYLINE_MAX_CELLS = 1 << 24
+
+def extract_criteria(task: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract the title and scoring criteria from one YAML task mapping.
+    
+    Args:
+        task (Dict[str, Any]): Task mapping as loaded from YAML
+        
+    Returns:
+        Tuple[str, Dict[str, Any]]: Task title and its criteria dictionary
+    """
+    task_title = task.get('title', 'Unknown Task')
+    
+    # Extract corePercentage from coreAlignment
+    core_percentage = task.get('coreAlignment', {}).get('percentage', 0)
+    
+    # Extract effortComplexity from magnitude
+    effort_complexity = task.get('magnitude', {}).get('effortComplexity', 0)
+    
+    # Extract organization value
+    organization_value = task.get('organization', {}).get('value', 0)
+    
+    # Extract dueInDays from timeframe
+    due_in_days = task.get('timeframe', {}).get('dueInDays', 0)
+    
+    return task_title, {
+        'corePercentage': core_percentage,
+        'effortComplexity': effort_complexity,
+        'organizationValue': organization_value,
+        'dueInDays': due_in_days
+    }
 
 def parse_tasks_from_yaml(yaml_file_path: str) -> Dict[str, Dict[str, Any]]:
     """
@@ -21,8 +84,8 @@ def parse_tasks_from_yaml(yaml_file_path: str) -> Dict[str, Dict[str, Any]]:
         }
     """
     try:
-        with open(yaml_file_path, 'r', encoding='utf-8') as file:
-            data = yaml.safe_load(file)
+        with stage('parse'), open(yaml_file_path, 'r', encoding='utf-8') as file:
+            data = yaml.load(file, Loader=YAML_LOADER)
         
         if not data or 'tasks' not in data:
             print("No tasks found in YAML file")
@@ -30,27 +93,11 @@ def parse_tasks_from_yaml(yaml_file_path: str) -> Dict[str, Dict[str, Any]]:
         
         tasks_dict = {}
         
-        for task in data['tasks']:
-            task_title = task.get('title', 'Unknown Task')
-            
-            # Extract corePercentage from coreAlignment
-            core_percentage = task.get('coreAlignment', {}).get('percentage', 0)
-            
-            # Extract effortComplexity from magnitude
-            effort_complexity = task.get('magnitude', {}).get('effortComplexity', 0)
-            
-            # Extract organization value
-            organization_value = task.get('organization', {}).get('value', 0)
-            
-            # Extract dueInDays from timeframe
-            due_in_days = task.get('timeframe', {}).get('dueInDays', 0)
-            
-            tasks_dict[task_title] = {
-                'corePercentage': core_percentage,
-                'effortComplexity': effort_complexity,
-                'organizationValue': organization_value,
-                'dueInDays': due_in_days
-            }
+        with stage('normalize'):
+            for task in data['tasks']:
+                task_title, criteria = extract_criteria(task)
+                tasks_dict[task_title] = criteria
+        count('tasks_parsed', len(data['tasks']))
         
         return tasks_dict
         
@@ -64,36 +111,95 @@ def parse_tasks_from_yaml(yaml_file_path: str) -> Dict[str, Dict[str, Any]]:
         print(f"Unexpected error: {e}")
         return {}
 
-def print_tasks_summary(tasks_dict: Dict[str, Dict[str, Any]]) -> None:
+def load_task_table(yaml_file_path: str, section: str = 'tasks') -> TaskTable:
+    """
+    Parse tasks from a YAML file into a columnar TaskTable.
+    
+    Unlike parse_tasks_from_yaml, every field of each task is kept and tasks
+    sharing a title are not merged.
+    
+    Args:
+        yaml_file_path (str): Path to the YAML file containing tasks
+        section (str): Top-level key holding the task list ('endGoals' for goal files)
+        
+    Returns:
+        TaskTable: Table of all tasks (empty on error)
+    """
+    try:
+        with stage('parse'), open(yaml_file_path, 'r', encoding='utf-8') as file:
+            data = yaml.load(file, Loader=YAML_LOADER)
+        
+        if not data or section not in data:
+            print(f"No {section} found in YAML file")
+            return TaskTable.empty()
+        
+        with stage('normalize'):
+            table = TaskTable.from_records(data[section] or [])
+        count('tasks_parsed', len(table))
+        return table
+        
+    except FileNotFoundError:
+        print(f"Error: File '{yaml_file_path}' not found")
+        return TaskTable.empty()
+    except yaml.YAMLError as e:
+        print(f"Error parsing YAML file: {e}")
+        return TaskTable.empty()
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return TaskTable.empty()
+
+def print_memory_report(tasks: TaskTable) -> None:
+    """
+    Print the memory used per task by a TaskTable, and for the title and four
+    criteria compare it like for like with the equivalent dict-of-dicts.
+    
+    Args:
+        tasks (TaskTable): Table to measure
+    """
+    report = tasks.memory_report()
+    legacy = {title: {key: row[key] for key in CRITERIA} for title, row in tasks.items()}
+    legacy_bytes = dict_nbytes(legacy)
+    
+    print(f"\nMemory: {report['bytes']} bytes for {report['tasks']} tasks "
+          f"({report['bytes_per_task']:.1f} bytes/task, all fields)")
+    if legacy:
+        print(f"  Title + 4 criteria: table {report['criteria_bytes_per_task']:.1f} bytes/task, "
+              f"dict-of-dicts {legacy_bytes / len(legacy):.1f} bytes/task")
+
+def print_tasks_summary(tasks_dict: Tasks) -> None:
     """
     Print a formatted summary of all tasks and their criteria.
     
     Args:
-        tasks_dict (Dict[str, Dict[str, Any]]): Dictionary of tasks and criteria
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
     """
     if not tasks_dict:
         print("No tasks to display")
         return
     
-    print(f"\n{'='*80}")
-    print(f"{'TASK SUMMARY':^80}")
-    print(f"{'='*80}")
-    
-    for task_name, criteria in tasks_dict.items():
-        print(f"\nTask: {task_name}")
-        print(f"  Core Alignment: {criteria['corePercentage']}%")
-        print(f"  Effort Complexity: {criteria['effortComplexity']}")
-        print(f"  Organization Value: {criteria['organizationValue']}")
-        print(f"  Due In: {criteria['dueInDays']} days")
-        print("-" * 60)
+    with stage('render'):
+        # Lines are buffered and written once; per-line print() dominates on large files
+        lines = [f"\n{'='*80}", f"{'TASK SUMMARY':^80}", f"{'='*80}"]
+        
+        for task_name, criteria in tasks_dict.items():
+            lines.append(f"\nTask: {task_name}")
+            lines.append(f"  Core Alignment: {criteria['corePercentage']}%")
+            lines.append(f"  Effort Complexity: {criteria['effortComplexity']}")
+            lines.append(f"  Organization Value: {criteria['organizationValue']}")
+            lines.append(f"  Due In: {criteria['dueInDays']} days")
+            lines.append("-" * 60)
+        
+        print('\n'.join(lines))
+        count('lines_rendered', len(lines))
 
-def calculate_task_score(criteria: Dict[str, Any], weights: Dict[str, float]) -> float:
+def calculate_task_score(criteria: Dict[str, Any], weights: Dict[str, float], debug: bool = False) -> float:
     """
     Calculate a weighted linear score for a task based on its criteria.
     
     Args:
         criteria (Dict[str, Any]): Task criteria dictionary
         weights (Dict[str, float]): Weights for each criterion
+        debug (bool): Log the per-criterion breakdown at INFO instead of DEBUG level
         
     Returns:
         float: Weighted score for the task
@@ -121,9 +227,9 @@ def calculate_task_score(criteria: Dict[str, Any], weights: Dict[str, float]) ->
     # Convert to 0-1 scale where 1 is most urgent (0 days)
     # Normalize so that lower dueInDays gives higher score, using inverse (1 / (1 + dueInDays))
     # But tasks with no due date (0 days) should be pushed back, not prioritized
-    base = 1
-    scale = 6.0
-    alpha = 0.1
+    base = URGENCY_BASE
+    scale = URGENCY_SCALE
+    alpha = URGENCY_ALPHA
     if criteria['dueInDays'] == 0:
         urgency_score = 0.0  # No due date = lowest urgency priority
     else:
@@ -132,53 +238,215 @@ def calculate_task_score(criteria: Dict[str, Any], weights: Dict[str, float]) ->
     urgency_weighted = urgency_score * weights.get('dueInDays', 1.0)
     score += urgency_weighted
     
-    # Debug printing
-    print(f"  DEBUG - Task: {criteria.get('title', 'Unknown')}")
-    print(f"    Core: {criteria['corePercentage']}% -> {core_score:.3f} * {weights.get('corePercentage', 1.0):.1f} = {core_weighted:.3f}")
-    print(f"    Effort: {criteria['effortComplexity']} -> {effort_score:.3f} * {weights.get('effortComplexity', 1.0):.1f} = {effort_weighted:.3f}")
-    print(f"    Org: {criteria['organizationValue']} -> {org_score:.3f} * {weights.get('organizationValue', 1.0):.1f} = {org_weighted:.3f}")
-    
-    print(f"    Due: {criteria['dueInDays']} days -> {urgency_score:.3f} * {weights.get('dueInDays', 1.0):.1f} = {urgency_weighted:.3f}")
-    if criteria['dueInDays'] > 0:
-        print(f"      (Equation: {base:.1f} + {scale:.1f} * exp(-{alpha:.1f} * {criteria['dueInDays']}) = {base:.1f} + {scale:.1f} * {math.exp(-alpha * criteria['dueInDays']):.3f} = {urgency_score:.3f})")
-    else:
-        print(f"      (No due date = 0.0)")
-    print(f"    Total Score: {score:.3f}")
-    print()
+    # Score breakdown; the level check keeps this free when the level is disabled
+    level = logging.INFO if debug else logging.DEBUG
+    if logger.isEnabledFor(level):
+        if criteria['dueInDays'] > 0:
+            equation = f"Equation: {base:.1f} + {scale:.1f} * exp(-{alpha:.1f} * {criteria['dueInDays']}) = {base:.1f} + {scale:.1f} * {math.exp(-alpha * criteria['dueInDays']):.3f} = {urgency_score:.3f}"
+        else:
+            equation = "No due date = 0.0"
+        logger.log(
+            level,
+            "Task: %s\n"
+            "    Core: %s%% -> %.3f * %.1f = %.3f\n"
+            "    Effort: %s -> %.3f * %.1f = %.3f\n"
+            "    Org: %s -> %.3f * %.1f = %.3f\n"
+            "    Due: %s days -> %.3f * %.1f = %.3f\n"
+            "      (%s)\n"
+            "    Total Score: %.3f",
+            criteria.get('title', 'Unknown'),
+            criteria['corePercentage'], core_score, weights.get('corePercentage', 1.0), core_weighted,
+            criteria['effortComplexity'], effort_score, weights.get('effortComplexity', 1.0), effort_weighted,
+            criteria['organizationValue'], org_score, weights.get('organizationValue', 1.0), org_weighted,
+            criteria['dueInDays'], urgency_score, weights.get('dueInDays', 1.0), urgency_weighted,
+            equation, score,
+        )
     
     return score
 
-def distribute_scores_to_20ths(task_scores: List[tuple]) -> List[tuple]:
+def criteria_matrix(tasks_dict: Tasks) -> Tuple[List[str], np.ndarray]:
     """
-    Distribute task scores into 20 equal parts based on their relative scores.
+    Load task criteria into a float64 matrix with one column per entry of CRITERIA.
     
     Args:
-        task_scores (List[tuple]): List of (task_name, score) tuples
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
         
     Returns:
-        List[tuple]: List of (task_name, score, parts_of_20, percentage) tuples
+        Tuple[List[str], np.ndarray]: Task names and an (n_tasks, 4) criteria matrix
+    """
+    if isinstance(tasks_dict, TaskTable):
+        return tasks_dict.titles, tasks_dict.criteria_matrix()
+    
+    names = list(tasks_dict)
+    matrix = np.array(
+        [[criteria[key] for key in CRITERIA] for criteria in tasks_dict.values()],
+        dtype=np.float64,
+    ).reshape(len(names), len(CRITERIA))
+    return names, matrix
+
+def urgency_scores(due_in_days: np.ndarray) -> np.ndarray:
     """
+    Evaluate the urgency curve for an array of dueInDays values.
+    
+    The exponential is evaluated once per distinct dueInDays value with math.exp,
+    so results are bit-identical to calculate_task_score.
+    
+    Args:
+        due_in_days (np.ndarray): dueInDays for each task
+        
+    Returns:
+        np.ndarray: Urgency score for each task (0.0 where there is no due date)
+    """
+    unique_days, inverse = np.unique(due_in_days, return_inverse=True)
+    unique_exp = np.array([math.exp(-URGENCY_ALPHA * day) for day in unique_days.tolist()], dtype=np.float64)
+    urgency = URGENCY_BASE + URGENCY_SCALE * unique_exp[inverse.reshape(-1)]
+    urgency[due_in_days == 0] = 0.0
+    return urgency
+
+def score_components(matrix: np.ndarray) -> np.ndarray:
+    """
+    Normalize a criteria matrix into the unweighted per-criterion score components.
+    
+    Args:
+        matrix (np.ndarray): (n_tasks, 4) criteria matrix from criteria_matrix
+        
+    Returns:
+        np.ndarray: (n_tasks, 4) matrix of core, effort, organization and urgency components
+    """
+    components = np.empty_like(matrix, dtype=np.float64)
+    components[:, 0] = matrix[:, 0] / 100.0
+    components[:, 1] = matrix[:, 1] / 10.0
+    components[:, 2] = np.minimum(matrix[:, 2] / 10.0, 1.0)
+    components[:, 3] = urgency_scores(matrix[:, 3])
+    return components
+
+def score_tasks_batch(tasks_dict: Tasks, weights: Dict[str, float]) -> Tuple[List[str], np.ndarray]:
+    """
+    Score every task in one vectorized pass.
+    
+    Weighted components are summed in the same order as calculate_task_score so
+    the scores match it exactly.
+    
+    Args:
+        tasks_dict (Dict[str, Dict[str, Any]]): Dictionary of tasks and criteria
+        weights (Dict[str, float]): Weights for each criterion
+        
+    Returns:
+        Tuple[List[str], np.ndarray]: Task names and their scores, in input order
+    """
+    with stage('normalize'):
+        names, matrix = criteria_matrix(tasks_dict)
+        components = score_components(matrix)
+    
+    with stage('score'):
+        scores = np.zeros(len(names), dtype=np.float64)
+        for column, key in enumerate(CRITERIA):
+            scores += components[:, column] * weights.get(key, 1.0)
+    count('tasks_scored', len(names))
+    return names, scores
+
+def distribute_scores(task_scores: Union[List[tuple], TaskTable], parts: int = 20,
+                      weights: Dict[str, float] = None, method: str = 'largest_remainder',
+                      minimum: Union[int, List[int]] = None, maximum: Union[int, List[int]] = None) -> List[tuple]:
+    """
+    Apportion a number of parts (slots) among tasks in proportion to their scores.
+    
+    The parts always sum exactly to `parts`; see apportion.apportion for the methods.
+    
+    Args:
+        task_scores (Union[List[tuple], TaskTable]): List of (task_name, score) tuples,
+            or a TaskTable to rank with `weights` first
+        parts (int): Number of parts to hand out (e.g. 20, or 96 quarter-hours in a day)
+        weights (Dict[str, float]): Weights for each criterion, required for a TaskTable
+        method (str): 'largest_remainder' or 'dhondt'
+        minimum (Union[int, List[int]]): Minimum parts per task (scalar or per task)
+        maximum (Union[int, List[int]]): Maximum parts per task (scalar or per task)
+        
+    Returns:
+        List[tuple]: List of (task_name, score, parts, percentage) tuples
+    """
+    if isinstance(task_scores, TaskTable):
+        if weights is None:
+            raise ValueError("weights are required to distribute a TaskTable")
+        task_scores = rank_tasks_by_score(task_scores, weights)
+    
     if not task_scores:
         return []
     
+    names = [task_name for task_name, _ in task_scores]
+    scores = np.array([score for _, score in task_scores], dtype=np.float64)
+    
     # Calculate total score
-    total_score = sum(score for _, score in task_scores)
+    total_score = scores.sum()
     
     if total_score == 0:
         return []
     
-    # Calculate parts of 20 for each task
-    distribution = []
-    for task_name, score in task_scores:
-        # Calculate percentage of total
-        percentage = (score / total_score) * 100
-        
-        # Calculate parts of 20 (rounded to nearest whole number)
-        parts_of_20 = round((score / total_score) * 20)
+    with stage('apportion'):
+        allocation = apportion(scores, parts, method, minimum, maximum)
+    percentages = scores / total_score * 100
+    
+    return list(zip(names, scores.tolist(), allocation.tolist(), percentages.tolist()))
+
+def distribute_scores_to_20ths(task_scores: Union[List[tuple], TaskTable], weights: Dict[str, float] = None) -> List[tuple]:
+    """
+    Distribute task scores into 20 equal parts based on their relative scores.
+    
+    Args:
+        task_scores (Union[List[tuple], TaskTable]): List of (task_name, score) tuples,
+            or a TaskTable to rank with `weights` first
+        weights (Dict[str, float]): Weights for each criterion, required for a TaskTable
         
-        distribution.append((task_name, score, parts_of_20, percentage))
+    Returns:
+        List[tuple]: List of (task_name, score, parts_of_20, percentage) tuples
+    """
+    return distribute_scores(task_scores, TWENTIETHS, weights)
+
+def print_distribution(distribution: List[tuple], parts: int, bar_width: int = 20) -> None:
+    """
+    Print the distribution of tasks into a number of parts.
     
-    return distribution
+    Args:
+        distribution (List[tuple]): List of (task_name, score, parts, percentage) tuples
+        parts (int): Total number of parts the distribution was made over
+        bar_width (int): Width of the visual bars (one block per part when parts fit)
+    """
+    if not distribution:
+        print("No distribution to display")
+        return
+    
+    with stage('render'):
+        lines = [f"\n{'='*80}", f"{f'TASK DISTRIBUTION INTO {parts}THS':^80}", f"{'='*80}"]
+        
+        # Sort by parts (highest first)
+        sorted_distribution = sorted(distribution, key=lambda x: x[2], reverse=True)
+        
+        lines.append(f"\n{'Task':<50} {'Score':<8} {f'Parts/{parts}':<10} {'% of Total':<12}")
+        lines.append("-" * 80)
+        
+        total_parts = 0
+        for task_name, score, task_parts, percentage in sorted_distribution:
+            lines.append(f"{task_name[:49]:<50} {score:<8.3f} {task_parts:<10} {percentage:<12.1f}%")
+            total_parts += task_parts
+        
+        lines.append("-" * 80)
+        lines.append(f"{'TOTAL':<50} {'':<8} {total_parts:<10} {'100.0':<12}%")
+        
+        # Show visual representation
+        lines.append(f"\n{f'Visual Representation ({parts} parts)':^80}")
+        lines.append("-" * 80)
+        
+        scale = min(1.0, bar_width / parts)
+        for task_name, _, task_parts, _ in sorted_distribution:
+            if task_parts > 0:
+                visual = "█" * max(1, round(task_parts * scale))
+                lines.append(f"{task_name[:30]:<30} {visual} ({task_parts}/{parts})")
+            else:
+                lines.append(f"{task_name[:30]:<30} {'·' * min(parts, bar_width)} (0/{parts})")
+        
+        lines.append("-" * 80)
+        print('\n'.join(lines))
+        count('lines_rendered', len(lines))
 
 def print_20th_distribution(distribution: List[tuple]) -> None:
     """
@@ -187,113 +455,276 @@ def print_20th_distribution(distribution: List[tuple]) -> None:
     Args:
         distribution (List[tuple]): List of (task_name, score, parts_of_20, percentage) tuples
     """
-    if not distribution:
-        print("No distribution to display")
-        return
+    print_distribution(distribution, TWENTIETHS)
+
+def rank_task_indices(tasks_dict: Tasks, weights: Dict[str, float]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Score tasks in batch and compute their rank order.
     
-    print(f"\n{'='*80}")
-    print(f"{'TASK DISTRIBUTION INTO 20THS':^80}")
-    print(f"{'='*80}")
+    Args:
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
+        weights (Dict[str, float]): Weights for each criterion
+        
+    Returns:
+        Tuple[List[str], np.ndarray, np.ndarray]: Task names, scores in input order,
+            and the input indices sorted by score (highest first)
+    """
+    names, scores = score_tasks_batch(tasks_dict, weights)
     
-    # Sort by parts of 20 (highest first)
-    sorted_distribution = sorted(distribution, key=lambda x: x[2], reverse=True)
+    # Stable sort on the negated scores keeps ties in input order, like list.sort(reverse=True)
+    with stage('sort'):
+        order = np.argsort(-scores, kind='stable')
+    return names, scores, order
+
+def rank_tasks_by_score(tasks_dict: Tasks, weights: Dict[str, float], debug: bool = False) -> List[tuple]:
+    """
+    Rank tasks by their calculated scores.
     
-    print(f"\n{'Task':<50} {'Score':<8} {'Parts/20':<10} {'% of Total':<12}")
-    print("-" * 80)
+    Args:
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
+        weights (Dict[str, float]): Weights for each criterion
+        debug (bool): Score task by task and log each score breakdown (see calculate_task_score)
+        
+    Returns:
+        List[tuple]: List of (task_name, score) tuples sorted by score (highest first)
+    """
+    if debug:
+        task_scores = []
+        
+        with stage('score'):
+            for task_name, criteria in tasks_dict.items():
+                score = calculate_task_score(criteria, weights, debug=True)
+                task_scores.append((task_name, score))
+        count('tasks_scored', len(task_scores))
+        
+        # Sort by score (highest first)
+        with stage('sort'):
+            task_scores.sort(key=lambda x: x[1], reverse=True)
+        return task_scores
     
-    total_parts = 0
-    for task_name, score, parts, percentage in sorted_distribution:
-        print(f"{task_name[:49]:<50} {score:<8.3f} {parts:<10} {percentage:<12.1f}%")
-        total_parts += parts
+    names, scores, order = rank_task_indices(tasks_dict, weights)
+    return [(names[i], score) for i, score in zip(order.tolist(), scores[order].tolist())]
+
+def _suffix_max(grid: np.ndarray) -> np.ndarray:
+    """Running maximum from the high end of every axis: out[i, j, ...] = max(grid[i:, j:, ...])."""
+    for axis in range(grid.ndim):
+        flipped = np.flip(grid, axis)
+        grid = np.flip(np.maximum.accumulate(flipped, axis=axis), axis)
+    return grid
+
+def skyline_layers(points: np.ndarray) -> np.ndarray:
+    """
+    Assign every point its Pareto layer (higher is better in every column).
     
-    print("-" * 80)
-    print(f"{'TOTAL':<50} {'':<8} {total_parts:<10} {'100.0':<12}%")
+    Layer 1 is the skyline: points no other point dominates. A point's layer is
+    one more than the deepest layer among the points dominating it, so every
+    point in layer k+1 is dominated by some point in layer k and no two points in
+    one layer dominate each other. Identical points share a layer.
     
-    # Show visual representation
-    print(f"\n{'Visual Representation (20 parts)':^80}")
-    print("-" * 80)
+    Each column is reduced to value ranks and the distinct points are swept in
+    descending order, the least varied column outermost. Dominators from earlier
+    slabs, sub-slabs and rows are read from running-maximum grids over the
+    remaining columns, and a row (the first three columns fixed) is resolved with
+    one cumulative maximum. The work is one sort plus one pass per row and grid
+    cell, instead of comparing every pair of points.
     
-    for task_name, score, parts, percentage in sorted_distribution:
-        if parts > 0:
-            visual = "█" * parts
-            print(f"{task_name[:30]:<30} {visual} ({parts}/20)")
-        else:
-            print(f"{task_name[:30]:<30} {'·' * 20} (0/20)")
+    Args:
+        points (np.ndarray): (n_points, 4) matrix, e.g. score_components output
+        
+    Returns:
+        np.ndarray: int64 layer (1-based) for each point, in input order
+    """
+    n, columns = points.shape
+    if columns != 4:
+        raise ValueError(f"skyline_layers expects 4 columns, got {columns}")
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    ranks, sizes = [], []
+    for column in range(columns):
+        values, inverse = np.unique(points[:, column], return_inverse=True)
+        ranks.append(inverse.reshape(-1).astype(np.int64))
+        sizes.append(len(values))
+    axes = sorted(range(columns), key=sizes.__getitem__)
+    k0, k1, k2, k3 = (sizes[axis] for axis in axes)
+    if k1 * k2 * k3 > SKYLINE_MAX_CELLS:
+        raise ValueError(f"Criteria have too many distinct values for skyline layers "
+                         f"({k1 * k2 * k3:,} grid cells, limit {SKYLINE_MAX_CELLS:,})")
+    
+    # Distinct points as one lexicographic key each, visited from the best down
+    a, b, c, d = (ranks[axis] for axis in axes)
+    keys, inverse = np.unique(((a * k1 + b) * k2 + c) * k3 + d, return_inverse=True)
+    keys = keys[::-1]
+    d = keys % k3
+    row_keys = keys // k3
+    c = row_keys % k2
+    b = row_keys // k2 % k1
+    a = row_keys // (k2 * k1)
+    
+    layers = np.empty(len(keys), dtype=np.int64)
+    slabs = np.zeros((k1, k2, k3), dtype=np.int64)    # earlier a: best layer at or above (b, c, d)
+    sub_slabs = np.zeros((k2, k3), dtype=np.int64)    # same a, earlier b: at or above (c, d)
+    rows = np.zeros(k3, dtype=np.int64)               # same a and b, earlier c: at or above d
+    
+    starts = np.flatnonzero(np.r_[True, row_keys[1:] != row_keys[:-1]]).tolist() + [len(keys)]
+    slab_start = sub_slab_start = 0
+    for start, stop in zip(starts[:-1], starts[1:]):
+        if a[start] != a[slab_start]:
+            grid = np.zeros_like(slabs)
+            grid[b[slab_start:start], c[slab_start:start], d[slab_start:start]] = layers[slab_start:start]
+            slabs = np.maximum(slabs, _suffix_max(grid))
+            slab_start = sub_slab_start = start
+            sub_slabs[:] = 0
+            rows[:] = 0
+        elif b[start] != b[sub_slab_start]:
+            grid = np.zeros_like(sub_slabs)
+            grid[c[sub_slab_start:start], d[sub_slab_start:start]] = layers[sub_slab_start:start]
+            sub_slabs = np.maximum(sub_slabs, _suffix_max(grid))
+            sub_slab_start = start
+            rows[:] = 0
+        
+        # Within a row only a higher d dominates: layer_i = max(base_i, layer_(i-1) + 1)
+        row_b, row_c, row_d = b[start], c[start], d[start:stop]
+        base = 1 + np.maximum(np.maximum(slabs[row_b, row_c, row_d], sub_slabs[row_c, row_d]), rows[row_d])
+        steps = np.arange(stop - start)
+        layers[start:stop] = steps + np.maximum.accumulate(base - steps)
+        
+        grid = np.zeros_like(rows)
+        grid[row_d] = layers[start:stop]
+        rows = np.maximum(rows, _suffix_max(grid))
     
-    print("-" * 80)
+    return layers[::-1][inverse.reshape(-1)]
 
-def rank_tasks_by_score(tasks_dict: Dict[str, Dict[str, Any]], weights: Dict[str, float]) -> List[tuple]:
+def rank_tasks_by_layer(tasks_dict: Tasks, weights: Dict[str, float] = None) -> List[tuple]:
     """
-    Rank tasks by their calculated scores.
+    Rank tasks by Pareto layer over the score components, optionally by score within a layer.
+    
+    A task in layer k+1 is beaten on every criterion (and strictly on one) by some
+    task in layer k, so it scores lower under any positive weights.
     
     Args:
-        tasks_dict (Dict[str, Dict[str, Any]]): Dictionary of tasks and criteria
-        weights (Dict[str, float]): Weights for each criterion
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
+        weights (Dict[str, float]): Weights for each criterion; when given, tasks are
+            ordered by score (highest first) within their layer, otherwise kept in input order
         
     Returns:
-        List[tuple]: List of (task_name, score) tuples sorted by score (highest first)
+        List[tuple]: List of (task_name, layer, score) tuples sorted by layer;
+            score is None without weights
     """
-    task_scores = []
-    
-    for task_name, criteria in tasks_dict.items():
-        score = calculate_task_score(criteria, weights)
-        task_scores.append((task_name, score))
+    with stage('normalize'):
+        names, matrix = criteria_matrix(tasks_dict)
+        components = score_components(matrix)
+    
+    with stage('sort'):
+        layers = skyline_layers(components)
+    
+    if weights is None:
+        order = np.argsort(layers, kind='stable')
+        return [(names[i], layer, None) for i, layer in zip(order.tolist(), layers[order].tolist())]
+    
+    _, scores = score_tasks_batch(tasks_dict, weights)
+    with stage('sort'):
+        order = np.lexsort((-scores, layers))
+    return [(names[i], layer, score)
+            for i, layer, score in zip(order.tolist(), layers[order].tolist(), scores[order].tolist())]
+
+def print_skyline(tasks_dict: Tasks, weights: Dict[str, float] = None, limit: int = None) -> None:
+    """
+    Print tasks grouped by Pareto layer.
     
-    # Sort by score (highest first)
-    task_scores.sort(key=lambda x: x[1], reverse=True)
-    return task_scores
+    Args:
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
+        weights (Dict[str, float]): Weights for ordering within each layer (input order when omitted)
+        limit (int): Only list the first `limit` layers (all layers when omitted)
+    """
+    ranked = rank_tasks_by_layer(tasks_dict, weights)
+    
+    with stage('render'):
+        lines = [f"\n{'='*80}", f"{'TASK SKYLINE (PARETO LAYERS)':^80}", f"{'='*80}"]
+        layer_sizes: Dict[int, int] = {}
+        for _, layer, _ in ranked:
+            layer_sizes[layer] = layer_sizes.get(layer, 0) + 1
+        lines.append(f"\n{len(ranked)} tasks in {len(layer_sizes)} layers")
+        
+        current = None
+        for task_name, layer, score in ranked:
+            if limit is not None and layer > limit:
+                if limit:
+                    lines.append(f"\n... {len(layer_sizes) - limit} more layers")
+                break
+            if layer != current:
+                current = layer
+                lines.append(f"\nLayer {layer} ({layer_sizes[layer]} tasks):")
+                lines.append("-" * 60)
+            lines.append(f"  {task_name:<50} {score:>8.3f}" if score is not None else f"  {task_name}")
+        
+        print('\n'.join(lines))
+        count('lines_rendered', len(lines))
 
-def print_ranked_tasks(tasks_dict: Dict[str, Dict[str, Any]], weights: Dict[str, float]) -> None:
+def print_ranked_tasks(tasks_dict: Tasks, weights: Dict[str, float]) -> None:
     """
     Print tasks ranked by their calculated scores.
     
     Args:
-        tasks_dict (Dict[str, Dict[str, Any]]): Dictionary of tasks and criteria
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
         weights (Dict[str, float]): Weights for each criterion
     """
-    ranked_tasks = rank_tasks_by_score(tasks_dict, weights)
-    
-    print(f"\n{'='*80}")
-    print(f"{'TASK RANKING BY SCORE':^80}")
-    print(f"{'='*80}")
-    
-    print(f"\nWeights used:")
-    print(f"  Core Alignment: {weights.get('corePercentage', 1.0):.2f}")
-    print(f"  Effort Complexity: {weights.get('effortComplexity', 1.0):.2f}")
-    print(f"  Organization Value: {weights.get('organizationValue', 1.0):.2f}")
-    print(f"  Due In Days: {weights.get('dueInDays', 1.0):.2f}")
-    
-    print(f"\nRanked Tasks:")
-    for i, (task_name, score) in enumerate(ranked_tasks, 1):
-        criteria = tasks_dict[task_name]
-        print(f"\n{i}. {task_name}")
-        print(f"   Score: {score:.3f}")
-        print(f"   Core: {criteria['corePercentage']}% | Effort: {criteria['effortComplexity']} | Org: {criteria['organizationValue']} | Due: {criteria['dueInDays']} days")
-        print("-" * 60)
+    names, scores, order = rank_task_indices(tasks_dict, weights)
+    rows = tasks_dict if isinstance(tasks_dict, TaskTable) else list(tasks_dict.values())
+    
+    with stage('render'):
+        lines = [f"\n{'='*80}", f"{'TASK RANKING BY SCORE':^80}", f"{'='*80}"]
+        
+        lines.append(f"\nWeights used:")
+        lines.append(f"  Core Alignment: {weights.get('corePercentage', 1.0):.2f}")
+        lines.append(f"  Effort Complexity: {weights.get('effortComplexity', 1.0):.2f}")
+        lines.append(f"  Organization Value: {weights.get('organizationValue', 1.0):.2f}")
+        lines.append(f"  Due In Days: {weights.get('dueInDays', 1.0):.2f}")
+        
+        lines.append(f"\nRanked Tasks:")
+        for i, (index, score) in enumerate(zip(order.tolist(), scores[order].tolist()), 1):
+            criteria = rows.row(index) if isinstance(rows, TaskTable) else rows[index]
+            lines.append(f"\n{i}. {names[index]}")
+            lines.append(f"   Score: {score:.3f}")
+            lines.append(f"   Core: {criteria['corePercentage']}% | Effort: {criteria['effortComplexity']} | Org: {criteria['organizationValue']} | Due: {criteria['dueInDays']} days")
+            lines.append("-" * 60)
+        
+        print('\n'.join(lines))
+        count('lines_rendered', len(lines))
 
-if __name__ == "__main__":
-    # Example usage
-    yaml_file = "example_task.yaml"
-    tasks = parse_tasks_from_yaml(yaml_file)
+def main(yaml_file: str, no_cache: bool = False, quiet: bool = False, skyline: bool = False) -> None:
+    """
+    Parse, rank and distribute the tasks of one YAML file, printing each step.
     
-    if tasks:
+    Args:
+        yaml_file (str): Task YAML file
+        no_cache (bool): Always re-parse the YAML file
+        quiet (bool): Skip the per-task listings
+        skyline (bool): Also print the Pareto layers (only the layer count when quiet)
+    """
+    from parse_cache import ParseCache
+    
+    tasks = ParseCache(enabled=False if no_cache else None).load(yaml_file)
+    
+    if len(tasks):
         print(f"Successfully parsed {len(tasks)} tasks from {yaml_file}")
+        print_memory_report(tasks)
         
         # Display basic task summary
-        print_tasks_summary(tasks)
+        if not quiet:
+            print_tasks_summary(tasks)
         # Example of custom weights
         print(f"\n{'='*80}")
         print(f"{'CUSTOM WEIGHT EXAMPLE':^80}")
         print(f"{'='*80}")
         
-        custom_weights = {
-            'corePercentage': 1.2,      # Prioritize core alignment
-            'effortComplexity': 2.5,    # Strongly prefer easier tasks
-            'organizationValue': 1.1,   # Less emphasis on organization
-            'dueInDays': 3.5            # Moderate urgency consideration
-        }
+        custom_weights = EXAMPLE_WEIGHTS
         
-        print_ranked_tasks(tasks, custom_weights)
+        if not quiet:
+            print_ranked_tasks(tasks, custom_weights)
+        
+        if skyline:
+            print_skyline(tasks, custom_weights, limit=0 if quiet else None)
         
         # Demonstrate the 20th distribution
         print(f"\n{'='*80}")
@@ -301,13 +732,51 @@ if __name__ == "__main__":
         print(f"{'='*80}")
         
         # Get the ranked tasks
-        ranked_tasks = rank_tasks_by_score(tasks, custom_weights)
+        ranked_tasks = rank_tasks_by_score(tasks, custom_weights, debug=logger.isEnabledFor(logging.DEBUG))
         
         # Create distribution into 20ths
         distribution = distribute_scores_to_20ths(ranked_tasks)
         
         # Print the distribution
-        print_20th_distribution(distribution)
+        if quiet:
+            print(f"{sum(1 for _, _, parts, _ in distribution if parts)} of {len(distribution)} tasks received parts")
+        else:
+            print_20th_distribution(distribution)
         
     else:
         print("Failed to parse tasks from YAML file")
+
+if __name__ == "__main__":
+    import argparse
+    import cProfile
+    import pstats
+    import sys
+    from instrumentation import profiling
+    
+    parser = argparse.ArgumentParser(description="Parse, rank and distribute tasks from a YAML file")
+    parser.add_argument('yaml_file', nargs='?', default="example_task.yaml", help="Task YAML file")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-parse the YAML file")
+    parser.add_argument('--quiet', action='store_true', help="Skip the per-task listings")
+    parser.add_argument('--skyline', action='store_true', help="Also group tasks into Pareto layers over the criteria")
+    parser.add_argument('--debug', action='store_true', help="Log every task's score breakdown to stderr")
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='STATS_FILE',
+                        help="Print a per-stage timing breakdown; with a file, also dump cProfile stats there")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING, format='%(message)s')
+    
+    if args.profile is None:
+        main(args.yaml_file, args.no_cache, args.quiet, args.skyline)
+    else:
+        profiler = cProfile.Profile() if args.profile else None
+        with profiling() as profile:
+            if profiler:
+                profiler.enable()
+            main(args.yaml_file, args.no_cache, args.quiet, args.skyline)
+            if profiler:
+                profiler.disable()
+        print(profile.report(), file=sys.stderr)
+        if profiler:
+            profiler.dump_stats(args.profile)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(15)
+            print(f"cProfile stats written to {args.profile}", file=sys.stderr)
@@ -0,0 +1,542 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from goal_graph import affinity_matrix
+from task_parser import CRITERIA, EXAMPLE_WEIGHTS, YAML_LOADER, score_components
+from task_table import DISTRIBUTION_KEYS, TaskTable, unique_keys
+
+DEFAULT_DB = Path.home() / '.local' / 'share' / 'life-os' / 'tasks.db'
+
+# Bump when the schema changes; older databases are rebuilt from their YAML sources
+SCHEMA_VERSION = 1
+
+# YAML section -> table
+SECTIONS = {'tasks': 'tasks', 'endGoals': 'goals'}
+
+# Weighted-score inputs stored per row so a reweight is one UPDATE, in CRITERIA order
+COMPONENT_COLUMNS = ('core_component', 'effort_component', 'organization_component', 'urgency_component')
+DISTRIBUTION_COLUMNS = tuple(f'dist_{key}' for key in DISTRIBUTION_KEYS)
+
+# Columns written from a TaskTable row, after (source, key, record_hash)
+ITEM_COLUMNS = (
+    ('title', 'title'),
+    ('core_percentage', 'core_percentage'),
+    ('core_type', 'core_type'),
+    ('effort_complexity', 'effort_complexity'),
+    ('goal_impact', 'goal_impact'),
+    ('personal_impact', 'personal_impact'),
+    ('external_impact', 'external_impact'),
+    ('organization_value', 'organization_value'),
+    ('due_in_days', 'due_in_days'),
+    ('confidence', 'confidence'),
+    ('expected', 'expected'),
+    ('description', 'description'),
+)
+
+ITEM_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    record_hash TEXT NOT NULL,
+    title TEXT NOT NULL,
+    core_percentage REAL,
+    core_type TEXT,
+    effort_complexity REAL,
+    goal_impact REAL,
+    personal_impact REAL,
+    external_impact REAL,
+    organization_value REAL,
+    due_in_days REAL,
+    confidence TEXT,
+    expected TEXT,
+    description TEXT,
+    {distribution},
+    {components},
+    score REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    UNIQUE (source, key)
+);
+CREATE INDEX IF NOT EXISTS {table}_due ON {table} (due_in_days, score);
+CREATE INDEX IF NOT EXISTS {table}_core ON {table} (core_percentage, score);
+CREATE INDEX IF NOT EXISTS {table}_score ON {table} (score);
+CREATE INDEX IF NOT EXISTS {table}_title ON {table} (title);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT NOT NULL,
+    section TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (path, section)
+);
+CREATE TABLE IF NOT EXISTS task_goals (
+    goal_id INTEGER NOT NULL,
+    task_id INTEGER NOT NULL,
+    affinity REAL NOT NULL,
+    PRIMARY KEY (goal_id, task_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS task_goals_task ON task_goals (task_id);
+""" + ''.join(
+    ITEM_SCHEMA.format(
+        table=table,
+        distribution=',\n    '.join(f'{column} REAL NOT NULL DEFAULT 0' for column in DISTRIBUTION_COLUMNS),
+        components=',\n    '.join(f'{column} REAL NOT NULL DEFAULT 0' for column in COMPONENT_COLUMNS),
+    )
+    for table in SECTIONS.values()
+)
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _record_hash(record: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def record_keys(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Stable identity for each record: its title, with ' [n]' appended to repeats of a title.
+
+    Args:
+        records (List[Dict[str, Any]]): Task or goal mappings in file order
+
+    Returns:
+        List[str]: One key per record
+    """
+    return unique_keys(str(record.get('title', 'Unknown Task')) for record in records)
+
+
+class TaskStore:
+    """
+    SQLite store of tasks and end goals imported from YAML.
+
+    Imports are incremental: unchanged files are skipped by mtime/size and
+    content hash, and within a changed file only records whose content hash
+    changed are rewritten. Each row keeps its weighted score components, so a
+    change of weights refreshes every score in a single UPDATE. Tasks are
+    linked to goals by the cosine affinity of their distribution vectors
+    (as in goal_graph), recomputed only for rows that changed.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, weights: Optional[Dict[str, float]] = None):
+        self.db_path = str(db_path or os.environ.get('LIFE_OS_DB') or DEFAULT_DB)
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self._migrate()
+        stored = self._meta('weights')
+        self.weights = json.loads(stored) if stored else dict(EXAMPLE_WEIGHTS)
+        if weights is not None and weights != self.weights:
+            self.set_weights(weights)
+
+    def _migrate(self) -> None:
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            tables = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            for table in tables:
+                self.conn.execute(f'DROP TABLE IF EXISTS {table}')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'TaskStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Import
+
+    def import_yaml(self, yaml_file_path: str, section: str = 'tasks', force: bool = False) -> Dict[str, int]:
+        """
+        Import (or re-import) the tasks or goals of one YAML file.
+
+        Args:
+            yaml_file_path (str): Path to the YAML file
+            section (str): 'tasks' or 'endGoals'
+            force (bool): Re-read the file even if it looks unchanged
+
+        Returns:
+            Dict[str, int]: added, updated, removed and unchanged record counts
+                (all zero with skipped=1 when the file was unchanged)
+        """
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown section '{section}' (expected one of {', '.join(SECTIONS)})")
+        table = SECTIONS[section]
+        path = str(Path(yaml_file_path).resolve())
+        stat = os.stat(path)
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'skipped': 0}
+
+        source = self.conn.execute('SELECT mtime_ns, size, sha256 FROM sources WHERE path = ? AND section = ?',
+                                   (path, section)).fetchone()
+        if source and not force and (source['mtime_ns'], source['size']) == (stat.st_mtime_ns, stat.st_size):
+            counts['skipped'] = 1
+            return counts
+        digest = _file_digest(path)
+        if source and not force and source['sha256'] == digest:
+            self._save_source(path, section, stat, digest)
+            self.conn.commit()
+            counts['skipped'] = 1
+            return counts
+
+        with open(path, 'r', encoding='utf-8') as file:
+            data = yaml.load(file, Loader=YAML_LOADER) or {}
+        records = data.get(section) or []
+        keys = record_keys(records)
+
+        existing = {row[0]: (row[1], row[2]) for row in
+                    self.conn.execute(f'SELECT key, record_hash, id FROM {table} WHERE source = ?', (path,))}
+        changed = []
+        for key, record in zip(keys, records):
+            record_hash = _record_hash(record)
+            before = existing.pop(key, None)
+            if before is None:
+                counts['added'] += 1
+            elif before[0] != record_hash:
+                counts['updated'] += 1
+            else:
+                counts['unchanged'] += 1
+                continue
+            changed.append((key, record_hash, record))
+
+        with self.conn:
+            removed_ids = [row_id for _, row_id in existing.values()]
+            self._delete(table, removed_ids)
+            counts['removed'] = len(removed_ids)
+            changed_ids = self._upsert(table, path, changed)
+            self._save_source(path, section, stat, digest)
+            if table == 'tasks':
+                self._link(task_ids=changed_ids)
+            elif changed_ids or removed_ids:
+                self._link(goal_ids=changed_ids)
+        return counts
+
+    def _save_source(self, path: str, section: str, stat: os.stat_result, digest: str) -> None:
+        self.conn.execute(
+            'INSERT INTO sources (path, section, mtime_ns, size, sha256) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (path, section) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size, '
+            'sha256 = excluded.sha256',
+            (path, section, stat.st_mtime_ns, stat.st_size, digest),
+        )
+
+    def _delete(self, table: str, ids: List[int]) -> None:
+        if not ids:
+            return
+        link_column = 'task_id' if table == 'tasks' else 'goal_id'
+        self.conn.executemany(f'DELETE FROM task_goals WHERE {link_column} = ?', ((i,) for i in ids))
+        self.conn.executemany(f'DELETE FROM {table} WHERE id = ?', ((i,) for i in ids))
+
+    def _upsert(self, table: str, path: str, changed: List[Tuple[str, str, Dict[str, Any]]]) -> List[int]:
+        """Write added/changed records with their score components; returns their row ids."""
+        if not changed:
+            return []
+        rows = TaskTable.from_records(record for _, _, record in changed)
+        components = score_components(rows.criteria_matrix())
+        scores = self._weighted(components)
+
+        columns = [column for column, _ in ITEM_COLUMNS]
+        plain = {}
+        for column, name in ITEM_COLUMNS:
+            if name in rows.numeric:
+                plain[column] = rows.numeric[name].tolist()
+            elif name in rows.codes:
+                labels = rows.categories[name]
+                plain[column] = [labels[code] for code in rows.codes[name].tolist()]
+            else:
+                plain[column] = rows.column(name)
+        distribution = rows.distribution.tolist()
+        component_rows = components.tolist()
+        score_list = scores.tolist()
+
+        all_columns = (['source', 'key', 'record_hash'] + columns + list(DISTRIBUTION_COLUMNS)
+                       + list(COMPONENT_COLUMNS) + ['score', 'data'])
+        updates = ', '.join(f'{column} = excluded.{column}' for column in all_columns[2:])
+        sql = (f"INSERT INTO {table} ({', '.join(all_columns)}) VALUES ({', '.join('?' * len(all_columns))}) "
+               f"ON CONFLICT (source, key) DO UPDATE SET {updates}")
+
+        def parameters() -> Iterable[tuple]:
+            for i, (key, record_hash, record) in enumerate(changed):
+                yield (path, key, record_hash, *(plain[column][i] for column in columns), *distribution[i],
+                       *component_rows[i], score_list[i], json.dumps(record, default=str))
+
+        self.conn.executemany(sql, parameters())
+        ids = {}
+        keys = [key for key, _, _ in changed]
+        # Look ids up in batches (SQLite limits the number of bound parameters)
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            for row in self.conn.execute(
+                    f"SELECT key, id FROM {table} WHERE source = ? AND key IN ({', '.join('?' * len(batch))})",
+                    (path, *batch)):
+                ids[row[0]] = row[1]
+        return [ids[key] for key in keys]
+
+    def _weighted(self, components: np.ndarray) -> np.ndarray:
+        """Scores from component rows, summed in the same order as score_tasks_batch."""
+        scores = np.zeros(len(components), dtype=np.float64)
+        for column, key in enumerate(CRITERIA):
+            scores += components[:, column] * self.weights.get(key, 1.0)
+        return scores
+
+    def _distributions(self, table: str, ids: Optional[List[int]] = None) -> Tuple[List[int], np.ndarray]:
+        columns = ', '.join(DISTRIBUTION_COLUMNS)
+        if ids is None:
+            rows = self.conn.execute(f'SELECT id, {columns} FROM {table}').fetchall()
+        else:
+            rows = []
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                rows.extend(self.conn.execute(
+                    f"SELECT id, {columns} FROM {table} WHERE id IN ({', '.join('?' * len(batch))})", batch))
+        matrix = np.array([tuple(row)[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(DISTRIBUTION_COLUMNS))
+        return [row[0] for row in rows], matrix
+
+    def _link(self, task_ids: Optional[List[int]] = None, goal_ids: Optional[List[int]] = None) -> None:
+        """
+        Recompute task -> goal affinities for some tasks (against all goals), or for
+        some goals (against all tasks); with goal_ids given, every link is rebuilt.
+        """
+        if goal_ids is not None:
+            self.conn.execute('DELETE FROM task_goals')
+            task_ids = None
+        elif not task_ids:
+            return
+        else:
+            self.conn.executemany('DELETE FROM task_goals WHERE task_id = ?', ((i,) for i in task_ids))
+
+        goal_rows, goal_matrix = self._distributions('goals')
+        if not goal_rows:
+            return
+        task_rows, task_matrix = self._distributions('tasks', task_ids)
+        if not task_rows:
+            return
+        affinity = affinity_matrix(task_matrix, goal_matrix, 'cosine')
+        task_index, goal_index = np.nonzero(affinity > 0)
+        self.conn.executemany(
+            'INSERT INTO task_goals (goal_id, task_id, affinity) VALUES (?, ?, ?)',
+            zip((goal_rows[j] for j in goal_index.tolist()), (task_rows[i] for i in task_index.tolist()),
+                affinity[task_index, goal_index].tolist()),
+        )
+
+    # Scoring
+
+    def set_weights(self, weights: Dict[str, float]) -> int:
+        """
+        Store new weights and refresh every task and goal score in bulk.
+
+        Args:
+            weights (Dict[str, float]): Weights for each criterion
+
+        Returns:
+            int: Rows rescored
+        """
+        self.weights = dict(weights)
+        # Same summation order as score_tasks_batch, so stored scores match it exactly
+        expression = ' + '.join(f'{column} * ?' for column in COMPONENT_COLUMNS)
+        parameters = [self.weights.get(key, 1.0) for key in CRITERIA]
+        rescored = 0
+        with self.conn:
+            for table in SECTIONS.values():
+                rescored += self.conn.execute(f'UPDATE {table} SET score = {expression}', parameters).rowcount
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('weights', ?) "
+                              "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (json.dumps(self.weights),))
+        return rescored
+
+    # Queries
+
+    def top_tasks(self, k: int = 20, due_within: Optional[int] = None, min_core: Optional[float] = None,
+                  core_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Highest-scoring tasks, optionally filtered.
+
+        Args:
+            k (int): Number of tasks
+            due_within (Optional[int]): Only tasks due in 1..due_within days (0 means no due date)
+            min_core (Optional[float]): Minimum core alignment percentage
+            core_type (Optional[str]): Only this coreAlignment type ('Core', 'Auxillary')
+
+        Returns:
+            List[Dict[str, Any]]: title, score, corePercentage, effortComplexity,
+                organizationValue and dueInDays, highest score first
+        """
+        where = []
+        parameters: List[Any] = []
+        if due_within is not None:
+            where.append('due_in_days BETWEEN 1 AND ?')
+            parameters.append(due_within)
+        if min_core is not None:
+            where.append('core_percentage >= ?')
+            parameters.append(min_core)
+        if core_type is not None:
+            where.append('core_type = ?')
+            parameters.append(core_type)
+        clause = f"WHERE {' AND '.join(where)}" if where else ''
+        rows = self.conn.execute(
+            f'SELECT title, score, core_percentage, effort_complexity, organization_value, due_in_days '
+            f'FROM tasks {clause} ORDER BY score DESC, id LIMIT ?', (*parameters, k))
+        return [_task_dict(row) for row in rows]
+
+    def tasks_for_goal(self, goal: str, k: Optional[int] = None, min_affinity: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Tasks linked to a goal, highest score first.
+
+        Args:
+            goal (str): Goal title
+            k (Optional[int]): Maximum number of tasks (all when omitted)
+            min_affinity (float): Only tasks with a higher affinity to the goal
+
+        Returns:
+            List[Dict[str, Any]]: Task fields as in top_tasks plus affinity
+        """
+        rows = self.conn.execute(
+            'SELECT t.title, t.score, t.core_percentage, t.effort_complexity, t.organization_value, '
+            't.due_in_days, l.affinity FROM goals g JOIN task_goals l ON l.goal_id = g.id '
+            'JOIN tasks t ON t.id = l.task_id WHERE g.title = ? AND l.affinity > ? '
+            'ORDER BY t.score DESC, t.id LIMIT ?', (goal, min_affinity, -1 if k is None else k))
+        return [dict(_task_dict(row), affinity=row['affinity']) for row in rows]
+
+    def goals(self) -> List[Dict[str, Any]]:
+        """
+        Every goal with its linked task count, highest score first.
+
+        Returns:
+            List[Dict[str, Any]]: title, score and tasks
+        """
+        rows = self.conn.execute(
+            'SELECT g.title, g.score, COUNT(l.task_id) AS tasks FROM goals g '
+            'LEFT JOIN task_goals l ON l.goal_id = g.id GROUP BY g.id ORDER BY g.score DESC, g.id')
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'tasks': self.conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0],
+            'goals': self.conn.execute('SELECT COUNT(*) FROM goals').fetchone()[0],
+            'links': self.conn.execute('SELECT COUNT(*) FROM task_goals').fetchone()[0],
+            'sources': self.conn.execute('SELECT COUNT(*) FROM sources').fetchone()[0],
+        }
+
+
+def _task_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        'title': row['title'],
+        'score': row['score'],
+        'corePercentage': row['core_percentage'],
+        'effortComplexity': row['effort_complexity'],
+        'organizationValue': row['organization_value'],
+        'dueInDays': row['due_in_days'],
+    }
+
+
+def print_tasks(tasks: List[Dict[str, Any]], heading: str) -> None:
+    """
+    Print query results as a table.
+
+    Args:
+        tasks (List[Dict[str, Any]]): Rows from top_tasks or tasks_for_goal
+        heading (str): Title printed above the table
+    """
+    print(f"\n{'='*80}")
+    print(f"{heading:^80}")
+    print(f"{'='*80}")
+    if not tasks:
+        print("No matching tasks")
+        return
+    print(f"\n{'Task':<50} {'Score':>8} {'Core':>6} {'Effort':>7} {'Due':>6}")
+    print("-" * 80)
+    for task in tasks:
+        print(f"{task['title'][:49]:<50} {task['score']:>8.3f} {task['corePercentage']:>6g} "
+              f"{task['effortComplexity']:>7g} {task['dueInDays']:>6g}")
+    print("-" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite store of tasks and goals with indexed queries")
+    parser.add_argument('--db', default=None, help="Database file (default $LIFE_OS_DB or ~/.local/share/life-os/tasks.db)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    imports = commands.add_parser('import', help="Import task and goal YAML files")
+    imports.add_argument('tasks_file', nargs='?', default='example_task.yaml', help="Task YAML file")
+    imports.add_argument('goals_file', nargs='?', default='Goal_Nodes.yaml', help="Goal YAML file")
+    imports.add_argument('--force', action='store_true', help="Re-read files even if unchanged")
+
+    top = commands.add_parser('top', help="Highest-scoring tasks")
+    top.add_argument('-k', type=int, default=20, help="Number of tasks")
+    top.add_argument('--due-within', type=int, default=None, help="Only tasks due within this many days")
+    top.add_argument('--min-core', type=float, default=None, help="Minimum core alignment percentage")
+
+    goal = commands.add_parser('goal', help="Tasks serving a goal, by score")
+    goal.add_argument('title', help="Goal title")
+    goal.add_argument('-k', type=int, default=20, help="Number of tasks")
+
+    commands.add_parser('goals', help="List goals")
+
+    reweight = commands.add_parser('reweight', help="Set new weights and rescore everything")
+    reweight.add_argument('weights', help='JSON weights, e.g. \'{"dueInDays": 2.0}\'')
+
+    args = parser.parse_args()
+
+    with TaskStore(args.db) as store:
+        start = time.perf_counter()
+        if args.command == 'import':
+            for path, section in ((args.tasks_file, 'tasks'), (args.goals_file, 'endGoals')):
+                try:
+                    counts = store.import_yaml(path, section, args.force)
+                except FileNotFoundError:
+                    print(f"Error: File '{path}' not found")
+                    sys.exit(1)
+                except yaml.YAMLError as e:
+                    print(f"Error parsing YAML file: {e}")
+                    sys.exit(1)
+                if counts['skipped']:
+                    print(f"{path}: unchanged")
+                else:
+                    print(f"{path}: {counts['added']} added, {counts['updated']} updated, "
+                          f"{counts['removed']} removed, {counts['unchanged']} unchanged")
+            print(f"Store: {store.stats()}")
+        elif args.command == 'top':
+            within = f" DUE WITHIN {args.due_within} DAYS" if args.due_within is not None else ''
+            print_tasks(store.top_tasks(args.k, args.due_within, args.min_core), f"TOP {args.k} TASKS{within}")
+        elif args.command == 'goal':
+            print_tasks(store.tasks_for_goal(args.title, args.k), f"TASKS FOR {args.title.upper()}")
+        elif args.command == 'goals':
+            for row in store.goals():
+                print(f"{row['title'][:60]:<60} {row['score']:>8.3f} {row['tasks']:>8} tasks")
+        elif args.command == 'reweight':
+            weights = dict(store.weights, **json.loads(args.weights))
+            print(f"Rescored {store.set_weights(weights)} rows with {weights}")
+        print(f"({(time.perf_counter() - start) * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
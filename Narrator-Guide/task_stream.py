@@ -0,0 +1,294 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import yaml
+from yaml.events import (
+    AliasEvent, MappingEndEvent, MappingStartEvent, ScalarEvent,
+    SequenceEndEvent, SequenceStartEvent,
+)
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from task_parser import YAML_LOADER, rank_task_indices, score_tasks_batch
+from task_table import TaskTable, TaskTableBuilder
+
+YAML_SUFFIXES = ('.yaml', '.yml')
+
+
+def _compose(loader: yaml.BaseLoader, anchors: Dict[str, Node]) -> Node:
+    """
+    Build the node for the next value in the event stream.
+
+    Mirrors yaml.composer.Composer.compose_node, which the libyaml parser does
+    not expose for partial documents.
+    """
+    event = loader.get_event()
+
+    if isinstance(event, AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(None, None, f"found undefined alias {event.anchor!r}", event.start_mark)
+        return anchors[event.anchor]
+
+    if isinstance(event, ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(ScalarNode, event.value, event.implicit)
+        node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+
+    elif isinstance(event, SequenceStartEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(SequenceNode, None, event.implicit)
+        node = SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(SequenceEndEvent):
+            node.value.append(_compose(loader, anchors))
+        node.end_mark = loader.get_event().end_mark
+        return node
+
+    elif isinstance(event, MappingStartEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(MappingNode, None, event.implicit)
+        node = MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(MappingEndEvent):
+            key = _compose(loader, anchors)
+            node.value.append((key, _compose(loader, anchors)))
+        node.end_mark = loader.get_event().end_mark
+        return node
+
+    else:
+        raise yaml.composer.ComposerError(None, None, f"unexpected event {event}", event.start_mark)
+
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+    return node
+
+
+def iter_tasks(yaml_file_path: str, section: str = 'tasks') -> Iterator[Dict[str, Any]]:
+    """
+    Stream tasks one at a time from the `section` sequence of a YAML file.
+
+    Only one task's node tree is held at a time (plus any anchored nodes), so
+    memory stays bounded regardless of file size. Uses the libyaml parser when
+    available.
+
+    Args:
+        yaml_file_path (str): Path to the YAML file containing tasks
+        section (str): Top-level key holding the task list ('endGoals' for goal files)
+
+    Yields:
+        Dict[str, Any]: Each task mapping as yaml.safe_load would have built it
+    """
+    with open(yaml_file_path, 'r', encoding='utf-8') as file:
+        loader = YAML_LOADER(file)
+        try:
+            loader.get_event()  # StreamStartEvent
+            if not loader.check_event(yaml.DocumentStartEvent):
+                return
+            loader.get_event()
+            if not loader.check_event(MappingStartEvent):
+                return
+            loader.get_event()
+
+            anchors: Dict[str, Node] = {}
+            while not loader.check_event(MappingEndEvent):
+                key = loader.construct_document(_compose(loader, anchors))
+
+                if key != section or not loader.check_event(SequenceStartEvent):
+                    # Compose and drop other top-level values; only their anchors are kept
+                    _compose(loader, anchors)
+                    continue
+
+                loader.get_event()
+                while not loader.check_event(SequenceEndEvent):
+                    task = loader.construct_document(_compose(loader, anchors))
+                    if isinstance(task, dict):
+                        yield task
+                loader.get_event()
+        finally:
+            loader.dispose()
+
+
+def iter_task_tables(yaml_file_path: str, chunk_size: int = 10000, section: str = 'tasks',
+                     first_id: int = 0) -> Iterator[TaskTable]:
+    """
+    Stream tasks from a YAML file as TaskTable chunks of at most `chunk_size` rows.
+
+    Args:
+        yaml_file_path (str): Path to the YAML file containing tasks
+        chunk_size (int): Maximum rows per chunk
+        section (str): Top-level key holding the task list
+        first_id (int): Id assigned to the first task; ids continue across chunks
+
+    Yields:
+        TaskTable: Consecutive chunks of the file's tasks
+    """
+    builder = TaskTableBuilder(first_id)
+    for task in iter_tasks(yaml_file_path, section):
+        builder.append(task)
+        if len(builder) >= chunk_size:
+            table = builder.build()
+            yield table
+            first_id += len(table)
+            builder = TaskTableBuilder(first_id)
+    if len(builder):
+        yield builder.build()
+
+
+def iter_scored_chunks(yaml_file_path: str, weights: Dict[str, float], chunk_size: int = 10000,
+                       section: str = 'tasks') -> Iterator[Tuple[TaskTable, np.ndarray]]:
+    """
+    Stream tasks through the batch scorer one chunk at a time.
+
+    Args:
+        yaml_file_path (str): Path to the YAML file containing tasks
+        weights (Dict[str, float]): Weights for each criterion
+        chunk_size (int): Maximum rows per chunk
+        section (str): Top-level key holding the task list
+
+    Yields:
+        Tuple[TaskTable, np.ndarray]: Each chunk and its scores
+    """
+    for table in iter_task_tables(yaml_file_path, chunk_size, section):
+        _, scores = score_tasks_batch(table, weights)
+        yield table, scores
+
+
+def top_tasks_streaming(yaml_file_path: str, weights: Dict[str, float], k: int = 20,
+                        chunk_size: int = 10000, section: str = 'tasks') -> List[tuple]:
+    """
+    Return the `k` best tasks of a file without holding more than one chunk in memory.
+
+    Ties are broken by file order, so the result equals rank_tasks_by_score(...)[:k].
+
+    Args:
+        yaml_file_path (str): Path to the YAML file containing tasks
+        weights (Dict[str, float]): Weights for each criterion
+        k (int): Number of tasks to keep
+        chunk_size (int): Maximum rows per chunk
+        section (str): Top-level key holding the task list
+
+    Returns:
+        List[tuple]: List of (task_name, score) tuples sorted by score (highest first)
+    """
+    best_titles: List[str] = []
+    best_ids = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float64)
+
+    for table, scores in iter_scored_chunks(yaml_file_path, weights, chunk_size, section):
+        titles = best_titles + table.titles
+        ids = np.concatenate([best_ids, table.ids])
+        all_scores = np.concatenate([best_scores, scores])
+        keep = np.lexsort((ids, -all_scores))[:k]
+        best_titles = [titles[i] for i in keep.tolist()]
+        best_ids = ids[keep]
+        best_scores = all_scores[keep]
+
+    return list(zip(best_titles, best_scores.tolist()))
+
+
+def discover_task_files(paths: Sequence[Union[str, Path]]) -> List[Path]:
+    """
+    Expand files and directories into a sorted list of task YAML files.
+
+    Args:
+        paths (Sequence[Union[str, Path]]): YAML files and/or directories to search recursively
+
+    Returns:
+        List[Path]: YAML files, directories expanded in sorted order
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix in YAML_SUFFIXES and p.is_file()))
+        else:
+            files.append(path)
+    return files
+
+
+def _load_file_table(path: str, section: str) -> TaskTable:
+    builder = TaskTableBuilder()
+    for task in iter_tasks(path, section):
+        builder.append(task)
+    return builder.build()
+
+
+def load_task_tables(paths: Sequence[Union[str, Path]], section: str = 'tasks',
+                     workers: Optional[int] = None) -> TaskTable:
+    """
+    Ingest several task files (or directories of them) concurrently into one TaskTable.
+
+    Each file is parsed in a separate worker process; results are concatenated
+    in file order and ids renumbered to stay unique.
+
+    Args:
+        paths (Sequence[Union[str, Path]]): YAML files and/or directories
+        section (str): Top-level key holding the task list
+        workers (Optional[int]): Worker processes (defaults to one per CPU, capped at the file count)
+
+    Returns:
+        TaskTable: All tasks from all files (files that fail to parse are skipped)
+    """
+    files = [str(path) for path in discover_task_files(paths)]
+    if not files:
+        return TaskTable.empty()
+
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    if workers <= 1:
+        results = [_safe_load_file_table(path, section) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_safe_load_file_table, files, [section] * len(files)))
+
+    return TaskTable.concat(results)
+
+
+def _safe_load_file_table(path: str, section: str) -> TaskTable:
+    try:
+        return _load_file_table(path, section)
+    except FileNotFoundError:
+        print(f"Error: File '{path}' not found")
+    except yaml.YAMLError as e:
+        print(f"Error parsing YAML file '{path}': {e}")
+    return TaskTable.empty()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream tasks from large or multiple task YAML files")
+    parser.add_argument('paths', nargs='+', help="Task YAML files or directories")
+    parser.add_argument('--section', default='tasks', help="Top-level key holding the task list")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for multiple files")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Tasks per scoring chunk (single file)")
+    parser.add_argument('--top', type=int, default=10, help="Number of top tasks to show")
+    args = parser.parse_args()
+
+    files = discover_task_files(args.paths)
+    if len(files) == 1:
+        try:
+            top = top_tasks_streaming(str(files[0]), {}, args.top, args.chunk_size, args.section)
+        except FileNotFoundError:
+            print(f"Error: File '{files[0]}' not found")
+            sys.exit(1)
+        except yaml.YAMLError as e:
+            print(f"Error parsing YAML file: {e}")
+            sys.exit(1)
+    else:
+        table = load_task_tables(files, args.section, args.workers)
+        print(f"Ingested {len(table)} tasks from {len(files)} files")
+        names, scores, order = rank_task_indices(table, {})
+        top = [(names[i], scores[i]) for i in order[:args.top].tolist()]
+
+    for i, (task_name, score) in enumerate(top, 1):
+        print(f"{i:>3}. {task_name[:60]:<60} {score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+import logging
+import sys
+from array import array
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Growth dimensions shared by task and goal `distribution` / `expectedMultiplier` blocks
+DISTRIBUTION_KEYS = ('power', 'relationships', 'intellect', 'spirituality', 'mobility', 'discovery')
+
+# Numeric columns: (column name, YAML section, YAML key)
+NUMERIC_FIELDS = (
+    ('core_percentage', 'coreAlignment', 'percentage'),
+    ('effort_complexity', 'magnitude', 'effortComplexity'),
+    ('goal_impact', 'magnitude', 'goalImpact'),
+    ('personal_impact', 'magnitude', 'personalImpact'),
+    ('external_impact', 'magnitude', 'externalImpact'),
+    ('organization_value', 'organization', 'value'),
+    ('due_in_days', 'timeframe', 'dueInDays'),
+)
+
+# Numeric columns that hold NaN when the key is absent, so an explicit 0 is not mistaken for "unset"
+NAN_WHEN_MISSING = ('goal_impact',)
+
+# Text columns: (column name, YAML section or None for top level, YAML key)
+TEXT_FIELDS = (
+    ('description', None, 'description'),
+    ('completion_criteria', 'criteria', 'completionCriteria'),
+    ('expected', 'timeframe', 'expected'),
+)
+
+# Low-cardinality string columns stored as int16 codes: (column name, YAML section, YAML key)
+CATEGORY_FIELDS = (
+    ('core_type', 'coreAlignment', 'type'),
+    ('confidence', 'timeframe', 'confidence'),
+)
+
+# Legacy criteria keys (as returned by parse_tasks_from_yaml) mapped to columns
+CRITERIA_COLUMNS = {
+    'corePercentage': 'core_percentage',
+    'effortComplexity': 'effort_complexity',
+    'organizationValue': 'organization_value',
+    'dueInDays': 'due_in_days',
+}
+
+
+def _section(record: Dict[str, Any], section: Optional[str]) -> Dict[str, Any]:
+    if section is None:
+        return record
+    value = record.get(section)
+    return value if isinstance(value, dict) else {}
+
+
+def _number(value: Any, title: str = '', field: str = '') -> float:
+    """Coerce a YAML value to float; numeric strings are parsed, anything else warns and becomes 0."""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    logger.warning("Task '%s': non-numeric %s value %r treated as 0", title, field, value)
+    return 0.0
+
+
+def _compact(values: np.ndarray) -> np.ndarray:
+    """Downcast a float64 column to the smallest integer type that holds it exactly."""
+    if values.size == 0 or not np.all(np.isfinite(values)) or not np.array_equal(values, np.trunc(values)):
+        return values
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if values.min() >= info.min and values.max() <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+def _pack_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into one UTF-8 buffer plus character offsets."""
+    lengths = np.fromiter((len(value) for value in values), dtype=np.int64, count=len(values))
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    blob = np.frombuffer(''.join(values).encode('utf-8'), dtype=np.uint8)
+    return blob, offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    text = blob.tobytes().decode('utf-8')
+    bounds = offsets.tolist()
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+class TaskRow:
+    """
+    Lightweight view of one row of a TaskTable.
+
+    Supports the legacy criteria keys (`row['corePercentage']`) so rows can be used
+    wherever a parse_tasks_from_yaml criteria dict was expected.
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'TaskTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        column = CRITERIA_COLUMNS.get(key, key)
+        return self._table.value(column, self._index)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._table.value(name, self._index)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def distribution(self) -> Dict[str, Any]:
+        return dict(zip(DISTRIBUTION_KEYS, self._table.distribution[self._index].tolist()))
+
+    @property
+    def expected_multiplier(self) -> Dict[str, float]:
+        return dict(zip(DISTRIBUTION_KEYS, self._table.expected_multiplier[self._index].tolist()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the row as a plain dict of column values."""
+        row = {name: self._table.value(name, self._index) for name in self._table.scalar_columns()}
+        row['distribution'] = self.distribution
+        row['expected_multiplier'] = self.expected_multiplier
+        return row
+
+    def __repr__(self) -> str:
+        return f"TaskRow(id={self.id}, title={self.title!r})"
+
+
+class TaskTable:
+    """
+    Columnar store of tasks (or goals) parsed from YAML.
+
+    Numeric criteria are kept in typed parallel NumPy arrays, text in Python lists
+    and low-cardinality strings as int16 codes. Rows are identified by a unique `id`
+    column, so tasks sharing a title are all kept.
+    """
+
+    def __init__(self, titles: List[str], ids: np.ndarray, numeric: Dict[str, np.ndarray],
+                 text: Dict[str, List[str]], codes: Dict[str, np.ndarray],
+                 categories: Dict[str, List[str]], distribution: np.ndarray,
+                 expected_multiplier: np.ndarray):
+        self.titles = titles
+        self.ids = ids
+        self.numeric = numeric
+        self.text = text
+        self.codes = codes
+        self.categories = categories
+        self.distribution = distribution
+        self.expected_multiplier = expected_multiplier
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], first_id: int = 0) -> 'TaskTable':
+        """
+        Build a table from raw YAML task (or goal) mappings.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Task mappings as loaded from YAML
+            first_id (int): Id assigned to the first row
+
+        Returns:
+            TaskTable: Table holding every record
+        """
+        builder = TaskTableBuilder(first_id)
+        for record in records:
+            builder.append(record)
+        return builder.build()
+
+    @classmethod
+    def empty(cls) -> 'TaskTable':
+        return TaskTableBuilder().build()
+
+    @classmethod
+    def concat(cls, tables: Sequence['TaskTable']) -> 'TaskTable':
+        """
+        Concatenate tables, renumbering ids so they stay unique.
+
+        Args:
+            tables (Sequence[TaskTable]): Tables to join, in order
+
+        Returns:
+            TaskTable: Combined table
+        """
+        tables = [table for table in tables if len(table)]
+        if not tables:
+            return cls.empty()
+        if len(tables) == 1:
+            return tables[0]
+
+        titles = [title for table in tables for title in table.titles]
+        numeric = {
+            name: np.concatenate([table.numeric[name] for table in tables])
+            for name, _, _ in NUMERIC_FIELDS
+        }
+        text = {
+            name: [value for table in tables for value in table.text[name]]
+            for name, _, _ in TEXT_FIELDS
+        }
+        codes = {}
+        categories = {}
+        for name, _, _ in CATEGORY_FIELDS:
+            lookup = {'': 0}
+            parts = []
+            for table in tables:
+                remap = np.array([lookup.setdefault(label, len(lookup)) for label in table.categories[name]], dtype=np.int16)
+                parts.append(remap[table.codes[name]])
+            codes[name] = np.concatenate(parts)
+            categories[name] = sorted(lookup, key=lookup.get)
+
+        return cls(
+            titles=titles,
+            ids=np.arange(len(titles), dtype=np.int64) + int(tables[0].ids[0]),
+            numeric=numeric,
+            text=text,
+            codes=codes,
+            categories=categories,
+            distribution=np.concatenate([table.distribution for table in tables]),
+            expected_multiplier=np.concatenate([table.expected_multiplier for table in tables]),
+        )
+
+    def take(self, indices: Sequence[int]) -> 'TaskTable':
+        """Return a new table holding the given rows, keeping their ids."""
+        indices = np.asarray(indices, dtype=np.int64)
+        positions = indices.tolist()
+        return TaskTable(
+            titles=[self.titles[i] for i in positions],
+            ids=self.ids[indices],
+            numeric={name: column[indices] for name, column in self.numeric.items()},
+            text={name: [column[i] for i in positions] for name, column in self.text.items()},
+            codes={name: column[indices] for name, column in self.codes.items()},
+            categories={name: list(labels) for name, labels in self.categories.items()},
+            distribution=self.distribution[indices],
+            expected_multiplier=self.expected_multiplier[indices],
+        )
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self) -> Iterator[TaskRow]:
+        return (TaskRow(self, i) for i in range(len(self)))
+
+    def row(self, index: int) -> TaskRow:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return TaskRow(self, index)
+
+    def items(self) -> Iterator[Tuple[str, TaskRow]]:
+        """Yield (title, row) pairs, mirroring dict.items() on the legacy task dict."""
+        return ((title, TaskRow(self, i)) for i, title in enumerate(self.titles))
+
+    def scalar_columns(self) -> List[str]:
+        return (['id', 'title']
+                + [name for name, _, _ in NUMERIC_FIELDS]
+                + [name for name, _, _ in TEXT_FIELDS]
+                + [name for name, _, _ in CATEGORY_FIELDS])
+
+    def column(self, name: str) -> Any:
+        """Return a whole column by name (legacy criteria keys are accepted)."""
+        name = CRITERIA_COLUMNS.get(name, name)
+        if name == 'id':
+            return self.ids
+        if name == 'title':
+            return self.titles
+        for store in (self.numeric, self.text, self.codes):
+            if name in store:
+                return store[name]
+        if name in ('distribution', 'expected_multiplier'):
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def value(self, name: str, index: int) -> Any:
+        """Return a single cell as a plain Python value."""
+        if name == 'id':
+            return int(self.ids[index])
+        if name == 'title':
+            return self.titles[index]
+        if name in self.numeric:
+            return self.numeric[name][index].item()
+        if name in self.text:
+            return self.text[name][index]
+        if name in self.codes:
+            return self.categories[name][self.codes[name][index]]
+        raise KeyError(name)
+
+    def criteria_matrix(self) -> np.ndarray:
+        """Return the (n_tasks, 4) float64 matrix of the legacy criteria, in CRITERIA_COLUMNS order."""
+        return np.column_stack(
+            [self.numeric[column].astype(np.float64) for column in CRITERIA_COLUMNS.values()]
+        ).reshape(len(self), len(CRITERIA_COLUMNS))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate total memory held by the table, including string objects."""
+        total = self.ids.nbytes + self.distribution.nbytes + self.expected_multiplier.nbytes
+        total += sum(column.nbytes for column in self.numeric.values())
+        total += sum(column.nbytes for column in self.codes.values())
+        for column in [self.titles, *self.text.values()]:
+            total += sys.getsizeof(column) + sum(sys.getsizeof(value) for value in column)
+        return total
+
+    @property
+    def criteria_nbytes(self) -> int:
+        """Memory held by the titles and the four legacy criteria columns alone."""
+        total = sys.getsizeof(self.titles) + sum(sys.getsizeof(title) for title in self.titles)
+        return total + sum(self.numeric[column].nbytes for column in CRITERIA_COLUMNS.values())
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Flatten the table into plain NumPy arrays (no object dtypes) for binary storage.
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays accepted by TaskTable.from_arrays
+        """
+        arrays = {
+            'ids': self.ids,
+            'distribution': self.distribution,
+            'expected_multiplier': self.expected_multiplier,
+        }
+        for name, column in self.numeric.items():
+            arrays[f'numeric.{name}'] = column
+        for name, column in self.codes.items():
+            arrays[f'codes.{name}'] = column
+        for name, values in [('title', self.titles), *self.text.items(),
+                             *((f'categories.{name}', labels) for name, labels in self.categories.items())]:
+            arrays[f'{name}.blob'], arrays[f'{name}.offsets'] = _pack_strings(values)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'TaskTable':
+        """
+        Rebuild a table from the output of to_arrays.
+
+        Args:
+            arrays (Dict[str, np.ndarray]): Arrays keyed as written by to_arrays
+
+        Returns:
+            TaskTable: The reconstructed table
+        """
+        def strings(name: str) -> List[str]:
+            return _unpack_strings(arrays[f'{name}.blob'], arrays[f'{name}.offsets'])
+
+        return cls(
+            titles=strings('title'),
+            ids=arrays['ids'],
+            numeric={name: arrays[f'numeric.{name}'] for name, _, _ in NUMERIC_FIELDS},
+            text={name: strings(name) for name, _, _ in TEXT_FIELDS},
+            codes={name: arrays[f'codes.{name}'] for name, _, _ in CATEGORY_FIELDS},
+            categories={name: strings(f'categories.{name}') for name, _, _ in CATEGORY_FIELDS},
+            distribution=arrays['distribution'],
+            expected_multiplier=arrays['expected_multiplier'],
+        )
+
+    def memory_report(self) -> Dict[str, float]:
+        """
+        Measure the table's memory footprint.
+
+        Returns:
+            Dict[str, float]: Task count, total bytes and bytes per task for all fields,
+                plus criteria_bytes for the titles and four legacy criteria only
+        """
+        total = self.nbytes
+        criteria = self.criteria_nbytes
+        return {
+            'tasks': len(self),
+            'bytes': total,
+            'bytes_per_task': total / len(self) if len(self) else 0.0,
+            'criteria_bytes': criteria,
+            'criteria_bytes_per_task': criteria / len(self) if len(self) else 0.0,
+        }
+
+    def __repr__(self) -> str:
+        return f"TaskTable({len(self)} rows)"
+
+
+class TaskTableBuilder:
+    """Accumulates records into compact typed buffers and finalizes them into a TaskTable."""
+
+    def __init__(self, first_id: int = 0):
+        self.first_id = first_id
+        self.titles: List[str] = []
+        self.numeric = {name: array('d') for name, _, _ in NUMERIC_FIELDS}
+        self.text: Dict[str, List[str]] = {name: [] for name, _, _ in TEXT_FIELDS}
+        self.codes = {name: array('h') for name, _, _ in CATEGORY_FIELDS}
+        self.lookups: Dict[str, Dict[str, int]] = {name: {'': 0} for name, _, _ in CATEGORY_FIELDS}
+        self.distribution = array('d')
+        self.expected_multiplier = array('f')
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Normalize one YAML task mapping and append it to the buffers."""
+        title = str(record.get('title', 'Unknown Task'))
+        self.titles.append(title)
+
+        for name, section, key in NUMERIC_FIELDS:
+            default = np.nan if name in NAN_WHEN_MISSING else 0
+            self.numeric[name].append(_number(_section(record, section).get(key, default), title, key))
+
+        for name, section, key in TEXT_FIELDS:
+            value = _section(record, section).get(key)
+            self.text[name].append('' if value is None else str(value))
+
+        for name, section, key in CATEGORY_FIELDS:
+            value = _section(record, section).get(key)
+            label = '' if value is None else str(value)
+            lookup = self.lookups[name]
+            self.codes[name].append(lookup.setdefault(label, len(lookup)))
+
+        distribution = _section(record, 'distribution')
+        self.distribution.extend(_number(distribution.get(key, 0), title, key) for key in DISTRIBUTION_KEYS)
+
+        multipliers = _section(_section(record, 'organization'), 'expectedMultiplier')
+        self.expected_multiplier.extend(
+            _number(multipliers[key], title, key) if key in multipliers else 1.0 for key in DISTRIBUTION_KEYS
+        )
+
+    def build(self) -> TaskTable:
+        count = len(self.titles)
+        dims = len(DISTRIBUTION_KEYS)
+        return TaskTable(
+            titles=self.titles,
+            ids=np.arange(self.first_id, self.first_id + count, dtype=np.int64),
+            numeric={
+                name: _compact(np.frombuffer(buffer, dtype=np.float64).copy())
+                for name, buffer in self.numeric.items()
+            },
+            text=self.text,
+            codes={name: np.frombuffer(buffer, dtype=np.int16).copy() for name, buffer in self.codes.items()},
+            categories={name: sorted(lookup, key=lookup.get) for name, lookup in self.lookups.items()},
+            distribution=_compact(np.frombuffer(self.distribution, dtype=np.float64).copy()).reshape(count, dims),
+            expected_multiplier=np.frombuffer(self.expected_multiplier, dtype=np.float32).copy().reshape(count, dims),
+        )
+
+
+def unique_keys(titles: Iterable[str]) -> List[str]:
+    """
+    Stable identity for each title: the title itself, with ' [n]' appended to its n-th repeat.
+
+    A suffixed key skips any n that would collide with another title in the list or an
+    earlier key, so titles like "A", "A [2]", "A" map to "A", "A [2]", "A [3]".
+
+    Args:
+        titles (Iterable[str]): Titles in file order
+
+    Returns:
+        List[str]: One unique key per title
+    """
+    titles = list(titles)
+    taken = set(titles)
+    seen: Dict[str, int] = {}
+    keys = []
+    for title in titles:
+        seen[title] = seen.get(title, 0) + 1
+        key = title
+        if seen[title] > 1:
+            n = seen[title]
+            while f"{title} [{n}]" in taken:
+                n += 1
+            seen[title] = n
+            key = f"{title} [{n}]"
+            taken.add(key)
+        keys.append(key)
+    return keys
+
+
+def dict_nbytes(tasks_dict: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Approximate memory held by a parse_tasks_from_yaml dict-of-dicts, for comparison.
+
+    Args:
+        tasks_dict (Dict[str, Dict[str, Any]]): Dictionary of tasks and criteria
+
+    Returns:
+        int: Bytes held by the outer dict, task names, inner dicts and their values
+    """
+    total = sys.getsizeof(tasks_dict)
+    for task_name, criteria in tasks_dict.items():
+        total += sys.getsizeof(task_name) + sys.getsizeof(criteria)
+        total += sum(sys.getsizeof(value) for value in criteria.values())
+    return total
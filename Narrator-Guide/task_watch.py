@@ -0,0 +1,374 @@
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, List, Any, Iterator, Optional, Sequence, Set, Tuple
+
+import yaml
+
+from ranking_index import RankingIndex
+from task_parser import CRITERIA, EXAMPLE_WEIGHTS, YAML_LOADER, criteria_matrix
+from task_table import TaskTable
+
+# Quiet period after the last filesystem event before a change is processed
+DEBOUNCE_SECONDS = 0.2
+
+# Stat interval of the polling fallback
+POLL_SECONDS = 0.5
+
+# inotify(7) flags; the directory is watched so editors that save by rename are seen too
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+Event = Dict[str, Any]
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    """libc with inotify support, or None where it isn't available (non-Linux)."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    if not (hasattr(libc, 'inotify_init1') and hasattr(libc, 'inotify_add_watch')):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """
+    Wait for edits to a set of files, debounced.
+
+    Uses inotify on Linux (watching each file's directory, so atomic saves by
+    rename are caught) and falls back to polling os.stat elsewhere. Events are
+    collected until the files have been quiet for `debounce` seconds; a file is
+    reported only if its inode, mtime or size actually changed.
+    """
+
+    def __init__(self, paths: Sequence[str], debounce: float = DEBOUNCE_SECONDS,
+                 poll_interval: float = POLL_SECONDS, use_inotify: Optional[bool] = None):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.keys = {path: _stat_key(path) for path in self.paths}
+        self._fd = None
+        self._dirs: Dict[int, str] = {}
+
+        libc = _load_inotify() if use_inotify is not False else None
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+                for directory in sorted({os.path.dirname(path) for path in self.paths}):
+                    wd = libc.inotify_add_watch(fd, directory.encode(), WATCH_MASK)
+                    if wd < 0:
+                        self.close()
+                        break
+                    self._dirs[wd] = directory
+        if use_inotify and self._fd is None:
+            raise OSError("inotify is not available")
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._fd is not None else 'polling'
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read_events(self) -> Set[str]:
+        """Drain pending inotify events, returning the watched paths they touched."""
+        touched = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return touched
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += EVENT_HEADER.size + length
+                path = os.path.join(self._dirs.get(wd, ''), os.fsdecode(name))
+                if path in self.keys:
+                    touched.add(path)
+
+    def _wait_inotify(self, timeout: Optional[float]) -> bool:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        return bool(ready) and bool(self._read_events())
+
+    def _changed(self) -> Set[str]:
+        changed = set()
+        for path in self.paths:
+            key = _stat_key(path)
+            if key != self.keys[path]:
+                self.keys[path] = key
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Block until at least one watched file changed and edits have settled.
+
+        Args:
+            timeout (Optional[float]): Give up after this many seconds (None waits forever)
+
+        Returns:
+            Set[str]: Absolute paths of the files that changed (empty on timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._fd is not None:
+                if not self._wait_inotify(remaining):
+                    if remaining == 0.0:
+                        return set()
+                    continue
+                # Debounce: keep absorbing events until a quiet period
+                while self._wait_inotify(self.debounce):
+                    pass
+            else:
+                if not self._poll_once(remaining):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        return set()
+                    continue
+            changed = self._changed()
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+    def _poll_once(self, remaining: Optional[float]) -> bool:
+        """Sleep one poll interval; True once some file differs and has stopped changing."""
+        time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+        if all(_stat_key(path) == self.keys[path] for path in self.paths):
+            return False
+        # Debounce: wait until two stats in a row agree
+        while True:
+            before = [_stat_key(path) for path in self.paths]
+            time.sleep(self.debounce)
+            if before == [_stat_key(path) for path in self.paths]:
+                return True
+
+
+def _parse_table(path: str, section: str) -> TaskTable:
+    """Parse one YAML file, raising on errors instead of returning an empty table."""
+    with open(path, 'r', encoding='utf-8') as file:
+        data = yaml.load(file, Loader=YAML_LOADER)
+    if not isinstance(data, dict) or section not in data:
+        raise ValueError(f"No {section} found in {path}")
+    return TaskTable.from_records(data[section] or [])
+
+
+def _criteria_by_title(table: TaskTable) -> Dict[str, Tuple[float, ...]]:
+    """Title -> criteria tuple; a later task with the same title replaces an earlier one."""
+    names, matrix = criteria_matrix(table)
+    return dict(zip(names, map(tuple, matrix.tolist())))
+
+
+class LiveRanking:
+    """
+    Task ranking kept current as its source files change.
+
+    Tasks are identified by title, as in parse_tasks_from_yaml. When the task
+    file changes it is re-parsed, diffed against the previous snapshot, and only
+    added or changed tasks are rescored in the RankingIndex. The changes come
+    back as delta events, in an order that replays exactly: applying them one
+    by one to the previous ranking list yields the new one (a task that keeps
+    its position relative to the others gets no event, even if the insertions
+    or removals above it shift its rank number).
+    """
+
+    def __init__(self, tasks_file: str, goals_file: Optional[str] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.tasks_file = os.path.abspath(tasks_file)
+        self.goals_file = os.path.abspath(goals_file) if goals_file else None
+        self.weights = dict(weights or EXAMPLE_WEIGHTS)
+        self.criteria: Dict[str, Tuple[float, ...]] = _criteria_by_title(_parse_table(self.tasks_file, 'tasks'))
+        self.index = RankingIndex.from_tasks(
+            {title: dict(zip(CRITERIA, values)) for title, values in self.criteria.items()}, self.weights)
+        self.goals: Dict[str, Tuple] = self._load_goals() if self.goals_file else {}
+
+    def _load_goals(self) -> Dict[str, Tuple]:
+        table = _parse_table(self.goals_file, 'endGoals')
+        return {title: tuple(table.distribution[i].tolist()) for i, title in enumerate(table.titles)}
+
+    def refresh(self, changed: Set[str]) -> List[Event]:
+        """
+        Re-parse the changed source files and return the resulting events.
+
+        A file that fails to parse (for example, caught mid-save) yields one
+        'error' event and leaves the previous snapshot in place.
+
+        Args:
+            changed (Set[str]): Absolute paths reported by FileWatcher.wait
+
+        Returns:
+            List[Event]: Delta events
+        """
+        events: List[Event] = []
+        for path, apply in ((self.tasks_file, self.apply_tasks), (self.goals_file, self.apply_goals)):
+            if path is None or path not in changed:
+                continue
+            try:
+                events.extend(apply())
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                events.append({'type': 'error', 'file': path, 'message': ' '.join(str(e).split())})
+        return events
+
+    def apply_tasks(self) -> List[Event]:
+        """
+        Re-parse the task file and apply the difference to the ranking.
+
+        Returns:
+            List[Event]: removed events (by current rank), then moved/updated events for
+                changed tasks, then added events
+        """
+        criteria = _criteria_by_title(_parse_table(self.tasks_file, 'tasks'))
+        old = self.criteria
+        events: List[Event] = []
+
+        for title in old.keys() - criteria.keys():
+            events.append({'type': 'removed', 'title': title, 'rank': self.index.rank_of(title)})
+            self.index.remove(title)
+
+        for title, values in criteria.items():
+            previous = old.get(title)
+            if previous is None or previous == values:
+                continue
+            from_rank = self.index.rank_of(title)
+            score = self.index.upsert(title, dict(zip(CRITERIA, values)))
+            to_rank = self.index.rank_of(title)
+            if to_rank != from_rank:
+                events.append({'type': 'moved', 'title': title, 'from_rank': from_rank, 'to_rank': to_rank,
+                               'score': score})
+            else:
+                events.append({'type': 'updated', 'title': title, 'rank': to_rank, 'score': score})
+
+        for title, values in criteria.items():
+            if title not in old:
+                score = self.index.upsert(title, dict(zip(CRITERIA, values)))
+                events.append({'type': 'added', 'title': title, 'rank': self.index.rank_of(title), 'score': score})
+
+        self.criteria = criteria
+        return events
+
+    def apply_goals(self) -> List[Event]:
+        """
+        Re-parse the goal file and report goals added, removed or changed (by distribution).
+
+        Returns:
+            List[Event]: goal_removed, goal_updated and goal_added events
+        """
+        goals = self._load_goals()
+        events = [{'type': 'goal_removed', 'title': title} for title in self.goals.keys() - goals.keys()]
+        events += [{'type': 'goal_updated', 'title': title} for title, values in goals.items()
+                   if title in self.goals and self.goals[title] != values]
+        events += [{'type': 'goal_added', 'title': title} for title in goals.keys() - self.goals.keys()]
+        self.goals = goals
+        return events
+
+
+def watch(live: LiveRanking, watcher: FileWatcher) -> Iterator[Tuple[float, List[Event]]]:
+    """
+    Yield (seconds spent re-parsing and re-ranking, events) after every settled change.
+
+    Args:
+        live (LiveRanking): Ranking to keep current
+        watcher (FileWatcher): Watcher over the same files
+
+    Yields:
+        Tuple[float, List[Event]]: Processing time and the delta events (possibly empty)
+    """
+    while True:
+        changed = watcher.wait()
+        started = time.perf_counter()
+        events = live.refresh(changed)
+        yield time.perf_counter() - started, events
+
+
+def format_event(event: Event) -> str:
+    """One human-readable log line for an event."""
+    kind = event['type']
+    if kind == 'added':
+        return f"+ #{event['rank']:<5} {event['title']} ({event['score']:.3f})"
+    if kind == 'removed':
+        return f"- #{event['rank']:<5} {event['title']}"
+    if kind == 'moved':
+        arrow = '↑' if event['to_rank'] < event['from_rank'] else '↓'
+        return f"{arrow} #{event['from_rank']} -> #{event['to_rank']} {event['title']} ({event['score']:.3f})"
+    if kind == 'updated':
+        return f"~ #{event['rank']:<5} {event['title']} ({event['score']:.3f})"
+    if kind == 'error':
+        return f"! {os.path.basename(event['file'])}: {event['message']}"
+    return f"{kind.replace('_', ' ')}: {event['title']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch task/goal YAML files and stream ranking changes")
+    parser.add_argument('tasks_file', nargs='?', default='example_task.yaml', help="Task YAML file")
+    parser.add_argument('goals_file', nargs='?', default='Goal_Nodes.yaml', help="Goal YAML file ('' to skip)")
+    parser.add_argument('--jsonl', action='store_true', help="Emit one JSON event per line instead of a log")
+    parser.add_argument('--poll', action='store_true', help="Poll file stats instead of using inotify")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS, help="Quiet seconds before processing")
+    parser.add_argument('--top', type=int, default=10, help="Tasks shown at startup (log mode)")
+    args = parser.parse_args()
+
+    goals_file = args.goals_file if args.goals_file and os.path.exists(args.goals_file) else None
+    try:
+        live = LiveRanking(args.tasks_file, goals_file)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    paths = [live.tasks_file] + ([live.goals_file] if live.goals_file else [])
+    watcher = FileWatcher(paths, args.debounce, use_inotify=False if args.poll else None)
+
+    if not args.jsonl:
+        print(f"Watching {', '.join(os.path.basename(path) for path in paths)} ({watcher.backend}), "
+              f"{len(live.index)} tasks")
+        for rank, (task_name, score) in enumerate(live.index.top(args.top), 1):
+            print(f"  #{rank:<5} {task_name} ({score:.3f})")
+
+    try:
+        for seconds, events in watch(live, watcher):
+            if args.jsonl:
+                stamp = time.time()
+                for event in events:
+                    print(json.dumps({'time': stamp, **event}), flush=True)
+                continue
+            if not events:
+                continue
+            print(f"[{time.strftime('%H:%M:%S')}] {len(events)} change(s) in {seconds * 1000:.1f} ms")
+            for event in events:
+                print(f"  {format_event(event)}")
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()
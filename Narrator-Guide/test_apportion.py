@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+from apportion import APPORTION_METHODS, QUARTER_HOURS_PER_DAY, TWENTIETHS, apportion
+from task_parser import distribute_scores
+
+
+def dhondt_reference(scores: np.ndarray, slots: int) -> np.ndarray:
+    """Slot-by-slot highest averages from zero, ties to the earlier task."""
+    allocation = np.zeros(len(scores), dtype=np.int64)
+    for _ in range(slots):
+        allocation[int(np.argmax(scores / (allocation + 1)))] += 1
+    return allocation
+
+
+@pytest.mark.parametrize('method', APPORTION_METHODS)
+def test_allocation_sums_exactly(method: str) -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        count = int(rng.integers(1, 40))
+        slots = int(rng.choice([TWENTIETHS, QUARTER_HOURS_PER_DAY, int(rng.integers(0, 500))]))
+        scores = rng.choice([rng.uniform(0, 30, count), rng.integers(0, 5, count).astype(float)])
+        allocation = apportion(scores, slots, method)
+        assert allocation.sum() == slots
+        assert (allocation >= 0).all()
+
+
+@pytest.mark.parametrize('method', APPORTION_METHODS)
+def test_bounds_are_respected(method: str) -> None:
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        count = int(rng.integers(2, 30))
+        low = rng.integers(0, 3, count)
+        high = low + rng.integers(0, 10, count)
+        slots = int(rng.integers(low.sum(), high.sum() + 1))
+        allocation = apportion(rng.uniform(0, 10, count), slots, method, minimum=low, maximum=high)
+        assert allocation.sum() == slots
+        assert (allocation >= low).all() and (allocation <= high).all()
+
+
+def test_largest_remainder_stays_within_one_of_quota() -> None:
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        scores = rng.uniform(0, 10, int(rng.integers(1, 50)))
+        slots = int(rng.integers(1, 700))
+        quotas = scores * slots / scores.sum()
+        allocation = apportion(scores, slots, 'largest_remainder')
+        assert all(math.floor(q) <= a <= math.ceil(q) for q, a in zip(quotas.tolist(), allocation.tolist()))
+
+
+def test_dhondt_matches_slot_by_slot_reference() -> None:
+    rng = np.random.default_rng(3)
+    for _ in range(100):
+        scores = rng.uniform(0.1, 10, int(rng.integers(1, 30)))
+        slots = int(rng.integers(0, 200))
+        assert apportion(scores, slots, 'dhondt').tolist() == dhondt_reference(scores, slots).tolist()
+
+
+def test_infeasible_bounds_raise() -> None:
+    with pytest.raises(ValueError):
+        apportion([1.0, 2.0], 5, minimum=3)
+    with pytest.raises(ValueError):
+        apportion([1.0, 2.0], 5, maximum=2)
+    with pytest.raises(ValueError):
+        apportion([1.0], 3, method='unknown')
+
+
+def test_distribute_scores_hands_out_every_part() -> None:
+    rng = np.random.default_rng(4)
+    task_scores = [(f"Task {i}", float(score)) for i, score in enumerate(rng.uniform(0, 20, 37))]
+    for parts in (TWENTIETHS, QUARTER_HOURS_PER_DAY, 7):
+        distribution = distribute_scores(task_scores, parts)
+        assert sum(row[2] for row in distribution) == parts
+        assert sorted(row[0] for row in distribution) == sorted(name for name, _ in task_scores)
@@ -0,0 +1,39 @@
+from typing import Dict, List, Any
+
+import pytest
+
+from goal_graph import GoalGraph
+from task_parser import EXAMPLE_WEIGHTS
+from task_table import TaskTable
+
+
+def record(title: str, distribution: Dict[str, int], **magnitude: Any) -> Dict[str, Any]:
+    return {
+        'title': title,
+        'coreAlignment': {'percentage': 50},
+        'magnitude': {'effortComplexity': 5, **magnitude},
+        'organization': {'value': 5},
+        'timeframe': {'dueInDays': 3},
+        'distribution': distribution,
+    }
+
+
+def graph(tasks: List[Dict[str, Any]], goals: List[Dict[str, Any]]) -> GoalGraph:
+    return GoalGraph(TaskTable.from_records(tasks), TaskTable.from_records(goals), EXAMPLE_WEIGHTS)
+
+
+def test_repeated_goal_titles_do_not_shadow_a_literal_key() -> None:
+    goals = [record('X', {'power': 1}), record('X [2]', {'intellect': 1}), record('X', {'discovery': 1})]
+    tasks = [record('Lift', {'power': 1}), record('Read', {'intellect': 1}), record('Explore', {'discovery': 1})]
+    linked = graph(tasks, goals)
+    assert linked.goal_keys == ['X', 'X [2]', 'X [3]']
+    assert [linked.top_tasks(key)[0][0] for key in linked.goal_keys] == ['Lift', 'Read', 'Explore']
+    assert sorted(goal['goal'] for goal in linked.goal_summary()) == ['X', 'X [2]', 'X [3]']
+
+
+def test_explicit_zero_goal_impact_is_kept() -> None:
+    tasks = [record('Missing', {'power': 1}), record('Zero', {'power': 1}, goalImpact=0),
+             record('Three', {'power': 1}, goalImpact=3)]
+    linked = graph(tasks, [record('Strength', {'power': 1})])
+    assert linked.goal_impact.tolist() == [1.0, 0.0, 3.0]
+    assert linked.progress.tolist() == pytest.approx([4.0])
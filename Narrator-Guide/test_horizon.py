@@ -0,0 +1,49 @@
+import random
+from typing import Dict, List, Any
+
+import numpy as np
+
+from horizon import URGENCY_TABLE_MAX_DAYS, horizon_ranks, horizon_scores
+from task_parser import EXAMPLE_WEIGHTS, calculate_task_score, extract_criteria, score_tasks_batch
+
+
+def random_tasks(count: int, due_choices: List[Any], seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(seed)
+    records = [
+        {
+            'title': f"Task {i}",
+            'coreAlignment': {'percentage': rng.randint(0, 100)},
+            'magnitude': {'effortComplexity': rng.randint(0, 10)},
+            'organization': {'value': rng.randint(0, 10)},
+            'timeframe': {'dueInDays': rng.choice(due_choices)},
+        }
+        for i in range(count)
+    ]
+    return dict(extract_criteria(record) for record in records)
+
+
+def test_day_zero_matches_batch_scores_with_overdue_tasks() -> None:
+    tasks = random_tasks(200, [0, -1, -5, -30, 1, 3, 7, 14, 45])
+    names, scores = horizon_scores(tasks, EXAMPLE_WEIGHTS, 30)
+    batch_names, batch_scores = score_tasks_batch(tasks, EXAMPLE_WEIGHTS)
+    assert names == batch_names
+    assert scores[:, 0].tolist() == batch_scores.tolist()
+
+
+def test_overdue_tasks_stay_active_and_due_tasks_drop_out() -> None:
+    tasks = random_tasks(100, [-3, 0, 4], seed=1)
+    names, scores = horizon_scores(tasks, EXAMPLE_WEIGHTS, 10)
+    due = np.array([tasks[name]['dueInDays'] for name in names])
+    assert not np.isnan(scores[due <= 0]).any()
+    assert not np.isnan(scores[due == 4, :4]).any()
+    assert np.isnan(scores[due == 4, 4:]).all()
+    # An overdue task only gets more urgent
+    assert (np.diff(scores[due < 0], axis=1) > 0).all()
+    assert (horizon_ranks(scores)[due <= 0] > 0).all()
+
+
+def test_far_due_dates_skip_the_lookup_table() -> None:
+    tasks = random_tasks(20, [2, 10, URGENCY_TABLE_MAX_DAYS * 100], seed=2)
+    names, scores = horizon_scores(tasks, EXAMPLE_WEIGHTS, 5)
+    expected = [calculate_task_score(tasks[name], EXAMPLE_WEIGHTS) for name in names]
+    np.testing.assert_allclose(scores[:, 0], expected, rtol=1e-12)
@@ -0,0 +1,40 @@
+import asyncio
+import json
+from typing import Dict, Any
+
+import pytest
+
+from parse_cache import ParseCache
+from scoring_service import INVALID_PARAMS, ScoringService
+from synth_data import write_task_yaml
+
+
+@pytest.fixture
+def service(tmp_path) -> ScoringService:
+    tasks_file = str(tmp_path / 'tasks.yaml')
+    write_task_yaml(tasks_file, 20, seed=0)
+    service = ScoringService(tasks_file, cache=ParseCache(tmp_path / 'cache', enabled=False))
+    service.snapshot = service.build()
+    return service
+
+
+def call(service: ScoringService, method: str, params: Any) -> Dict[str, Any]:
+    return json.loads(asyncio.run(service.handle({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params})))
+
+
+@pytest.mark.parametrize('method, params', [
+    ('rank', {'limit': '2'}),
+    ('rank', [1, 2.5]),
+    ('rank', {'offset': True}),
+    ('distribution', {'parts': None}),
+    ('breakdown', {'title': 3}),
+    ('goal', {'goal': ['x'], 'k': 1}),
+])
+def test_wrong_typed_params_are_invalid_params(service: ScoringService, method: str, params: Any) -> None:
+    response = call(service, method, params)
+    assert response['error']['code'] == INVALID_PARAMS
+
+
+def test_well_typed_params_succeed(service: ScoringService) -> None:
+    assert 'result' in call(service, 'rank', {'limit': 2, 'offset': 1})
+    assert 'result' in call(service, 'distribution', [10, 'dhondt'])
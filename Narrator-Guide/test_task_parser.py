@@ -0,0 +1,93 @@
+import random
+from typing import Dict, List, Any
+
+import numpy as np
+import pytest
+
+from task_parser import (
+    CRITERIA, EXAMPLE_WEIGHTS, calculate_task_score, extract_criteria, rank_tasks_by_layer, rank_tasks_by_score,
+    score_tasks_batch, skyline_layers,
+)
+from task_table import TaskTable
+
+
+def random_records(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """YAML-shaped task mappings with a mix of integer and float criteria, including no due date."""
+    rng = random.Random(seed)
+    return [
+        {
+            'title': f"Task {i}",
+            'coreAlignment': {'percentage': rng.choice([rng.randint(0, 100), rng.uniform(0, 100)])},
+            'magnitude': {'effortComplexity': rng.randint(0, 10)},
+            'organization': {'value': rng.choice([rng.randint(0, 15), rng.uniform(0, 12)])},
+            'timeframe': {'dueInDays': rng.choice([0, rng.randint(1, 60), rng.uniform(0.5, 30)])},
+        }
+        for i in range(count)
+    ]
+
+
+def test_batch_scores_equal_scalar_scores() -> None:
+    tasks = dict(extract_criteria(record) for record in random_records(500))
+    weights = {'corePercentage': 0.7, 'effortComplexity': 1.9, 'organizationValue': 2.3, 'dueInDays': 0.4}
+    for w in (weights, EXAMPLE_WEIGHTS, {}):
+        names, scores = score_tasks_batch(tasks, w)
+        assert names == list(tasks)
+        assert scores.tolist() == [calculate_task_score(tasks[name], w) for name in names]
+
+
+def test_batch_scores_equal_scalar_scores_for_task_table() -> None:
+    records = random_records(300, seed=1)
+    table = TaskTable.from_records(records)
+    names, scores = score_tasks_batch(table, EXAMPLE_WEIGHTS)
+    expected = [calculate_task_score(extract_criteria(record)[1], EXAMPLE_WEIGHTS) for record in records]
+    assert names == [record['title'] for record in records]
+    assert scores.tolist() == expected
+
+
+def test_rank_orders_by_score() -> None:
+    tasks = dict(extract_criteria(record) for record in random_records(200, seed=2))
+    ranked = rank_tasks_by_score(tasks, EXAMPLE_WEIGHTS)
+    assert sorted(name for name, _ in ranked) == sorted(tasks)
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+    for name, score in ranked:
+        assert score == calculate_task_score({key: tasks[name][key] for key in CRITERIA}, EXAMPLE_WEIGHTS)
+
+
+def skyline_reference(points: np.ndarray) -> np.ndarray:
+    """Pareto layers by comparing every pair: one more than the deepest dominating point."""
+    dominates = (points[:, None, :] >= points[None, :, :]).all(axis=2) & \
+        (points[:, None, :] > points[None, :, :]).any(axis=2)
+    layers = np.zeros(len(points), dtype=np.int64)
+    # A dominating point has a strictly larger sum, so it is resolved first
+    for i in np.argsort(-points.sum(axis=1), kind='stable').tolist():
+        dominators = np.flatnonzero(dominates[:, i])
+        layers[i] = 1 + (layers[dominators].max() if len(dominators) else 0)
+    return layers
+
+
+def test_skyline_layers_match_pairwise_reference() -> None:
+    rng = np.random.default_rng(5)
+    for _ in range(100):
+        count = int(rng.integers(1, 120))
+        if rng.random() < 0.5:
+            points = rng.integers(0, int(rng.integers(1, 6)), size=(count, 4)).astype(np.float64)
+        else:
+            # Distinct floats in every column; few points keep the dominance grid small
+            points = rng.random((min(count, 25), 4))
+        assert skyline_layers(points).tolist() == skyline_reference(points).tolist()
+
+
+def test_skyline_layers_edge_cases() -> None:
+    assert skyline_layers(np.zeros((0, 4))).tolist() == []
+    assert skyline_layers(np.ones((3, 4))).tolist() == [1, 1, 1]
+    with pytest.raises(ValueError):
+        skyline_layers(np.zeros((2, 3)))
+
+
+def test_rank_by_layer_orders_scores_within_layers() -> None:
+    tasks = dict(extract_criteria(record) for record in random_records(150, seed=6))
+    ranked = rank_tasks_by_layer(tasks, EXAMPLE_WEIGHTS)
+    assert sorted(name for name, _, _ in ranked) == sorted(tasks)
+    keys = [(layer, -score) for _, layer, score in ranked]
+    assert keys == sorted(keys)
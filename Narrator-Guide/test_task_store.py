@@ -0,0 +1,107 @@
+import random
+from typing import Dict, List, Any, Set, Tuple
+
+import pytest
+import yaml
+
+from synth_data import write_task_yaml
+from task_parser import calculate_task_score, extract_criteria
+from task_store import TaskStore
+
+
+def load_section(path: str, section: str) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as file:
+        return yaml.safe_load(file)[section]
+
+
+def save_section(path: str, section: str, records: List[Dict[str, Any]]) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        yaml.safe_dump({section: records}, file)
+
+
+def scores(store: TaskStore) -> Dict[Tuple[str, str], float]:
+    return {(row['source'], row['key']): row['score']
+            for table in ('tasks', 'goals')
+            for row in store.conn.execute(f'SELECT source, key, score FROM {table}')}
+
+
+def links(store: TaskStore) -> Set[Tuple[str, str, float]]:
+    rows = store.conn.execute(
+        'SELECT t.key AS task, g.key AS goal, l.affinity FROM task_goals l '
+        'JOIN tasks t ON t.id = l.task_id JOIN goals g ON g.id = l.goal_id')
+    return {(row['task'], row['goal'], round(row['affinity'], 12)) for row in rows}
+
+
+def edit(rng: random.Random, records: List[Dict[str, Any]]) -> None:
+    """Remove, duplicate (same title) and change a few records in place."""
+    for _ in range(rng.randint(1, 3)):
+        records.pop(rng.randrange(len(records)))
+    records.append(dict(records[rng.randrange(len(records))]))
+    for _ in range(rng.randint(1, 5)):
+        record = records[rng.randrange(len(records))]
+        record['timeframe'] = dict(record.get('timeframe') or {}, dueInDays=rng.randint(0, 30))
+        record['distribution'] = {key: rng.randint(0, 10) for key in (record.get('distribution') or {'power': 0})}
+
+
+def test_incremental_imports_match_fresh_import(tmp_path) -> None:
+    tasks_file, goals_file = str(tmp_path / 'tasks.yaml'), str(tmp_path / 'goals.yaml')
+    write_task_yaml(tasks_file, 120, seed=1)
+    write_task_yaml(goals_file, 8, seed=2, goals=True)
+    rng = random.Random(3)
+    weights = {'corePercentage': 2.0, 'effortComplexity': 0.5, 'organizationValue': 1.5, 'dueInDays': 1.0}
+
+    with TaskStore(str(tmp_path / 'incremental.db')) as store:
+        store.import_yaml(tasks_file)
+        store.import_yaml(goals_file, 'endGoals')
+        for round_number in range(4):
+            tasks = load_section(tasks_file, 'tasks')
+            edit(rng, tasks)
+            save_section(tasks_file, 'tasks', tasks)
+            store.import_yaml(tasks_file)
+            if round_number == 1:
+                goals = load_section(goals_file, 'endGoals')
+                edit(rng, goals)
+                save_section(goals_file, 'endGoals', goals)
+                store.import_yaml(goals_file, 'endGoals')
+            if round_number == 2:
+                store.set_weights(weights)
+        incremental_scores, incremental_links = scores(store), links(store)
+
+    with TaskStore(str(tmp_path / 'fresh.db'), weights) as fresh:
+        fresh.import_yaml(tasks_file)
+        fresh.import_yaml(goals_file, 'endGoals')
+        assert scores(fresh) == incremental_scores
+        assert links(fresh) == incremental_links
+        assert incremental_links
+
+
+def test_stored_scores_equal_calculate_task_score(tmp_path) -> None:
+    tasks_file = str(tmp_path / 'tasks.yaml')
+    write_task_yaml(tasks_file, 60, seed=4)
+    records = load_section(tasks_file, 'tasks')
+    with TaskStore(str(tmp_path / 'store.db')) as store:
+        store.import_yaml(tasks_file)
+        stored = {row['title']: row['score'] for row in store.conn.execute('SELECT title, score FROM tasks')}
+        expected = dict(extract_criteria(record) for record in records)
+        assert stored == {title: calculate_task_score(criteria, store.weights)
+                          for title, criteria in expected.items()}
+
+
+def test_unchanged_file_is_skipped(tmp_path) -> None:
+    tasks_file = str(tmp_path / 'tasks.yaml')
+    write_task_yaml(tasks_file, 10, seed=5)
+    with TaskStore(str(tmp_path / 'store.db')) as store:
+        assert store.import_yaml(tasks_file)['added'] == 10
+        assert store.import_yaml(tasks_file)['skipped'] == 1
+        with pytest.raises(ValueError):
+            store.import_yaml(tasks_file, 'unknown')
+
+
+def test_suffixed_keys_skip_literal_titles(tmp_path) -> None:
+    tasks_file = str(tmp_path / 'tasks.yaml')
+    save_section(tasks_file, 'tasks', [{'title': title, 'timeframe': {'dueInDays': due}}
+                                       for due, title in enumerate(['A', 'A [2]', 'A'])])
+    with TaskStore(str(tmp_path / 'store.db')) as store:
+        assert store.import_yaml(tasks_file)['added'] == 3
+        rows = store.conn.execute('SELECT key, title, due_in_days FROM tasks ORDER BY key').fetchall()
+        assert [tuple(row) for row in rows] == [('A', 'A', 0), ('A [2]', 'A [2]', 1), ('A [3]', 'A', 2)]
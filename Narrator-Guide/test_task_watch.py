@@ -0,0 +1,99 @@
+import os
+import random
+from typing import Dict, List, Any
+
+import yaml
+
+from task_parser import EXAMPLE_WEIGHTS, parse_tasks_from_yaml, rank_tasks_by_score
+from task_watch import FileWatcher, LiveRanking
+
+
+def random_task(rng: random.Random, title: str) -> Dict[str, Any]:
+    return {
+        'title': title,
+        'coreAlignment': {'percentage': rng.randint(0, 100)},
+        'magnitude': {'effortComplexity': rng.randint(0, 10)},
+        'organization': {'value': rng.randint(0, 10)},
+        'timeframe': {'dueInDays': rng.randint(0, 30)},
+    }
+
+
+def write_tasks(path: str, tasks: List[Dict[str, Any]]) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        yaml.safe_dump({'tasks': tasks}, file)
+
+
+def replay(ranking: List[str], events: List[Dict[str, Any]]) -> List[str]:
+    """Apply delta events one by one to a ranked title list."""
+    ranking = list(ranking)
+    for event in events:
+        if event['type'] == 'removed':
+            assert ranking.pop(event['rank'] - 1) == event['title']
+        elif event['type'] == 'added':
+            ranking.insert(event['rank'] - 1, event['title'])
+        elif event['type'] == 'moved':
+            assert ranking.pop(event['from_rank'] - 1) == event['title']
+            ranking.insert(event['to_rank'] - 1, event['title'])
+        elif event['type'] == 'updated':
+            assert ranking[event['rank'] - 1] == event['title']
+    return ranking
+
+
+def test_delta_events_replay_exactly(tmp_path) -> None:
+    rng = random.Random(0)
+    path = str(tmp_path / 'tasks.yaml')
+    tasks = [random_task(rng, f"Task {i}") for i in range(40)]
+    write_tasks(path, tasks)
+    live = LiveRanking(path)
+    next_id = len(tasks)
+
+    for _ in range(25):
+        before = [title for title, _ in live.index.ranked()]
+        for _ in range(rng.randint(1, 6)):
+            edit = rng.random()
+            if edit < 0.3 and len(tasks) > 5:
+                tasks.pop(rng.randrange(len(tasks)))
+            elif edit < 0.6:
+                tasks.append(random_task(rng, f"Task {next_id}"))
+                next_id += 1
+            else:
+                i = rng.randrange(len(tasks))
+                tasks[i] = random_task(rng, tasks[i]['title'])
+        write_tasks(path, tasks)
+
+        events = live.apply_tasks()
+        after = [title for title, _ in live.index.ranked()]
+        assert replay(before, events) == after
+        expected = rank_tasks_by_score(parse_tasks_from_yaml(path), EXAMPLE_WEIGHTS)
+        assert sorted(score for _, score in live.index.ranked()) == sorted(score for _, score in expected)
+
+
+def test_unchanged_file_yields_no_events(tmp_path) -> None:
+    path = str(tmp_path / 'tasks.yaml')
+    write_tasks(path, [random_task(random.Random(1), f"Task {i}") for i in range(10)])
+    live = LiveRanking(path)
+    assert live.apply_tasks() == []
+
+
+def test_parse_error_keeps_previous_snapshot(tmp_path) -> None:
+    path = str(tmp_path / 'tasks.yaml')
+    write_tasks(path, [random_task(random.Random(2), f"Task {i}") for i in range(10)])
+    live = LiveRanking(path)
+    before = live.index.ranked()
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("tasks: [unclosed\n")
+
+    events = live.refresh({os.path.abspath(path)})
+    assert [event['type'] for event in events] == ['error']
+    assert live.index.ranked() == before
+
+
+def test_polling_watcher_reports_changed_file(tmp_path) -> None:
+    path = str(tmp_path / 'tasks.yaml')
+    other = str(tmp_path / 'goals.yaml')
+    write_tasks(path, [])
+    write_tasks(other, [])
+    watcher = FileWatcher([path, other], debounce=0.01, poll_interval=0.01, use_inotify=False)
+    assert watcher.wait(timeout=0.05) == set()
+    write_tasks(path, [random_task(random.Random(3), 'Task 0')])
+    assert watcher.wait(timeout=2.0) == {os.path.abspath(path)}
@@ -0,0 +1,318 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+
+from parse_cache import load_task_table_cached
+from task_parser import CRITERIA, EXAMPLE_WEIGHTS, Tasks, criteria_matrix, score_components
+
+# Below this many (tasks x weight vectors) cells the sweep runs in-process
+PARALLEL_THRESHOLD = 5_000_000
+
+# Working memory per block: a (tasks x vectors) block holds scores, argsort
+# order, ranks, differences and their float copies, about 48 bytes per cell
+CHUNK_MEMORY_BYTES = 256 * 1024 * 1024
+BYTES_PER_CELL = 48
+
+# Arrays shared by every block, set once per worker process by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def weight_grid(values: Dict[str, Sequence[float]]) -> np.ndarray:
+    """
+    Build the cartesian grid of weight vectors.
+
+    Args:
+        values (Dict[str, Sequence[float]]): Candidate values per criterion
+            (criteria left out stay at 1.0)
+
+    Returns:
+        np.ndarray: (n_vectors, 4) weight matrix in CRITERIA order
+    """
+    axes = [np.asarray(values.get(key, [1.0]), dtype=np.float64) for key in CRITERIA]
+    return np.array(list(itertools.product(*axes)), dtype=np.float64).reshape(-1, len(CRITERIA))
+
+
+def random_weights(count: int, low: float = 0.0, high: float = 4.0, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Sample weight vectors uniformly from [low, high) for every criterion.
+
+    Args:
+        count (int): Number of weight vectors
+        low (float): Lower bound of each weight
+        high (float): Upper bound of each weight
+        seed (Optional[int]): Random seed
+
+    Returns:
+        np.ndarray: (count, 4) weight matrix in CRITERIA order
+    """
+    return np.random.default_rng(seed).uniform(low, high, size=(count, len(CRITERIA)))
+
+
+def weights_matrix(weights: Dict[str, float]) -> np.ndarray:
+    """Convert a weights dict to a (1, 4) matrix in CRITERIA order."""
+    return np.array([[weights.get(key, 1.0) for key in CRITERIA]], dtype=np.float64)
+
+
+def sweep_scores(components: np.ndarray, weight_vectors: np.ndarray) -> np.ndarray:
+    """
+    Score every task under every weight vector as one matrix product.
+
+    Args:
+        components (np.ndarray): (n_tasks, 4) matrix from score_components
+        weight_vectors (np.ndarray): (n_vectors, 4) weight matrix
+
+    Returns:
+        np.ndarray: (n_tasks, n_vectors) score matrix
+    """
+    return components @ weight_vectors.T
+
+
+def sweep_ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    Convert a score matrix to 0-based ranks per column (ties keep task order).
+
+    Args:
+        scores (np.ndarray): (n_tasks, n_vectors) score matrix
+
+    Returns:
+        np.ndarray: (n_tasks, n_vectors) int32 rank matrix
+    """
+    n_tasks, n_vectors = scores.shape
+    order = np.argsort(-scores, axis=0, kind='stable')
+    ranks = np.empty((n_tasks, n_vectors), dtype=np.int32)
+    ranks[order, np.arange(n_vectors)] = np.arange(n_tasks, dtype=np.int32)[:, None]
+    return ranks
+
+
+def _sweep_chunk(components: np.ndarray, weight_vectors: np.ndarray,
+                 baseline_ranks: np.ndarray, top_k: int) -> Dict[str, np.ndarray]:
+    """Accumulate rank statistics for one block of weight vectors."""
+    ranks = sweep_ranks(sweep_scores(components, weight_vectors))
+    n_tasks = len(components)
+
+    diff = ranks - baseline_ranks[:, None]
+    if n_tasks > 1:
+        spearman = 1.0 - 6.0 * (diff.astype(np.float64) ** 2).sum(axis=0) / (n_tasks * (n_tasks ** 2 - 1))
+    else:
+        spearman = np.ones(len(weight_vectors))
+
+    in_top = ranks < top_k
+    baseline_top = baseline_ranks < top_k
+    overlap = (in_top & baseline_top[:, None]).sum(axis=0) / max(min(top_k, n_tasks), 1)
+
+    ranks_f = ranks.astype(np.float64)
+    return {
+        'count': np.array(len(weight_vectors)),
+        'rank_sum': ranks_f.sum(axis=1),
+        'rank_sq_sum': (ranks_f ** 2).sum(axis=1),
+        'rank_min': ranks.min(axis=1),
+        'rank_max': ranks.max(axis=1),
+        'changed': (diff != 0).sum(axis=1),
+        'top_k_count': in_top.sum(axis=1),
+        'weight_sum': weight_vectors.sum(axis=0),
+        'weight_sq_sum': (weight_vectors ** 2).sum(axis=0),
+        'rank_weight_sum': ranks_f @ weight_vectors,
+        'spearman': spearman,
+        'top_k_overlap': overlap,
+        'same_leader': ranks[baseline_ranks.argmin()] == 0,
+    }
+
+
+def _init_worker(components: np.ndarray, baseline_ranks: np.ndarray, top_k: int) -> None:
+    """Receive the per-sweep arrays once when a worker process starts."""
+    _worker_state.update(components=components, baseline_ranks=baseline_ranks, top_k=top_k)
+
+
+def _sweep_block(weight_vectors: np.ndarray) -> Dict[str, np.ndarray]:
+    """Worker entry point: only the weight block is sent per task."""
+    return _sweep_chunk(_worker_state['components'], weight_vectors,
+                        _worker_state['baseline_ranks'], _worker_state['top_k'])
+
+
+def default_chunk_size(n_tasks: int) -> int:
+    """
+    Weight vectors per block so one block's working arrays fit CHUNK_MEMORY_BYTES.
+
+    Args:
+        n_tasks (int): Number of tasks being ranked
+
+    Returns:
+        int: Block size, at least 1
+    """
+    return max(1, CHUNK_MEMORY_BYTES // (max(n_tasks, 1) * BYTES_PER_CELL))
+
+
+def _merge(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    merged = dict(parts[0])
+    for part in parts[1:]:
+        for key, value in part.items():
+            if key == 'rank_min':
+                merged[key] = np.minimum(merged[key], value)
+            elif key == 'rank_max':
+                merged[key] = np.maximum(merged[key], value)
+            elif key in ('spearman', 'top_k_overlap', 'same_leader'):
+                merged[key] = np.concatenate([merged[key], value])
+            else:
+                merged[key] = merged[key] + value
+    return merged
+
+
+def weight_sweep(tasks_dict: Tasks, weight_vectors: np.ndarray,
+                 baseline_weights: Optional[Dict[str, float]] = None, top_k: int = 5,
+                 workers: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Score all tasks under many weight vectors and summarize how the ranking moves.
+
+    Scores for each block of weight vectors are one (tasks x 4) @ (4 x block)
+    matrix product; blocks are spread over a process pool for large sweeps and
+    only per-task aggregates are sent back.
+
+    Args:
+        tasks_dict (Tasks): Dictionary of tasks and criteria, or a TaskTable
+        weight_vectors (np.ndarray): (n_vectors, 4) weight matrix in CRITERIA order
+        baseline_weights (Optional[Dict[str, float]]): Ranking to compare against
+            (EXAMPLE_WEIGHTS by default)
+        top_k (int): Size of the "top" set used for membership and overlap
+        workers (Optional[int]): Worker processes (None picks automatically, 1 disables the pool)
+        chunk_size (Optional[int]): Weight vectors per block (None sizes blocks from
+            CHUNK_MEMORY_BYTES and the task count)
+
+    Returns:
+        Dict[str, Any]: Report with keys
+            'names', 'baseline_rank' (1-based),
+            'stability' (mean/min Spearman rho, mean top-k overlap, leader retention),
+            'tasks' (per-task dicts of mean/std/best/worst rank, flip_rate,
+            top_k_rate and per-weight rank sensitivity), sorted by flip_rate
+    """
+    names, matrix = criteria_matrix(tasks_dict)
+    components = score_components(matrix)
+    weight_vectors = np.asarray(weight_vectors, dtype=np.float64).reshape(-1, len(CRITERIA))
+    baseline = weights_matrix(baseline_weights or EXAMPLE_WEIGHTS)
+    baseline_ranks = sweep_ranks(sweep_scores(components, baseline))[:, 0]
+
+    if not len(names) or not len(weight_vectors):
+        return {'names': names, 'baseline_rank': (baseline_ranks + 1).tolist(), 'stability': {}, 'tasks': []}
+
+    chunk_size = chunk_size or default_chunk_size(len(names))
+    blocks = [weight_vectors[start:start + chunk_size] for start in range(0, len(weight_vectors), chunk_size)]
+    if workers is None:
+        large = len(names) * len(weight_vectors) >= PARALLEL_THRESHOLD
+        workers = (os.cpu_count() or 1) if large else 1
+    workers = min(workers, len(blocks))
+
+    if workers <= 1:
+        parts = [_sweep_chunk(components, block, baseline_ranks, top_k) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(components, baseline_ranks, top_k)) as pool:
+            parts = list(pool.map(_sweep_block, blocks))
+    totals = _merge(parts)
+
+    count = float(totals['count'])
+    mean_rank = totals['rank_sum'] / count
+    std_rank = np.sqrt(np.maximum(totals['rank_sq_sum'] / count - mean_rank ** 2, 0.0))
+    mean_weight = totals['weight_sum'] / count
+    std_weight = np.sqrt(np.maximum(totals['weight_sq_sum'] / count - mean_weight ** 2, 0.0))
+
+    # Pearson correlation between each task's rank and each weight; negative
+    # means raising that weight moves the task up the ranking
+    covariance = totals['rank_weight_sum'] / count - mean_rank[:, None] * mean_weight[None, :]
+    denominator = std_rank[:, None] * std_weight[None, :]
+    sensitivity = np.divide(covariance, denominator, out=np.zeros_like(covariance), where=denominator > 0)
+
+    tasks = []
+    for i, task_name in enumerate(names):
+        tasks.append({
+            'task': task_name,
+            'baseline_rank': int(baseline_ranks[i]) + 1,
+            'mean_rank': float(mean_rank[i]) + 1,
+            'std_rank': float(std_rank[i]),
+            'best_rank': int(totals['rank_min'][i]) + 1,
+            'worst_rank': int(totals['rank_max'][i]) + 1,
+            'flip_rate': float(totals['changed'][i]) / count,
+            'top_k_rate': float(totals['top_k_count'][i]) / count,
+            'sensitivity': dict(zip(CRITERIA, sensitivity[i].tolist())),
+        })
+    tasks.sort(key=lambda task: task['flip_rate'], reverse=True)
+
+    return {
+        'names': names,
+        'baseline_rank': (baseline_ranks + 1).tolist(),
+        'stability': {
+            'weight_vectors': int(count),
+            'mean_spearman': float(totals['spearman'].mean()),
+            'min_spearman': float(totals['spearman'].min()),
+            'mean_top_k_overlap': float(totals['top_k_overlap'].mean()),
+            'leader_retained': float(totals['same_leader'].mean()),
+            'top_k': top_k,
+        },
+        'tasks': tasks,
+    }
+
+
+def print_sweep_report(report: Dict[str, Any], limit: int = 20) -> None:
+    """
+    Print rank stability, the most volatile tasks and their weight sensitivities.
+
+    Args:
+        report (Dict[str, Any]): Output of weight_sweep
+        limit (int): Maximum number of tasks to list
+    """
+    if not report['tasks']:
+        print("No sweep results to display")
+        return
+
+    stability = report['stability']
+    print(f"\n{'='*80}")
+    print(f"{'WEIGHT SENSITIVITY SWEEP':^80}")
+    print(f"{'='*80}")
+
+    print(f"\nWeight vectors: {stability['weight_vectors']}")
+    print(f"  Mean Spearman rho vs baseline: {stability['mean_spearman']:.3f} (min {stability['min_spearman']:.3f})")
+    print(f"  Mean top-{stability['top_k']} overlap: {stability['mean_top_k_overlap'] * 100:.1f}%")
+    print(f"  Baseline leader kept #1: {stability['leader_retained'] * 100:.1f}%")
+
+    print(f"\n{'Task':<32} {'Base':<5} {'Mean':<6} {'Range':<9} {'Flip%':<6} "
+          f"{'Core':>6} {'Effort':>6} {'Org':>6} {'Due':>6}")
+    print("-" * 80)
+    for task in report['tasks'][:limit]:
+        sens = task['sensitivity']
+        rank_range = f"{task['best_rank']}-{task['worst_rank']}"
+        print(f"{task['task'][:31]:<32} {task['baseline_rank']:<5} {task['mean_rank']:<6.1f} {rank_range:<9} "
+              f"{task['flip_rate'] * 100:<6.1f} {sens['corePercentage']:>6.2f} {sens['effortComplexity']:>6.2f} "
+              f"{sens['organizationValue']:>6.2f} {sens['dueInDays']:>6.2f}")
+    print("-" * 80)
+    print("Sensitivity = correlation of rank with each weight (negative: weight pushes task up)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep scoring weights and report ranking sensitivity")
+    parser.add_argument('yaml_file', nargs='?', default='example_task.yaml', help="Task YAML file")
+    parser.add_argument('--samples', type=int, default=5000, help="Random weight vectors to sample")
+    parser.add_argument('--grid', type=float, nargs=3, metavar=('START', 'STOP', 'STEP'),
+                        help="Use a full grid over [START, STOP] for every weight instead of sampling")
+    parser.add_argument('--low', type=float, default=0.0, help="Lower bound for sampled weights")
+    parser.add_argument('--high', type=float, default=4.0, help="Upper bound for sampled weights")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    parser.add_argument('--top-k', type=int, default=3, help="Top set size for overlap statistics")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    tasks = load_task_table_cached(args.yaml_file)
+    if args.grid:
+        start, stop, step = args.grid
+        values = np.arange(start, stop + step / 2, step)
+        weight_vectors = weight_grid({key: values for key in CRITERIA})
+    else:
+        weight_vectors = random_weights(args.samples, args.low, args.high, args.seed)
+
+    report = weight_sweep(tasks, weight_vectors, top_k=args.top_k, workers=args.workers)
+    print_sweep_report(report)
+
+
+if __name__ == "__main__":
+    main()